@@ -1,6 +1,10 @@
 """The SolaX Modbus Integration."""
+import asyncio
 import logging
+import os
+import struct
 import threading
+import time
 from datetime import datetime, timedelta
 from typing import Optional
 import importlib.util, sys
@@ -8,14 +12,11 @@ import importlib
 
 _LOGGER = logging.getLogger(__name__)
 
-from pymodbus.client import ModbusSerialClient
-
 UNIT_OR_SLAVE = 'slave'
 _LOGGER.debug("using pymodbus library 3.x")
 
-from pymodbus.constants import Endian
-from pymodbus.exceptions import ConnectionException
-from pymodbus.payload import BinaryPayloadBuilder, BinaryPayloadDecoder, Endian
+from pymodbus.exceptions import ConnectionException, ModbusException
+from pymodbus.pdu import ExceptionResponse, ModbusExceptions
 
 from .const import (
     DEFAULT_NAME,
@@ -23,11 +24,16 @@ from .const import (
     DOMAIN,
     CONF_MODBUS_ADDR,
     CONF_INTERFACE,
+    CONF_HOST,
+    CONF_PORT,
+    CONF_TCP_TYPE,
     CONF_SERIAL_PORT,
     CONF_READ_EPS,
     CONF_READ_DCB,
     CONF_BAUDRATE,
     CONF_PLUGIN,
+    CONF_CONFIG_DIR,
+    CONF_HOLES_FILE,
     DEFAULT_READ_EPS,
     DEFAULT_READ_DCB,
     DEFAULT_INTERFACE,
@@ -36,20 +42,44 @@ from .const import (
     DEFAULT_PORT,
     DEFAULT_BAUDRATE,
     DEFAULT_PLUGIN,
+    DEFAULT_TCP_TYPE,
+    DEFAULT_PIPELINE_WINDOW,
+    DEFAULT_PROBE_TIMEOUT,
+    DEFAULT_SLEEP_BACKOFF,
+    DEFAULT_SLEEP_BACKOFF_MAX,
+    HOLES_FILE,
+    DEFAULT_CONFIG_DIR,
+    DEFAULT_HOLES_FILE,
+    DEFAULT_POLL_TIER_INTERVALS,
     PLUGIN_PATH,
-    SLEEPMODE_LASTAWAKE
+    POLL_TIER_FAST,
+    SLEEP_AWAKE,
+    SLEEP_SILENT,
+    SLEEP_STANDBY
 )
-from .const import REGISTER_S32, REGISTER_U32, REGISTER_U16, REGISTER_S16, REGISTER_ULSB16MSB16, REGISTER_STR, \
-    REGISTER_WORDS, REGISTER_U8H, REGISTER_U8L
-from .const import setPlugin, getPlugin, getPluginName
+from .const import REGISTER_U16, REGISTER_S16, BaseModbusSensorEntityDescription
+from .const import setPlugin, getPlugin, getPluginName, BaseModbusSelectEntityDescription
+from .transport import POOL, INTERFACE_SERIAL, INTERFACE_TCP, PRIORITY_CONTROL, PRIORITY_FAST, PRIORITY_BACKGROUND
+from .planner import LinkCostModel, block, plan_tiers, sub_block, gap_block, register_width
+from .decode import DecodePlan, DecodedResponse
+from .holes import getHoleRegistry, hole_prefix
+from .computed import ComputedGraph
+from .snapshot import DataSnapshot
+from .store import ValueStore
+from .dispatch import CycleEvent, COALESCE, EVENT_CYCLE, EVENT_LANE, EVENT_WRITE
+from .scheduler import PollScheduler, AsyncPollScheduler
+from .lanes import FastLane
+from .writes import WriteQueue
+from .encode import EncoderRegistry
 
 PLATFORMS = ["button", "number", "select", "sensor"]
 
 
 # seriesnumber = 'unknown'
 
-async def async_setup_entry():
+async def async_setup_entry(config=None):
     """Set up a SolaX mobus."""
+    config = config or {}
     name = "test_name" # config[CONF_NAME]
 
     # ================== dynamically load desired plugin
@@ -59,7 +89,21 @@ async def async_setup_entry():
     setPlugin(name, plugin)
     # ====================== end of dynamic load
 
-    hub = SolaXModbusHub(name)
+    # without a configured host, the hub talks to a serial port like before the transports were pluggable
+    interface = config.get(CONF_INTERFACE, DEFAULT_INTERFACE if config.get(CONF_HOST) else INTERFACE_SERIAL)
+    if (interface == INTERFACE_TCP) and not config.get(CONF_HOST):
+        _LOGGER.error(f"{name}: modbus interface tcp needs a {CONF_HOST} in the configuration")
+        return False
+    hub = SolaXModbusHub(name,
+                         interface=interface,
+                         host=config.get(CONF_HOST),
+                         port=config.get(CONF_PORT, DEFAULT_PORT),
+                         tcp_type=config.get(CONF_TCP_TYPE, DEFAULT_TCP_TYPE),
+                         serial_port=config.get(CONF_SERIAL_PORT, DEFAULT_SERIAL_PORT),
+                         baudrate=config.get(CONF_BAUDRATE, DEFAULT_BAUDRATE),
+                         modbus_addr=config.get(CONF_MODBUS_ADDR, DEFAULT_MODBUS_ADDR),
+                         holes_file=config.get(CONF_HOLES_FILE, os.path.join(
+                             config.get(CONF_CONFIG_DIR, DEFAULT_CONFIG_DIR), DEFAULT_HOLES_FILE)))
     """Register the hub."""
     return True
 
@@ -77,33 +121,93 @@ class SolaXModbusHub:
 
     def __init__(
             self,
-            name
+            name,
+            interface=None,
+            host=None,
+            port=DEFAULT_PORT,
+            tcp_type=DEFAULT_TCP_TYPE,
+            serial_port=DEFAULT_SERIAL_PORT,
+            baudrate=DEFAULT_BAUDRATE,
+            modbus_addr=DEFAULT_MODBUS_ADDR,
+            transport=None,
+            holes_file=HOLES_FILE
     ):
-        """Initialize the Modbus hub."""
-        _LOGGER.info(f"solax modbushub creation with interface serial baudrate (only for serial): 9600")
-#        self._client = ModbusSerialClient(method="rtu", port="COM7", baudrate=9600, parity='N', stopbits=1,
-        self._client = ModbusSerialClient(method="rtu", port="/dev/cu.usbserial-14210", baudrate=9600, parity='N', stopbits=1,
-                                              bytesize=8, timeout=3)
-        self._lock = threading.Lock()
+        """Initialize the Modbus hub.
+        Hubs on the same serial port or gateway host:port share one pooled transport,
+        unless an explicit transport is passed. Without an interface, a hub with a host uses
+        DEFAULT_INTERFACE and a hub without one the serial port."""
+        if interface is None: interface = DEFAULT_INTERFACE if host else INTERFACE_SERIAL
+        _LOGGER.info(f"solax modbushub creation with interface {interface} baudrate (serial and rtu over tcp): {baudrate}")
+        self._pooled = transport is None
+        if self._pooled:
+            transport = POOL.acquire(interface, host, port, tcp_type, serial_port, baudrate,
+                                     asynchronous=self.asynchronous)
+        self._transport = transport
+        self._client = transport.client
+        self._lock = transport.lock  # BusArbiter shared by all hubs on the same bus, claimed per request
         self._name = name
-        self._modbus_addr = 1
+        self._modbus_addr = modbus_addr
+        # expected link timing, used by the block planner; RTU over TCP goes through a serial to ethernet converter,
+        # its RS485 side at baudrate dominates the read times
+        serial_link = (interface == "serial") or (tcp_type == "rtu")
+        self.cost_model = LinkCostModel.for_serial(baudrate) if serial_link else LinkCostModel.for_tcp()
         self._seriesnumber = 'still unknown'
         self._scan_interval = timedelta(seconds=5)
+        self.scheduler = None  # PollScheduler or AsyncPollScheduler once polling was started
+        self.fast_lanes = {}  # name -> FastLane, see add_fast_lane
+        self._data_lock = threading.RLock()  # held while data is modified and published, fast lanes run on own threads
         self._unsub_interval_method = None
         self._sensors = []
-        self.data = {}
+        self.data = ValueStore()  # back buffer, modified while a cycle runs; other threads should read self.snapshot
+        self.snapshot = DataSnapshot(0, None, {})  # immutable data of the last completed cycle
+        self.publishers = []  # objects with publish(snapshot), called after every cycle, e.g. shm.SharedMemoryPublisher
+        self.dispatcher = None  # dispatch.CallbackDispatcher running the update callbacks, see use_dispatcher
+        self.eventcount = 0  # nr of events dispatched, the seq of the last CycleEvent
         self.cyclecount = 0  # temporary - remove later
-        self.slowdown = 1  # slow down factor when modbus is not responding: 1 : no slowdown, 10: ignore 9 out of 10 cycles
+        self.pollcount = 0  # nr of poll cycles run, counted by _modbus_cycle; the clock of the poll tiers
+        self.cycle_running = False  # a full cycle is decoding into data, see _modbus_cycle
+        self.sleep_state = SLEEP_AWAKE  # SLEEP_AWAKE, SLEEP_SILENT or SLEEP_STANDBY
+        self.probe_timeout = DEFAULT_PROBE_TIMEOUT  # seconds, timeout of the probe read while silent
+        self.sleep_backoff = DEFAULT_SLEEP_BACKOFF  # cycles until the first probe after falling asleep
+        self.sleep_backoff_max = DEFAULT_SLEEP_BACKOFF_MAX
+        self._backoff = 0  # cycles between the current and the next probe
+        self._next_probe = 0  # cyclecount of the next probe
+        self.probing = False  # the running cycle waits for the answer to its probe read
         self.inputBlocks = {}
         self.holdingBlocks = {}
+        self.inputRegs = {}  # sorted register descriptions, the source of the block plans
+        self.holdingRegs = {}
         self.computedRegs = {}
+        self._computed = None  # ComputedGraph of computedRegs
+        self.holes = getHoleRegistry(holes_file)  # learned unreadable register ranges
+        self.tier_intervals = dict(DEFAULT_POLL_TIER_INTERVALS)  # call replan() after changing
+        self.vectorize = None  # numpy decode stage: None = when available and worthwhile, call replan() after changing
+        self._block_read_cycle = {}  # (typ, block start) -> pollcount of the last successful read
+        self._block_times = {}  # (typ, block start) -> (time.monotonic(), time.time()) of the last successful read
+        self._key_block = {}  # key -> (typ, block start) of the block that delivers it
+        self._mapped_blocks = {}  # (typ, block start) -> block whose keys are in _key_block
+        self.sleep_rewrite = True  # clear or zero the sleepmode values when asleep, instead of keeping the last ones
+        self.skip_unchanged = True  # do not decode blocks whose raw registers did not change
+        self._block_raw = {}  # (typ, block start) -> (block, registers) of the last decode
+        self.changed_blocks = []  # (typ, block) decoded in the last cycle
+        self.delta = set()  # keys whose value changed in the last cycle, less the ones within their deadband
+        self.changed = set()  # keys whose value changed in the last cycle, deadbands not applied
+        self.deadbands = {}  # key -> deadband, see BaseModbusSensorEntityDescription.deadband
+        self._published = {}  # key -> value at the last notification, for keys with a deadband
+        self._sensor_keys = {}  # update callback -> keys it listens to
         self.sleepzero = []  # sensors that will be set to zero in sleepmode
         self.sleepnone = []  # sensors that will be cleared in sleepmode
-        self.writequeue = {}  # queue requests when inverter is in sleep mode
+        self.writequeue = WriteQueue()  # queue requests when inverter is in sleep mode
+        self.writeRegs = {}  # holding register -> number and select descriptions that write it, set by setup_entry
+        self.read_after_write = True  # apply acknowledged writes to data right away, see _apply_write
+        self._write_times = {}  # key -> (time.monotonic(), time.time()) of the last acknowledged write
+        self._polled = {}  # key -> holdingRegs or inputRegs entry that reads it, set by replan
+        self._written_plans = {}  # key -> DecodePlan of the registers written for it, see _written_plan
         _LOGGER.debug(f"{self.name}: ready to call plugin to determine inverter type")
         self.plugin = getPlugin(name).plugin_instance
+        self.encoders = EncoderRegistry(self.plugin.order16, self.plugin.order32)  # register encoders by unit type
         self.awake_button = None
-        self._invertertype = self.plugin.determineInverterType(self)
+        self._invertertype = self.determine_inverter_type()
         _LOGGER.setLevel(logging.DEBUG)
         _LOGGER.info("solax modbushub done %s", self.__dict__)
 
@@ -111,21 +215,101 @@ class SolaXModbusHub:
 
     def async_refresh_modbus_data(self, _now: Optional[int] = None) -> None:
         """Time to update."""
+        if self._begin_refresh():
+            self._end_refresh(self.read_modbus_data())
+
+    def _begin_refresh(self):
+        """Count the cycle, returns True when the hub has to be read in this cycle."""
         self.cyclecount = self.cyclecount + 1
         if not self._sensors:
-            return
-        if (self.cyclecount % self.slowdown) == 0:  # only execute once every slowdown count
-            update_result = self.read_modbus_data()
+            return False
+        return (self.sleep_state == SLEEP_AWAKE) or (self.cyclecount >= self._next_probe)
+
+    def async_add_solax_modbus_sensor(self, update_callback, keys=None):
+        """Listen for data updates. With keys, the callback is only called when one of these keys changed,
+        otherwise when any key changed."""
+        self._sensors.append(update_callback)
+        if keys is not None: self._sensor_keys[update_callback] = frozenset(keys)
+
+    def async_remove_solax_modbus_sensor(self, update_callback):
+        """Remove data update."""
+        self._sensors.remove(update_callback)
+        self._sensor_keys.pop(update_callback, None)
+
+    def use_dispatcher(self, dispatcher, policy=COALESCE):
+        """Run the update callbacks on the worker threads of a dispatch.CallbackDispatcher instead of inline,
+        so slow callbacks do not delay polling. Other consumers can subscribe to the dispatcher directly.
+        Several hubs can share a dispatcher, each hub only gets the events of its own cycles."""
+        self.dispatcher = dispatcher
+        dispatcher.subscribe(lambda event: self._call_sensors(event.delta), policy=policy, hub=self.name)
+
+    def _call_sensors(self, delta):
+        for update_callback in list(self._sensors):
+            keys = self._sensor_keys.get(update_callback)
+            if ((keys is None) and delta) or ((keys is not None) and not keys.isdisjoint(delta)): update_callback()
+
+    def _end_refresh(self, update_result):
+        with self._data_lock:
+            if update_result and self.plugin.isAwake(self.data):
+                if self.sleep_state != SLEEP_AWAKE: _LOGGER.info(f"{self.name}: inverter is awake, full polling resumed")
+                self.sleep_state = SLEEP_AWAKE
+            else:
+                self._sleep(SLEEP_STANDBY if update_result else SLEEP_SILENT)
             if update_result:
-                self.slowdown = 1  # return to full polling after succesfull cycle
-                for update_callback in self._sensors:
-                    update_callback()
+                self.publish()
             else:
-                _LOGGER.debug(f"assuming sleep mode - slowing down by factor 10")
-                self.slowdown = 10
-                for i in self.sleepnone: self.data.pop(i, None)
-                for i in self.sleepzero: self.data[i] = 0
-                # self.data = {} # invalidate data - do we want this ??
+                if self.sleep_rewrite:
+                    for i in self.sleepnone: self.data.pop(i, None)
+                    for i in self.sleepzero: self.data[i] = 0
+                    self._block_raw.clear()  # data was modified, decode everything again after wakeup
+                    for lane in self.fast_lanes.values(): lane.reset()
+                    self.computed_graph().reset()
+                self.publish(force=True)
+        if update_result: self._notify(self.delta)
+
+    def _notify(self, delta, kind=EVENT_CYCLE):
+        """Tell the update callbacks (or the dispatcher) which keys changed."""
+        if self.dispatcher is not None:
+            self.eventcount += 1
+            self.dispatcher.dispatch(CycleEvent(self.snapshot.cycle, self.snapshot.timestamp, frozenset(delta),
+                                                self.snapshot, self.name, kind=kind, seq=self.eventcount))
+        else:
+            self._call_sensors(delta)
+
+    def _sleep(self, state):
+        """Enter or stay in a sleep state. The next probe comes after sleep_backoff cycles,
+        this interval doubles after every probe that does not wake up the inverter, up to sleep_backoff_max."""
+        if self.sleep_state == SLEEP_AWAKE:
+            self._backoff = self.sleep_backoff
+            _LOGGER.debug(f"{self.name}: assuming sleep mode ({state}), next probe in {self._backoff} cycles")
+        else:
+            self._backoff = min(2 * self._backoff, self.sleep_backoff_max)
+        self.sleep_state = state
+        self._next_probe = self.cyclecount + self._backoff
+
+    def publish(self, force=False, changed=None, keys=None):
+        """Publish a snapshot of self.data. The data is only copied when something changed in the cycle,
+        changed defaults to the changes of the last full cycle. Deadbands only hold back notifications,
+        so changed must hold the keys before the deadbands were applied.
+        With keys, only the values of these keys are taken from self.data, all others from the last snapshot."""
+        last = self.snapshot
+        changed = self.changed if changed is None else changed
+        if keys is not None:
+            data = self.data.freeze(keys, last._data)
+        else:
+            data = last._data if (not force) and (not changed) else self.data.freeze()
+        self.snapshot = DataSnapshot(self.cyclecount, time.time(), data)
+        for publisher in self.publishers:
+            try:
+                publisher.publish(self.snapshot)
+            except Exception:
+                _LOGGER.exception(f"{self.name}: publishing data with {publisher} failed")
+            # self.data = {} # invalidate data - do we want this ??
+
+    asynchronous = False  # uses blocking pymodbus clients
+
+    def determine_inverter_type(self):
+        return self.plugin.determineInverterType(self)
 
     @property
     def invertertype(self):
@@ -149,38 +333,183 @@ class SolaXModbusHub:
         return self._name
 
     def close(self):
-        """Disconnect client."""
-        with self._lock:
-            self._client.close()
+        """Stop polling and disconnect client, a pooled connection is only closed by its last hub."""
+        for lane in self.fast_lanes.values(): self._stop_lane(lane)
+        if self.scheduler is not None: self.scheduler.stop()
+        if (not self._pooled) or POOL.release(self._transport):
+            self._transport.close()
+
+    def start_polling(self, policy=None):
+        """Poll in a background thread, cycles start on a drift free grid of scan intervals."""
+        if self.scheduler is None:
+            self.scheduler = PollScheduler(self.async_refresh_modbus_data, self._scan_interval.total_seconds(),
+                                           name=self.name, **({'policy': policy} if policy else {}))
+            self.scheduler.start()
+            for lane in self.fast_lanes.values(): self._start_lane(lane)
+        return self.scheduler
 
     def connect(self):
         """Connect client."""
-        with self._lock:
-            self._client.connect()
+        self._transport.connect()
 
-    def read_holding_registers(self, unit, address, count):
+    def replan(self):
+        """(Re)build the read blocks per poll tier from holdingRegs and inputRegs,
+        routing around learned unreadable holes."""
+        prefix = hole_prefix(self.seriesnumber)
+        self.holdingPlan = plan_tiers(self.holdingRegs, self.plugin.block_size, self.cost_model,
+                                      self.holes.get(prefix, 'holding'), self.tier_intervals)
+        self.inputPlan = plan_tiers(self.inputRegs, self.plugin.block_size, self.cost_model,
+                                    self.holes.get(prefix, 'input'), self.tier_intervals)
+        self.holdingBlocks = self.holdingPlan.blocks
+        self.inputBlocks = self.inputPlan.blocks
+        for b in self.holdingBlocks + self.inputBlocks: self.decode_plan(b)
+        self._polled = {}
+        for regs in (self.inputRegs, self.holdingRegs,):
+            for entry in regs.values():
+                for descr in (entry.values() if type(entry) is dict else (entry,)): self._polled[descr.key] = entry
+        self._written_plans = {}
+        for lane in self.fast_lanes.values(): self._plan_lane(lane)
+
+    def _plan_lane(self, lane):
+        prefix = hole_prefix(self.seriesnumber)
+        lane.plan({'holding': self.holdingRegs, 'input': self.inputRegs}, self.computed_graph(), self.plugin.block_size,
+                  self.cost_model, {typ: self.holes.get(prefix, typ) for typ in ('holding', 'input',)})
+        for (typ, block,) in lane.requests: self.decode_plan(block)
+        missing = lane.keys - lane.registers - set(self.computedRegs)
+        if missing: _LOGGER.warning(f"{self.name}: fast lane {lane.name} has no registers for {sorted(missing)}")
+        if lane.unresolved: _LOGGER.warning(f"{self.name}: fast lane {lane.name} has no registers for the inputs of "
+                                            f"{sorted(lane.unresolved)} yet, planned again when inputs are traced")
+
+    def _plan_traced_lanes(self):
+        """Plan the lanes again whose computed keys got new inputs in the last evaluation."""
+        graph = self.computed_graph()
+        for lane in self.fast_lanes.values():
+            if lane.traced != (graph, graph.version,): self._plan_lane(lane)
+
+    def add_fast_lane(self, name, keys, interval=1.0):
+        """Read the registers of keys every interval seconds, with a minimal block plan of their own, in between
+        the full cycles. Lane reads get the bus before the background blocks of a running full cycle.
+        The values land in data, then only the computed sensors that depend on them are evaluated.
+        Computed keys pull in their inputs, call after setup_entry so the computed sensors are known. Inputs that
+        are only traced at runtime are added when the first evaluation finds them, the lane is planned again then."""
+        if name in self.fast_lanes: self.remove_fast_lane(name)
+        lane = self.fast_lanes[name] = FastLane(name, keys, interval)
+        self._plan_lane(lane)
+        if self._polling(): self._start_lane(lane)
+        return lane
+
+    def remove_fast_lane(self, name):
+        lane = self.fast_lanes.pop(name)
+        self._stop_lane(lane)
+        return lane
+
+    def _end_lane(self, lane, requests, responses):
+        """Decode the responses to the requests of a lane cycle, evaluate the affected computed sensors and publish."""
+        delta = set()
+        res = True
+        with self._data_lock:
+            for ((typ, block,), realtime_data) in zip(requests, responses):
+                if (realtime_data is None) or realtime_data.isError():
+                    res = False
+                    continue
+                plan = self.decode_plan(block)
+                registers = realtime_data.registers
+                if self.skip_unchanged and (not plan.lastawake) and lane.raw_unchanged(typ, block, registers): continue
+                try:
+                    plan.decode(registers, self.data, self.plugin.isAwake, delta)
+                except struct.error:
+                    res = False
+                    continue
+                lane.remember_raw(typ, block, registers)
+                self._raw_changed(typ, block.start, registers, lane)
+            if res: lane.captured = (time.monotonic(), time.time(),)
+            self._settle(delta, lane.registers)
+        lane.cycles += 1
+        if not res: lane.failures += 1
+        if delta: self._notify(delta, EVENT_LANE)
+        return res
+
+    def _settle(self, delta, own):
+        """After data changed outside a full cycle: evaluate the computed sensors affected by delta,
+        apply the deadbands and publish. own are the keys the caller decoded or wrote itself.
+        While a full cycle is decoding, data is half way between two cycles: only the changed own keys are
+        published then, computed sensors follow with the full cycle. Call with the data lock held,
+        notify delta afterwards."""
+        self.computed_graph().evaluate(self.data, delta, affected_only=True)
+        self._plan_traced_lanes()
+        changed = set(delta)
+        self._apply_deadbands(delta)
+        if changed: self.publish(changed=changed, keys=(changed & set(own)) if self.cycle_running else None)
+
+    def refresh_fast_lane(self, name):
+        """One cycle of a fast lane, skipped while the inverter sleeps. Returns True when all blocks were read."""
+        lane = self.fast_lanes[name]
+        requests = lane.requests  # the lane may be planned again while it is read
+        if (self.sleep_state != SLEEP_AWAKE) or not requests: return False
+        try:
+            responses = self._read_requests_sequential(requests)
+        except Exception:
+            _LOGGER.exception(f"{self.name}: reading fast lane {name} failed")
+            return False
+        return self._end_lane(lane, requests, responses)
+
+    def _polling(self):
+        return self.scheduler is not None
+
+    def _start_lane(self, lane):
+        if lane.scheduler is None:
+            lane.scheduler = PollScheduler(lambda: self.refresh_fast_lane(lane.name), lane.interval,
+                                           name=f"{self.name}-{lane.name}").start()
+
+    def _stop_lane(self, lane):
+        if lane.scheduler is not None: lane.scheduler.stop()
+        lane.scheduler = None
+
+    def decode_plan(self, block):
+        """Compiled decoder of a block, built on first use."""
+        if block.plan is None:
+            block.plan = DecodePlan(block, self.plugin.order16, self.plugin.order32, self.vectorize)
+        return block.plan
+
+    def read_holding_registers(self, unit, address, count, priority=PRIORITY_BACKGROUND):
         """Read holding registers."""
-        with self._lock:
+        with self._lock.claim(priority):
+            self._transport.ensure_connected()
             kwargs = {UNIT_OR_SLAVE: unit} if unit else {}
             return self._client.read_holding_registers(address, count, **kwargs)
 
-    def read_input_registers(self, unit, address, count):
+    def read_input_registers(self, unit, address, count, priority=PRIORITY_BACKGROUND):
         """Read input registers."""
         # unit -> modbus address
-        with self._lock:
+        with self._lock.claim(priority):
+            self._transport.ensure_connected()
             kwargs = {UNIT_OR_SLAVE: unit} if unit else {}
             _LOGGER.debug(f"read_input_register Unit: {unit}, Address: {address}, Count:{count}")
             return self._client.read_input_registers(address, count, **kwargs)
 
-    def _lowlevel_write_register(self, unit, address, payload):
-        with self._lock:
+    def _send_write(self, unit, address, registers, multiple=True, priority=PRIORITY_CONTROL):
+        """Send encoded registers with write_registers (FC16), or with write_register when not multiple.
+        Acknowledged writes are applied to the register image and data, see _apply_write."""
+        with self._lock.claim(priority):
+            self._transport.ensure_connected()
             kwargs = {UNIT_OR_SLAVE: unit} if unit else {}
-            # builder = BinaryPayloadBuilder(byteorder=Endian.Big, wordorder=Endian.Big)
-            builder = BinaryPayloadBuilder(byteorder=self.plugin.order16, wordorder=self.plugin.order32)
-            builder.reset()
-            builder.add_16bit_int(payload)
-            payload = builder.to_registers()
-            return self._client.write_register(address, payload[0], **kwargs)
+            if multiple:
+                response = self._client.write_registers(address, registers, **kwargs)
+            else:
+                response = self._client.write_register(address, registers[0], **kwargs)
+        return self._acknowledged(unit, address, registers, response)
+
+    def _lowlevel_write_register(self, unit, address, payload):
+        return self._send_write(unit, address, self.encoders.encode16(payload), multiple=False)
+
+    def _lowlevel_write_registers(self, unit, address, payloads):
+        """Write contiguous registers in one write multiple registers (FC16) request."""
+        return self._send_write(unit, address, [self.encoders.encode16(payload)[0] for payload in payloads])
+
+    def queue_write(self, address, payload):
+        """Queue a register write, it is sent after the next cycle in which the inverter is awake.
+        Returns a concurrent.futures.Future with the response of the request that wrote the register."""
+        return self.writequeue.put(address, payload)
 
     def write_register(self, unit, address, payload):
         """Write register."""
@@ -190,24 +519,60 @@ class SolaXModbusHub:
             return self._lowlevel_write_register(unit, address, payload)
         else:
             # put request in queue
-            self.writequeue[address] = payload
-            # awaken inverter
-            if self.awake_button:
-                _LOGGER.info("waking up inverter: pressing awake button")
-                return self._lowlevel_write_register(unit=self._modbus_addr, address=self.awake_button.register,
-                                                     payload=self.awake_button.command)
-            else:
-                _LOGGER.warning("cannot wakeup inverter: no awake button found")
+            self.queue_write(address, payload)
+            return self._wake_up()
+
+    def _wake_up(self):
+        """Press the awake button of a sleeping inverter, so that the queued writes go out soon."""
+        if self.awake_button:
+            _LOGGER.info("waking up inverter: pressing awake button")
+            return self._lowlevel_write_register(unit=self._modbus_addr, address=self.awake_button.register,
+                                                 payload=self.awake_button.command)
+        else:
+            _LOGGER.warning("cannot wakeup inverter: no awake button found")
 
     def write_registers_single(self, unit, address, payload):  # Needs adapting for regiater que
-        """Write registers."""
-        with self._lock:
-            kwargs = {"unit": unit} if unit else {}
-            builder = BinaryPayloadBuilder(byteorder=self.plugin.order16, wordorder=self.plugin.order32)
-            builder.reset()
-            builder.add_16bit_int(payload)
-            payload = builder.to_registers()
-            return self._client.write_register(address, payload, **kwargs)
+        """Write a single 16 bit register with a write multiple registers (FC16) request."""
+        return self._send_write(unit, address, self.encoders.encode16(payload))
+
+    def write_registers_multi(self, unit, address, payload):
+        """Write consecutive registers in one FC16 request. payload is a list of (unit type, value) tuples,
+        e.g. [(REGISTER_S32, -2500,), (REGISTER_U16, 1,)], strings as (REGISTER_STR, value, wordcount)."""
+        return self._send_write(unit, address, self.encoders.encode_all(payload))
+
+    def apply_profile(self, profile, verify=True, priority=PRIORITY_BACKGROUND):
+        """Bring the number and select entities to the values of a profiles.SettingsProfile.
+        Values that equal the last known state are not written, the others go out as few FC16 requests as
+        possible and are read back once per request when verify is set. Returns a profiles.ProfileResult.
+        The requests claim the bus at background priority, so they take turns with the poll cycle instead
+        of preempting it; when the inverter sleeps the writes are queued, see queue_write, and the awake
+        button is pressed like write_register does."""
+        plan = profile.plan(self)
+        awake = self.plugin.isAwake(self.data)
+        for group in plan.groups:
+            if not awake:
+                plan.queued(group)
+                continue
+            try:
+                response = self._send_write(self._modbus_addr, group.start, group.values, plan.multiple(group), priority)
+            except Exception as ex:
+                plan.sent(group, ex=ex)
+                continue
+            plan.sent(group, response)
+        if plan.result.queued: self._wake_up()
+        if verify and awake:
+            for group in plan.groups:
+                try:
+                    response = self.read_holding_registers(self._modbus_addr, group.start, len(group.values), priority)
+                except Exception as ex:
+                    plan.verify_failed(group, ex)
+                    continue
+                if response.isError():
+                    plan.verify_failed(group, response)
+                    continue
+                plan.verified(group, response.registers)
+                self._apply_write(group.start, response.registers)  # the registers as the inverter has them
+        return plan.result
 
     def read_modbus_data(self):
         res = True
@@ -221,110 +586,735 @@ class SolaXModbusHub:
             res = False
         return res
 
-    def treat_address(self, decoder, descr, initval=0):
-        return_value = None
-        if self.cyclecount < 5: _LOGGER.debug(f"treating register 0x{descr.register:02x} : {descr.key}")
-        try:
-            if descr.unit == REGISTER_U16:
-                val = decoder.decode_16bit_uint()
-            elif descr.unit == REGISTER_S16:
-                val = decoder.decode_16bit_int()
-            elif descr.unit == REGISTER_U32:
-                val = decoder.decode_32bit_uint()
-            elif descr.unit == REGISTER_S32:
-                val = decoder.decode_32bit_int()
-            elif descr.unit == REGISTER_STR:
-                val = str(decoder.decode_string(descr.wordcount * 2).decode("ascii"))
-            elif descr.unit == REGISTER_WORDS:
-                val = [decoder.decode_16bit_uint() for val in range(descr.wordcount)]
-            elif descr.unit == REGISTER_ULSB16MSB16:
-                val = decoder.decode_16bit_uint() + decoder.decode_16bit_uint() * 256 * 256
-            elif descr.unit == REGISTER_U8L:
-                val = initval % 256
-            elif descr.unit == REGISTER_U8H:
-                val = initval >> 8
-            else:
-                _LOGGER.warning(f"undefinded unit for entity {descr.key} - setting value to zero")
-                val = 0
-        except Exception as ex:
-            if self.cyclecount < 5:
-                _LOGGER.warning(f"{self.name}: read failed at 0x{descr.register:02x}: {descr.key}", exc_info=True)
-            else:
-                _LOGGER.warning(f"{self.name}: read failed at 0x{descr.register:02x}: {descr.key} ")
-            val = 0
-        if type(descr.scale) is dict:  # translate int to string
-            return_value = descr.scale.get(val, "Unknown")
-        elif callable(descr.scale):  # function to call ?
-            return_value = descr.scale(val, descr, self.data)
-        else:  # apply simple numeric scaling and rounding if not a list of words
-            try:
-                return_value = round(val * descr.scale, descr.rounding)
-            except:
-                return_value = val  # probably a REGISTER_WORDS instance
-        # if (descr.sleepmode != SLEEPMODE_LASTAWAKE) or self.awakeplugin(self.data): self.data[descr.key] = return_value
-        if (descr.sleepmode != SLEEPMODE_LASTAWAKE) or self.plugin.isAwake(self.data): self.data[
-            descr.key] = return_value
-        _LOGGER.debug(f"treating register 0x{descr.register:02x} : {descr.key} with result:{return_value}")
-
-    def read_modbus_block(self, block, typ):
+    def read_block_registers(self, block, typ):
+        """Read the raw registers of a block, returns the pymodbus response."""
         if self.cyclecount < 5:
             _LOGGER.debug(
                 f"{self.name} modbus {typ} block start: 0x{block.start:x} end: 0x{block.end:x}  len: {block.end - block.start} \nregs: {block.regs}")
-        try:
-            if typ == 'input':
-                realtime_data = self.read_input_registers(unit=self._modbus_addr, address=block.start,
-                                                          count=block.end - block.start)
-            else:
-                realtime_data = self.read_holding_registers(unit=self._modbus_addr, address=block.start,
-                                                            count=block.end - block.start)
-        except Exception as ex:
-            if self.slowdown == 1: _LOGGER.error(
-                f"{str(ex)}: {self.name} cannot read {typ} registers at device {self._modbus_addr} position 0x{block.start:x}",
-                exc_info=True)
+        if typ == 'input':
+            return self.read_input_registers(unit=self._modbus_addr, address=block.start,
+                                             count=block.end - block.start, priority=self._priority(block))
+        else:
+            return self.read_holding_registers(unit=self._modbus_addr, address=block.start,
+                                               count=block.end - block.start, priority=self._priority(block))
+
+    @staticmethod
+    def _priority(block):
+        """Bus priority of a block read, fast tier blocks go before the other blocks of waiting hubs."""
+        return PRIORITY_FAST if block.tier == POLL_TIER_FAST else PRIORITY_BACKGROUND
+
+    def treat_block(self, block, typ, realtime_data):
+        """Decode a block response into self.data, returns False if the block could not be read."""
+        if realtime_data is None:  # not read, or read raised an exception
             return False
         if realtime_data.isError():
-            if self.slowdown == 1: _LOGGER.error(
+            if self.sleep_state != SLEEP_SILENT: _LOGGER.error(
                 f"{self.name} error reading {typ} registers at device {self._modbus_addr} position 0x{block.start:x}",
                 exc_info=True)
             return False
-        # decoder = BinaryPayloadDecoder.fromRegisters(realtime_data.registers, block.order16, wordorder=block.order32)
-        decoder = BinaryPayloadDecoder.fromRegisters(realtime_data.registers, self.plugin.order16,
-                                                     wordorder=self.plugin.order32)
-        prevreg = block.start
-        for reg in block.regs:
-            if (reg - prevreg) > 0:
-                decoder.skip_bytes((reg - prevreg) * 2)
-                if self.cyclecount < 5: _LOGGER.debug(f"skipping bytes {(reg - prevreg) * 2}")
-            descr = block.descriptions[reg]
-            if type(descr) is dict:  # set of byte values
-                val = decoder.decode_16bit_uint()
-                for k in descr: self.treat_address(decoder, descr[k], val)
-                prevreg = reg + 1
-            else:  # single value
-                self.treat_address(decoder, descr)
-                if descr.unit in (REGISTER_S32, REGISTER_U32, REGISTER_ULSB16MSB16,):
-                    prevreg = reg + 2
-                elif descr.unit in (REGISTER_STR, REGISTER_WORDS,):
-                    prevreg = reg + descr.wordcount
-                else:
-                    prevreg = reg + 1
+        self._block_read_cycle[(typ, block.start,)] = self.pollcount
+        self._captured(typ, block)
+        if type(realtime_data) is DecodedResponse: return True  # decoded in a batch by a FleetDecoder
+        if self._raw_unchanged(typ, block, realtime_data.registers): return True
+        try:
+            self.decode_plan(block).decode(realtime_data.registers, self.data, self.plugin.isAwake, self.delta)
+        except struct.error:
+            _LOGGER.warning(f"{self.name}: short response for {typ} block at 0x{block.start:x}", exc_info=True)
+            return False
+        self._remember_raw(typ, block, realtime_data.registers)
         return True
 
-    def read_modbus_registers_all(self):
+    def _captured(self, typ, block):
+        """Record the capture time of a block that was read successfully."""
+        bkey = (typ, block.start,)
+        self._block_times[bkey] = (time.monotonic(), time.time(),)
+        if self._mapped_blocks.get(bkey) is not block:  # new plan or bisection sub-block
+            for key in self.decode_plan(block).keys: self._key_block[key] = bkey
+            self._mapped_blocks[bkey] = block
+
+    def capture_time(self, key, _seen=None):
+        """(time.monotonic(), time.time()) at which the value of key was read from the inverter, None if unknown.
+        A computed value is as old as its oldest input."""
+        bkey = self._key_block.get(key)
+        lanes = [lane.capture_time(key) for lane in self.fast_lanes.values()] + [self._write_times.get(key)]
+        if (bkey is not None) or any(lanes):
+            times = [t for t in [self._block_times.get(bkey)] + lanes if t is not None]
+            return max(times) if times else None
+        graph = self.computed_graph()
+        if key not in graph.inputs: return None
+        _seen = _seen or set()
+        _seen.add(key)
+        times = [self.capture_time(k, _seen) for k in graph.inputs[key] if k not in _seen]
+        times = [t for t in times if t is not None]
+        return min(times) if times else None
+
+    def value_age(self, key, now=None):
+        """Seconds since the value of key was read from the inverter, None if unknown.
+        Consumers decide themselves when a value is too old; see also sleep_rewrite."""
+        captured = self.capture_time(key)
+        if captured is None: return None
+        return (time.monotonic() if now is None else now) - captured[0]
+
+    def _raw_unchanged(self, typ, block, registers):
+        """True when the registers equal those of the last decode of the block, so decoding can be skipped.
+        Blocks with SLEEPMODE_LASTAWAKE entities are always decoded, their values depend on the awake state."""
+        if not self.skip_unchanged: return False
+        last = self._block_raw.get((typ, block.start,))
+        return (last is not None) and (last[0] is block) and (last[1] == registers)
+
+    def _remember_raw(self, typ, block, registers):
+        if not self.decode_plan(block).lastawake: self._block_raw[(typ, block.start,)] = (block, registers,)
+        self.changed_blocks.append((typ, block,))
+        with self._data_lock:
+            for lane in self.fast_lanes.values(): lane.forget(typ, block.start, block.end)
+
+    def _raw_changed(self, typ, start, registers, lane=None):
+        """registers at start were decoded outside the full cycle, by a fast lane or after a write.
+        They go into the images of the overlapping full cycle blocks and the other lanes decode their
+        overlapping blocks again, so no cache skips a block whose values in data came from elsewhere."""
+        end = start + len(registers)
+        for block in (self.holdingBlocks if typ == 'holding' else self.inputBlocks):
+            if (block.start >= end) or (block.end <= start): continue
+            bkey = (typ, block.start,)
+            last = self._block_raw.get(bkey)
+            if (last is not None) and (last[0] is block):
+                (lo, hi,) = (max(start, block.start), min(end, block.end),)
+                image = list(last[1])
+                image[lo - block.start:hi - block.start] = registers[lo - start:hi - start]
+                self._block_raw[bkey] = (block, image,)
+        for other in self.fast_lanes.values():
+            if other is not lane: other.forget(typ, start, end)
+
+    def _read_failed(self, block, typ, ex):
+        if self.sleep_state != SLEEP_SILENT: _LOGGER.error(
+            f"{str(ex)}: {self.name} cannot read {typ} registers at device {self._modbus_addr} position 0x{block.start:x}",
+            exc_info=True)
+
+    def read_modbus_block(self, block, typ):
+        try:
+            realtime_data = self.read_block_registers(block, typ)
+        except Exception as ex:
+            self._read_failed(block, typ, ex)
+            return False
+        return self.treat_block(block, typ, realtime_data)
+
+    def _read_requests(self, requests):
+        """Execute the read requests of a cycle, or the probe read of a sleeping inverter."""
+        if self.probing: return [self._read_probe(*requests[0])]
+        return self._read_requests_sequential(requests)
+
+    def _read_requests_sequential(self, requests):
+        """Execute read requests one after the other.
+        Stops at the first block without answer, the remaining requests are answered with None."""
+        responses = []
+        for (typ, block,) in requests:
+            try:
+                realtime_data = self.read_block_registers(block, typ)
+            except Exception as ex:
+                self._read_failed(block, typ, ex)
+                realtime_data = None
+            responses.append(realtime_data)
+            if self._no_answer(realtime_data): break
+        return responses + [None] * (len(requests) - len(responses))
+
+    def _read_probe(self, typ, block):
+        """Read the probe block with the short probe_timeout, returns None when there is no answer."""
+        kwargs = {UNIT_OR_SLAVE: self._modbus_addr} if self._modbus_addr else {}
+        read = self._client.read_input_registers if typ == 'input' else self._client.read_holding_registers
+        try:
+            with self._lock, self._transport.timeout(self.probe_timeout):
+                self._transport.ensure_connected()
+                return read(block.start, block.end - block.start, **kwargs)
+        except Exception as ex:
+            _LOGGER.debug(f"{self.name}: no answer to probe read: {ex}")
+            return None
+
+    def _probe_request(self):
+        """(typ, block) reading the first register of the plan, None when there are no blocks."""
+        for (typ, blocks,) in (('input', self.inputBlocks,), ('holding', self.holdingBlocks,)):
+            if blocks: return (typ, sub_block(blocks[0], blocks[0].regs[:1]),)
+        return None
+
+    @staticmethod
+    def _no_answer(realtime_data):
+        """True when the device did not answer; a modbus exception response is an answer."""
+        return (realtime_data is None) or (realtime_data.isError() and not isinstance(realtime_data, ExceptionResponse))
+
+    @staticmethod
+    def _rejected(realtime_data):
+        """True when the device refuses (part of) the requested register range."""
+        return isinstance(realtime_data, ExceptionResponse) and \
+            realtime_data.exception_code in (ModbusExceptions.IllegalAddress, ModbusExceptions.IllegalValue,)
+
+    def _bisect_block(self, typ, block):
+        """Locate the registers a device rejects in a block by reading both halves, recursively.
+        Readable parts are decoded right away. Generator like _modbus_cycle, returns (success, holes)."""
+        if len(block.regs) == 1:
+            return (True, [(block.start, block.end,)],)
+        half = len(block.regs) // 2
+        halves = [sub_block(block, block.regs[:half]), sub_block(block, block.regs[half:])]
+        responses = yield [(typ, sub,) for sub in halves]
+        res = True
+        holes = []
+        for (sub, realtime_data) in zip(halves, responses):
+            if self._rejected(realtime_data):
+                (ok, subholes,) = yield from self._bisect_block(typ, sub)
+                res = ok and res
+                holes += subholes
+            else:
+                res = self.treat_block(sub, typ, realtime_data) and res
+        if res and not holes:
+            if halves[0].end < halves[1].start:  # both halves readable: look in the unused gap in between
+                holes = yield from self._bisect_gap(typ, block, halves[0].end, halves[1].start)
+            if not holes:
+                _LOGGER.warning(f"{self.name}: {typ} block 0x{block.start:x} rejected, but all parts are readable")
+        return (res, holes,)
+
+    def _bisect_gap(self, typ, parent, start, end):
+        """Locate the registers a device rejects in [start, end), a gap of a block that no entity uses.
+        Ranges are read and halved level by level, only registers that are rejected on their own are holes.
+        Generator like _modbus_cycle, returns the merged holes."""
+        (ranges, holes,) = ([(start, end,)], [],)
+        while ranges:
+            gaps = [gap_block(parent, s, e) for (s, e,) in ranges]
+            responses = yield [(typ, gap,) for gap in gaps]
+            ranges = []
+            for (gap, realtime_data) in zip(gaps, responses):
+                if not self._rejected(realtime_data): continue
+                if gap.end - gap.start == 1:
+                    holes.append([gap.start, gap.end])
+                else:
+                    middle = (gap.start + gap.end) // 2
+                    ranges += [(gap.start, middle,), (middle, gap.end,)]
+        merged = []
+        for hole in sorted(holes):
+            if merged and (merged[-1][1] == hole[0]): merged[-1][1] = hole[1]
+            else: merged.append(hole)
+        return [tuple(hole) for hole in merged]
+
+    def _block_due(self, typ, block):
+        """Blocks are read every tier interval poll cycles, ONCE blocks until they were read successfully.
+        Poll cycles are counted by _modbus_cycle, so direct read_modbus_data() calls follow the tiers too."""
+        last = self._block_read_cycle.get((typ, block.start,))
+        if last is None: return True
+        interval = self.tier_intervals[block.tier]
+        return (interval > 0) and (self.pollcount - last >= interval)
+
+    def _modbus_cycle(self):
+        """Poll cycle logic shared by the sync and the async hub.
+        This generator yields lists of (typ, block) read requests; the driver must send back
+        the list of responses (None for requests that were not executed).
+        The generator returns True when all blocks were read and decoded.
+        changed_blocks lists the blocks that were decoded, blocks with unchanged registers are skipped.
+        delta is the set of keys whose value changed, less the ones that stayed within their deadband;
+        changed holds all keys whose value changed.
+        A silent (sleeping) inverter first gets a single probe read, the full plan is only read when it answers.
+        cycle_running is True until the generator ends: data then holds a mix of old and new values."""
+        self.cycle_running = True
+        try:
+            return (yield from self._cycle_steps())
+        finally:
+            self.cycle_running = False
+
+    def _cycle_steps(self):
+        """Body of _modbus_cycle."""
+        self.pollcount += 1
+        self.changed_blocks = []
+        self.delta = set()
+        self.changed = set()
+        probe = self._probe_request() if self.sleep_state == SLEEP_SILENT else None
+        if probe is not None:
+            self.probing = True
+            try:
+                responses = yield [probe]
+            finally:
+                self.probing = False
+            if self._no_answer(responses[0]): return False
+            _LOGGER.info(f"{self.name}: inverter answered the probe read, reading all blocks")
+        requests = [('holding', block,) for block in self.holdingBlocks if self._block_due('holding', block)] + \
+                   [('input', block,) for block in self.inputBlocks if self._block_due('input', block)]
+        responses = yield requests
         res = True
-        for block in self.holdingBlocks:
-            res = res and self.read_modbus_block(block, 'holding')
-        for block in self.inputBlocks:
-            res = res and self.read_modbus_block(block, 'input')
-        for reg in self.computedRegs:
-            descr = self.computedRegs[reg]
-            self.data[descr.key] = descr.value_function(0, descr, self.data)
+        learned = False
+        for ((typ, block,), realtime_data) in zip(requests, responses):
+            if self._rejected(realtime_data):
+                _LOGGER.info(f"{self.name}: {typ} block 0x{block.start:x} rejected, looking for unreadable registers")
+                (ok, holes,) = yield from self._bisect_block(typ, block)
+                prefix = hole_prefix(self.seriesnumber)
+                if holes and (prefix is None):
+                    _LOGGER.info(f"{self.name}: serial number unknown, unreadable {typ} registers are not recorded")
+                for (start, end,) in holes:
+                    learned = self.holes.add(prefix, typ, start, end) or learned
+                res = ok and res
+            else:
+                res = self.treat_block(block, typ, realtime_data) and res
+        if learned: self.replan()  # route around the holes from the next cycle on
+        self.computed_graph().evaluate(self.data, self.delta)
+        self._plan_traced_lanes()
+        self.changed = set(self.delta)
+        self._apply_deadbands()
+        return res
+
+    def computed_graph(self):
+        """Dependency graph of computedRegs, rebuilt when computedRegs is replaced."""
+        if (self._computed is None) or (self._computed.source is not self.computedRegs):
+            self._computed = ComputedGraph(self.computedRegs)
+        return self._computed
+
+    def _apply_deadbands(self, delta=None):
+        """Drop keys from the delta whose value moved no more than their deadband since the last notification."""
+        delta = self.delta if delta is None else delta
+        for key in delta.intersection(self.deadbands):
+            val = self.data.get(key)
+            last = self._published.get(key)
+            try:
+                if (last is not None) and (abs(val - last) <= self.deadbands[key]):
+                    delta.discard(key)
+                    continue
+            except TypeError:  # not a number
+                pass
+            self._published[key] = val
+
+    def _acknowledged(self, unit, address, registers, response):
+        if self.read_after_write and (response is not None) and (not response.isError()) and \
+                (unit in (None, 0, self._modbus_addr,)):
+            self._apply_write(address, registers)
+        return response
+
+    def _apply_write(self, address, registers):
+        """Read after write: put written holding registers into the register image and into data, decoded like
+        the next read would decode them. The image keeps unchanged blocks from being decoded again, the keys
+        count as freshly read. Number and select values without a sensor on the register are derived from
+        the scale or option_dict of their description."""
+        end = address + len(registers)
+        now = (time.monotonic(), time.time(),)
+        delta = set()
+        written = set()
+        with self._data_lock:
+            self._raw_changed('holding', address, registers)
+            for block in self.holdingBlocks:
+                if (block.start >= end) or (block.end <= address): continue
+                bkey = ('holding', block.start,)
+                regs = [reg for reg in block.regs
+                        if (reg >= address) and (reg + register_width(block.descriptions[reg]) <= end)]
+                if not regs: continue
+                plan = self.decode_plan(sub_block(block, regs))
+                plan.decode(registers[regs[0] - address:], self.data, self.plugin.isAwake, delta)
+                written.update(plan.keys)
+                if regs == block.regs: self._block_times[bkey] = now  # the whole block is known
+            for reg in range(address, end):
+                for descr in self.writeRegs.get(reg, ()):
+                    key = getattr(descr, 'state', None) or descr.key
+                    if key in written: continue
+                    val = self._written_value(descr, registers[reg - address:])
+                    if val is None: continue
+                    if (key not in self.data) or (self.data[key] != val): delta.add(key)
+                    self.data[key] = val
+                    written.add(key)
+            for key in written: self._write_times[key] = now
+            self._settle(delta, written)
+        if delta: self._notify(delta, EVENT_WRITE)
+
+    def read_scale(self, descr):
+        """Additional scale of an entity on this inverter, from its read_scale_exceptions, 1 if none applies."""
+        readscale = 1
+        for (prefix, value,) in (getattr(descr, 'read_scale_exceptions', None) or ()):
+            if self.seriesnumber.startswith(prefix): readscale = value
+        return readscale
+
+    def _written_plan(self, descr):
+        """DecodePlan of the registers written by a number entity. It is the plan of the sensor that polls the
+        value, so a written value is signed, scaled and rounded like the next read of it. Numbers without such a
+        sensor decode with their own unit and scale, signed when they accept negative values.
+        None if the value cannot be derived."""
+        key = getattr(descr, 'state', None) or descr.key
+        if key in self._written_plans: return self._written_plans[key]
+        entry = self._polled.get(key)
+        if entry is None:
+            unit = descr.unit
+            if unit is None:
+                minimum = descr.native_min_value
+                unit = REGISTER_S16 if (type(minimum) in (int, float,)) and (minimum < 0) else REGISTER_U16
+            try:
+                self.encoders.get(unit)
+            except ValueError:
+                unit = None  # unit without encoder
+            if (unit is not None) and (type(descr.scale) in (int, float,)):
+                # rounding hides the float noise of scaling back the value / scale written by the entity
+                entry = BaseModbusSensorEntityDescription(key=key, register=descr.register, unit=unit,
+                                                          scale=descr.scale, rounding=6)
+        plan = None
+        if entry is not None:
+            plan = DecodePlan(block(start=0, end=register_width(entry), descriptions={0: entry}, regs=[0]),
+                              self.plugin.order16, self.plugin.order32, False)
+        self._written_plans[key] = plan
+        return plan
+
+    def _written_value(self, descr, registers):
+        """Value of the registers written by a number or select entity as a poll would store it in data,
+        without the read scale the entity applies on top (see read_scale). None if it cannot be derived."""
+        if isinstance(descr, BaseModbusSelectEntityDescription):
+            return (descr.option_dict or {}).get(registers[0])
+        plan = self._written_plan(descr)
+        if (plan is None) or (len(registers) < plan.count): return None
+        values = {}
+        plan.decode(registers, values, lambda data: True)
+        return values.get(getattr(descr, 'state', None) or descr.key)
+
+    def _pending_writes(self, res):
+        """Returns the queued writes that can be sent now as WriteGroups of contiguous registers,
+        and empties the queue."""
         if res and self.writequeue and self.plugin.isAwake(self.data):  # self.awakeplugin(self.data):
             # process outstanding write requests
             _LOGGER.info(f"inverter is now awake, processing outstanding write requests {self.writequeue}")
-            for addr in self.writequeue:
-                val = self.writequeue.pop(addr)
-                self.write_register(self.modbus_addr, addr, val)
-            self.writequeue = {}  # not really needed
+            return self.writequeue.take(self.plugin.write_block_size)
+        return []
+
+    def _written(self, group, response=None, ex=None):
+        """Complete the futures of a group of queued writes."""
+        if (ex is None) and response.isError(): ex = ModbusException(f"writing 0x{group.start:x}: {response}")
+        if ex is not None:
+            _LOGGER.error(f"{self.name}: queued write of {len(group.values)} registers at 0x{group.start:x} failed: {ex}")
+        group.resolve(response, ex)
+
+    def _write_group(self, group):
+        """Send a group of queued writes, a single register with write_register, more in one FC16 request."""
+        try:
+            if len(group.values) == 1:
+                response = self._lowlevel_write_register(self._modbus_addr, group.start, group.values[0])
+            else:
+                response = self._lowlevel_write_registers(self._modbus_addr, group.start, group.values)
+        except Exception as ex:
+            return self._written(group, ex=ex)
+        self._written(group, response)
+
+    def read_modbus_registers_all(self):
+        cycle = self._modbus_cycle()
+        return self._finish_cycle(cycle, next(cycle))
+
+    def _finish_cycle(self, cycle, requests, responses=None):
+        """Drive a started poll cycle to its end, then send the queued writes.
+        responses can hold the answers to the pending requests when they were read by the caller."""
+        try:
+            while True:
+                if responses is None: responses = self._read_requests(requests)
+                with self._data_lock:
+                    requests = cycle.send(responses)
+                responses = None
+        except StopIteration as stop:
+            res = stop.value
+        for group in self._pending_writes(res): self._write_group(group)
+        return res
+
+
+class _SyncHubBridge:
+    """Blocking view on an async hub, for plugin code (e.g. determineInverterType) running in an executor thread."""
+
+    def __init__(self, hub, loop):
+        object.__setattr__(self, '_hub', hub)
+        object.__setattr__(self, '_loop', loop)
+
+    def __getattr__(self, attr):
+        return getattr(self._hub, attr)
+
+    def __setattr__(self, attr, value):
+        setattr(self._hub, attr, value)
+
+    def read_holding_registers(self, unit, address, count):
+        return asyncio.run_coroutine_threadsafe(self._hub.read_holding_registers(unit, address, count),
+                                                self._loop).result()
+
+    def read_input_registers(self, unit, address, count):
+        return asyncio.run_coroutine_threadsafe(self._hub.read_input_registers(unit, address, count),
+                                                self._loop).result()
+
+
+class AsyncSolaXModbusHub(SolaXModbusHub):
+    """Asyncio variant of the hub, built on the pymodbus async clients.
+    Many hubs can be polled from a single event loop; call async_setup() before polling."""
+
+    asynchronous = True  # uses asyncio pymodbus clients
+
+    def __init__(self, name, pipeline_window=DEFAULT_PIPELINE_WINDOW, **kwargs):
+        """Initialize the async Modbus hub, takes the same arguments as SolaXModbusHub.
+        pipeline_window is the max number of block reads in flight at once on Modbus TCP, 1 disables pipelining."""
+        super().__init__(name, **kwargs)
+        self._poll_task = None
+        self.pipeline_window = pipeline_window
+
+    def determine_inverter_type(self):
+        return 0  # needs modbus access, determined in async_setup
+
+    async def async_setup(self):
+        """Connect and determine the inverter type."""
+        await self.connect()
+        loop = asyncio.get_running_loop()
+        # the plugin code is synchronous, run it in an executor thread with a blocking view on this hub
+        self._invertertype = await loop.run_in_executor(None, self.plugin.determineInverterType,
+                                                        _SyncHubBridge(self, loop))
+        return self._invertertype
+
+    async def async_refresh_modbus_data(self, _now: Optional[int] = None) -> None:
+        """Time to update."""
+        if self._begin_refresh():
+            self._end_refresh(await self.read_modbus_data())
+
+    async def async_poll(self, policy=None):
+        """Polling coroutine, runs refresh cycles on a drift free grid of scan intervals until cancelled."""
+        self.scheduler = AsyncPollScheduler(self.async_refresh_modbus_data, self._scan_interval.total_seconds(),
+                                            name=self.name, **({'policy': policy} if policy else {}))
+        await self.scheduler.run()
+
+    def start_polling(self, policy=None):
+        """Start the polling coroutine as a task on the running loop, and the tasks of the fast lanes."""
+        if self._poll_task is None:
+            self._poll_task = asyncio.get_running_loop().create_task(self.async_poll(policy))
+            for lane in self.fast_lanes.values(): self._start_lane(lane)
+        return self._poll_task
+
+    async def refresh_fast_lane(self, name):
+        """One cycle of a fast lane, skipped while the inverter sleeps. Returns True when all blocks were read."""
+        lane = self.fast_lanes[name]
+        requests = lane.requests  # the lane may be planned again while it is read
+        if (self.sleep_state != SLEEP_AWAKE) or not requests: return False
+        try:
+            responses = await self._read_requests(requests)
+        except Exception:
+            _LOGGER.exception(f"{self.name}: reading fast lane {name} failed")
+            return False
+        return self._end_lane(lane, requests, responses)
+
+    def _polling(self):
+        return self._poll_task is not None
+
+    def _start_lane(self, lane):
+        if lane.scheduler is None:
+            lane.scheduler = AsyncPollScheduler(lambda: self.refresh_fast_lane(lane.name), lane.interval,
+                                                name=f"{self.name}-{lane.name}")
+            lane.task = asyncio.get_running_loop().create_task(lane.scheduler.run())
+
+    def _stop_lane(self, lane):
+        if lane.task is not None: lane.task.cancel()
+        lane.scheduler = lane.task = None
+
+    async def close(self):
+        """Stop polling and disconnect client."""
+        for lane in self.fast_lanes.values(): self._stop_lane(lane)
+        if self._poll_task:
+            self._poll_task.cancel()
+            self._poll_task = None
+        if (not self._pooled) or POOL.release(self._transport):
+            await self._transport.close()
+
+    async def connect(self):
+        """Connect client."""
+        await self._transport.connect()
+
+    async def read_holding_registers(self, unit, address, count, priority=PRIORITY_BACKGROUND):
+        """Read holding registers."""
+        async with self._lock.claim(priority):
+            await self._transport.ensure_connected()
+            kwargs = {UNIT_OR_SLAVE: unit} if unit else {}
+            return await self._client.read_holding_registers(address, count, **kwargs)
+
+    async def read_input_registers(self, unit, address, count, priority=PRIORITY_BACKGROUND):
+        """Read input registers."""
+        async with self._lock.claim(priority):
+            await self._transport.ensure_connected()
+            kwargs = {UNIT_OR_SLAVE: unit} if unit else {}
+            _LOGGER.debug(f"read_input_register Unit: {unit}, Address: {address}, Count:{count}")
+            return await self._client.read_input_registers(address, count, **kwargs)
+
+    async def _send_write(self, unit, address, registers, multiple=True, priority=PRIORITY_CONTROL):
+        """Send encoded registers, see SolaXModbusHub._send_write."""
+        async with self._lock.claim(priority):
+            await self._transport.ensure_connected()
+            kwargs = {UNIT_OR_SLAVE: unit} if unit else {}
+            if multiple:
+                response = await self._client.write_registers(address, registers, **kwargs)
+            else:
+                response = await self._client.write_register(address, registers[0], **kwargs)
+        return self._acknowledged(unit, address, registers, response)
+
+    async def _lowlevel_write_register(self, unit, address, payload):
+        return await self._send_write(unit, address, self.encoders.encode16(payload), multiple=False)
+
+    async def _lowlevel_write_registers(self, unit, address, payloads):
+        """Write contiguous registers in one write multiple registers (FC16) request."""
+        return await self._send_write(unit, address, [self.encoders.encode16(payload)[0] for payload in payloads])
+
+    async def write_register(self, unit, address, payload):
+        """Write register."""
+        awake = self.plugin.isAwake(self.data)
+        if awake:
+            return await self._lowlevel_write_register(unit, address, payload)
+        else:
+            # put request in queue
+            self.queue_write(address, payload)
+            return await self._wake_up()
+
+    async def _wake_up(self):
+        """Press the awake button of a sleeping inverter, see SolaXModbusHub._wake_up."""
+        if self.awake_button:
+            _LOGGER.info("waking up inverter: pressing awake button")
+            return await self._lowlevel_write_register(unit=self._modbus_addr, address=self.awake_button.register,
+                                                       payload=self.awake_button.command)
+        else:
+            _LOGGER.warning("cannot wakeup inverter: no awake button found")
+
+    async def write_registers_single(self, unit, address, payload):
+        """Write a single 16 bit register with a write multiple registers (FC16) request."""
+        return await self._send_write(unit, address, self.encoders.encode16(payload))
+
+    async def write_registers_multi(self, unit, address, payload):
+        """Write consecutive registers in one FC16 request, see SolaXModbusHub.write_registers_multi."""
+        return await self._send_write(unit, address, self.encoders.encode_all(payload))
+
+    async def apply_profile(self, profile, verify=True, priority=PRIORITY_BACKGROUND):
+        """Bring the entities to the values of a profile, see SolaXModbusHub.apply_profile."""
+        plan = profile.plan(self)
+        awake = self.plugin.isAwake(self.data)
+        for group in plan.groups:
+            if not awake:
+                plan.queued(group)
+                continue
+            try:
+                response = await self._send_write(self._modbus_addr, group.start, group.values, plan.multiple(group),
+                                                  priority)
+            except Exception as ex:
+                plan.sent(group, ex=ex)
+                continue
+            plan.sent(group, response)
+        if plan.result.queued: await self._wake_up()
+        if verify and awake:
+            for group in plan.groups:
+                try:
+                    response = await self.read_holding_registers(self._modbus_addr, group.start, len(group.values),
+                                                                 priority)
+                except Exception as ex:
+                    plan.verify_failed(group, ex)
+                    continue
+                if response.isError():
+                    plan.verify_failed(group, response)
+                    continue
+                plan.verified(group, response.registers)
+                self._apply_write(group.start, response.registers)  # the registers as the inverter has them
+        return plan.result
+
+    async def read_modbus_data(self):
+        res = True
+        try:
+            res = await self.read_modbus_registers_all()
+        except ConnectionException as ex:
+            _LOGGER.error("Reading data failed! Inverter is offline.")
+            res = False
+        except Exception as ex:
+            _LOGGER.exception("Something went wrong reading from modbus")
+            res = False
+        return res
+
+    async def read_block_registers(self, block, typ):
+        """Read the raw registers of a block, returns the pymodbus response."""
+        if typ == 'input':
+            return await self.read_input_registers(unit=self._modbus_addr, address=block.start,
+                                                   count=block.end - block.start, priority=self._priority(block))
+        else:
+            return await self.read_holding_registers(unit=self._modbus_addr, address=block.start,
+                                                     count=block.end - block.start, priority=self._priority(block))
+
+    async def read_modbus_block(self, block, typ):
+        try:
+            realtime_data = await self.read_block_registers(block, typ)
+        except Exception as ex:
+            self._read_failed(block, typ, ex)
+            return False
+        return self.treat_block(block, typ, realtime_data)
+
+    async def _read_request_unlocked(self, typ, block, window):
+        async with window:
+            kwargs = {UNIT_OR_SLAVE: self._modbus_addr} if self._modbus_addr else {}
+            if typ == 'input':
+                return await self._client.read_input_registers(block.start, block.end - block.start, **kwargs)
+            else:
+                return await self._client.read_holding_registers(block.start, block.end - block.start, **kwargs)
+
+    async def _read_probe(self, typ, block):
+        """Read the probe block within probe_timeout, returns None when there is no answer.
+        The client timeout is not changed, pipelined requests of other hubs may be in flight."""
+
+        async def probe():
+            await self._transport.ensure_connected()
+            return await self._read_request_unlocked(typ, block, asyncio.Semaphore())
+
+        try:
+            async with self._lock:
+                return await asyncio.wait_for(probe(), self.probe_timeout)
+        except Exception as ex:
+            _LOGGER.debug(f"{self.name}: no answer to probe read: {ex!r}")
+            return None
+
+    async def _read_requests_pipelined(self, requests):
+        """Send all block requests at once (up to pipeline_window in flight).
+        pymodbus tags each request with a Modbus TCP transaction id and matches the responses on that id.
+        The bus lock is not taken: requests of other hubs on the same gateway can be interleaved safely."""
+        await self._transport.ensure_connected()
+        window = asyncio.Semaphore(self.pipeline_window)
+        results = await asyncio.gather(*[self._read_request_unlocked(typ, block, window) for (typ, block,) in requests],
+                                       return_exceptions=True)
+        failed = [i for (i, res) in enumerate(results) if isinstance(res, BaseException)]
+        if not failed: return results
+        # no answer for some requests: retry them one at a time to detect gateways that serialize requests
+        retried = await self._read_requests_sequential([requests[i] for i in failed])
+        if any(res is not None for res in retried):
+            _LOGGER.warning(f"{self.name}: gateway {self._transport.key} does not handle pipelined requests, "
+                            f"falling back to one request at a time")
+            self._transport.pipelining = False
+        for (i, res) in zip(failed, retried): results[i] = res
+        return results
+
+    async def _read_requests(self, requests):
+        """Execute the read requests of a cycle, pipelined on Modbus TCP transports that allow it."""
+        if self.probing: return [await self._read_probe(*requests[0])]
+        if (self.pipeline_window > 1) and self._transport.pipelining and (len(requests) > 1):
+            return await self._read_requests_pipelined(requests)
+        return await self._read_requests_sequential(requests)
+
+    async def _read_requests_sequential(self, requests):
+        """Execute the read requests of a cycle one after the other, stops at the first block without answer."""
+        responses = []
+        for (typ, block,) in requests:
+            try:
+                realtime_data = await self.read_block_registers(block, typ)
+            except Exception as ex:
+                self._read_failed(block, typ, ex)
+                realtime_data = None
+            responses.append(realtime_data)
+            if self._no_answer(realtime_data): break
+        return responses + [None] * (len(requests) - len(responses))
+
+    async def read_modbus_registers_all(self):
+        cycle = self._modbus_cycle()
+        return await self._finish_cycle(cycle, next(cycle))
+
+    async def _finish_cycle(self, cycle, requests, responses=None):
+        """Drive a started poll cycle to its end, then send the queued writes."""
+        try:
+            while True:
+                if responses is None: responses = await self._read_requests(requests)
+                requests = cycle.send(responses)
+                responses = None
+        except StopIteration as stop:
+            res = stop.value
+        for group in self._pending_writes(res): await self._write_group(group)
         return res
 
+    async def _write_group(self, group):
+        """Send a group of queued writes, a single register with write_register, more in one FC16 request."""
+        try:
+            if len(group.values) == 1:
+                response = await self._lowlevel_write_register(self._modbus_addr, group.start, group.values[0])
+            else:
+                response = await self._lowlevel_write_registers(self._modbus_addr, group.start, group.values)
+        except Exception as ex:
+            return self._written(group, ex=ex)
+        self._written(group, response)
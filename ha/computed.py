@@ -0,0 +1,90 @@
+"""Dependency graph of the computed sensors (entities with a value_function and no modbus register)."""
+import logging
+from collections.abc import Mapping
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class _TracingMapping(Mapping):
+    """Read only view on the hub data that records the keys a value_function looks at."""
+
+    def __init__(self, data):
+        self._data = data
+        self.keys_read = set()
+
+    def __getitem__(self, key):
+        self.keys_read.add(key)
+        return self._data[key]
+
+    def __contains__(self, key):
+        self.keys_read.add(key)
+        return key in self._data
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __len__(self):
+        return len(self._data)
+
+
+class ComputedGraph:
+    """Inputs and evaluation order of the computed sensors.
+
+    The inputs of a computed sensor are its depends_on keys plus every key its value_function read so far;
+    they are traced on each evaluation, so inputs used in a branch are picked up when the branch is taken.
+    Sensors are evaluated in dependency order and only when one of their inputs changed in the cycle."""
+
+    def __init__(self, computedRegs):
+        self.source = computedRegs
+        self.descriptions = {descr.key: descr for descr in computedRegs.values()}
+        self.inputs = {key: set(descr.depends_on or ()) for (key, descr,) in self.descriptions.items()}
+        self._evaluated = set()  # keys evaluated at least once since the last reset
+        self.version = 0  # incremented whenever new inputs were traced
+        self._sort()
+
+    def _sort(self):
+        """Topological order, sensors in a dependency cycle are evaluated in declaration order."""
+        pending = {key: self.inputs[key].intersection(self.descriptions) - {key} for key in self.descriptions}
+        self.order = []
+        while pending:
+            ready = [key for key in pending if not pending[key]]
+            if not ready:
+                _LOGGER.warning(f"dependency cycle between computed sensors {sorted(pending)}")
+                ready = list(pending)
+            for key in ready:
+                self.order.append(key)
+                pending.pop(key)
+            for deps in pending.values(): deps.difference_update(ready)
+
+    def reset(self):
+        """Evaluate all sensors again in the next cycle, e.g. after the data was modified outside a cycle."""
+        self._evaluated.clear()
+
+    def evaluate(self, data, delta, affected_only=False):
+        """Re-evaluate the sensors whose inputs are in delta (all of them after a reset) and store them in data.
+        Keys whose value changed are added to delta. When new inputs were traced the order is rebuilt and the
+        affected sensors are evaluated once more, so the result does not depend on the declaration order.
+        With affected_only, sensors whose inputs are not in delta are skipped even when never evaluated."""
+        for attempt in range(2):
+            regraph = False
+            for key in self.order:
+                if ((key in self._evaluated) or affected_only) and self.inputs[key].isdisjoint(delta): continue
+                descr = self.descriptions[key]
+                tracer = _TracingMapping(data)
+                try:
+                    val = descr.value_function(0, descr, tracer)
+                except KeyError:
+                    if attempt or tracer.keys_read.isdisjoint(self.descriptions): raise
+                    # reads a computed sensor that comes later in the current order: retry after sorting
+                    self.inputs[key] |= tracer.keys_read
+                    regraph = True
+                    continue
+                if not tracer.keys_read <= self.inputs[key]:
+                    self.inputs[key] |= tracer.keys_read
+                    regraph = True
+                self._evaluated.add(key)
+                if (key not in data) or (data[key] != val): delta.add(key)
+                data[key] = val
+            if not regraph: return
+            self.version += 1
+            self._sort()
@@ -1,4 +1,5 @@
 import logging
+import os
 from enum import Enum
 from typing import Any, TypeVar
 
@@ -13,16 +14,31 @@ DOMAIN = "solax_modbus"
 DEFAULT_NAME = "SolaX"
 DEFAULT_SCAN_INTERVAL = 15
 DEFAULT_PORT = 502
+DEFAULT_TCP_TYPE = "tcp"  # "tcp" for Modbus TCP, "rtu" for RTU frames over TCP
+DEFAULT_KEEPALIVE = 30  # seconds of idle time before tcp keepalive probes are sent
+DEFAULT_PIPELINE_WINDOW = 8  # max nr of block reads in flight on Modbus TCP, 1 for one request at a time
+DEFAULT_PROBE_TIMEOUT = 0.5  # seconds to wait for the answer to the probe read of a sleeping inverter
+DEFAULT_SLEEP_BACKOFF = 2  # cycles between the probes of an inverter that just went to sleep, doubled after each probe
+DEFAULT_SLEEP_BACKOFF_MAX = 32  # max cycles between two probes
+HOLES_FILE = None  # json file with the learned unreadable register ranges per inverter model, None: not stored
+DEFAULT_CONFIG_DIR = os.path.join(os.path.expanduser("~"), ".config", "solax_modbus")
+DEFAULT_HOLES_FILE = "holes.json"  # in the config dir, used by the hubs set up from a config entry
+HOLES_PREFIX_LEN = 6  # nr of serial number characters that identify an inverter model for learned holes
 DEFAULT_MODBUS_ADDR = 1
 CONF_READ_EPS = "read_eps"
 CONF_READ_DCB = "read_dcb"
 CONF_READ_PM = "read_pm"
 CONF_MODBUS_ADDR = "read_modbus_addr"
 CONF_INTERFACE = "interface"
+CONF_HOST = "host"
+CONF_PORT = "port"
+CONF_TCP_TYPE = "tcp_type"
 CONF_SERIAL_PORT = "read_serial_port"
 CONF_SolaX_HUB = "solax_hub"
 CONF_BAUDRATE = "baudrate"
 CONF_PLUGIN = "plugin"
+CONF_CONFIG_DIR = "config_dir"
+CONF_HOLES_FILE = "holes_file"  # path of the learned holes, None to keep them in memory only
 ATTR_MANUFACTURER = "SolaX Power"
 DEFAULT_INTERFACE = "tcp"
 DEFAULT_SERIAL_PORT = "/dev/ttyUSB0"
@@ -37,8 +53,23 @@ SLEEPMODE_ZERO = 0  # when no communication at all
 SLEEPMODE_LAST = 1  # when no communication at all
 SLEEPMODE_LASTAWAKE = 2  # when still responding but register must be ignored when not awake
 
+SLEEP_AWAKE = "awake"  # full poll plan every cycle
+SLEEP_SILENT = "silent"  # no answer: a single probe read at backoff intervals, full plan after the first answer
+SLEEP_STANDBY = "standby"  # answers, but plugin.isAwake is false: full plan at backoff intervals
+
 # ================================= Definitions for Sennsor Declarations =================================================
 
+POLL_TIER_FAST = 0  # read every cycle, e.g. power values
+POLL_TIER_NORMAL = 1
+POLL_TIER_SLOW = 2  # configuration values that rarely change
+POLL_TIER_ONCE = 3  # identity values, only read once after startup
+DEFAULT_POLL_TIER_INTERVALS = {  # read every n cycles, 0 means only once
+    POLL_TIER_FAST: 1,
+    POLL_TIER_NORMAL: 1,
+    POLL_TIER_SLOW: 12,
+    POLL_TIER_ONCE: 0,
+}
+
 REG_HOLDING = 1  # modbus holding register
 REG_INPUT = 2  # modbus input register
 # REG_DATA    = 3  # local data storage register, no direct modbus relation
@@ -158,6 +189,7 @@ class plugin_base:
     NUMBER_TYPES: list[None]
     SELECT_TYPES: list[None]
     block_size: int = 100
+    write_block_size: int = 123  # max registers in one write multiple registers (FC16) request, 123 in the modbus spec
     order16: int = None # Endian.Big or Endian.Little
     order32: int = None
 
@@ -242,8 +274,11 @@ class BaseModbusSensorEntityDescription():
     #order32: int = None
     newblock: bool = False # set to True to start a new modbus read block operation - do not use frequently
     value_function: callable = None #  value = function(initval, descr, datadict)
+    depends_on: list = None # keys a computed value_function reads, in addition to the ones traced at runtime
     wordcount: int = None # only for unit = REGISTER_STR and REGISTER_WORDS
     sleepmode: int = SLEEPMODE_LAST # or SLEEPMODE_ZERO or SLEEPMODE_NONE
+    poll_tier: int = POLL_TIER_NORMAL # or POLL_TIER_FAST, POLL_TIER_SLOW, POLL_TIER_ONCE
+    deadband: float = None # only notify listeners when the value moved more than this since the last notification
     entity_category:EntityCategory = None
     native_unit_of_measurement:None = None,
     device_class: None = None,
@@ -0,0 +1,224 @@
+"""Precompiled block decoders: one struct unpack per block followed by a flat loop over the entities."""
+import logging
+import struct
+
+from pymodbus.payload import Endian
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional, decoding falls back to plain python
+    np = None
+
+from .const import REGISTER_U16, REGISTER_S16, REGISTER_U32, REGISTER_S32, REGISTER_ULSB16MSB16, REGISTER_STR, \
+    REGISTER_WORDS, REGISTER_U8H, SLEEPMODE_LASTAWAKE
+from .planner import register_width
+
+_LOGGER = logging.getLogger(__name__)
+
+# how the raw value of an action is taken from the unpacked block
+VALUE = 0  # single 16 or 32 bit field
+BYTE_L = 1  # low byte of a 16 bit field
+BYTE_H = 2  # high byte of a 16 bit field
+LSB16MSB16 = 3  # two 16 bit fields, least significant first
+WORDS = 4  # list of wordcount 16 bit fields
+STRING = 5  # ascii bytes, taken from the raw big endian registers
+ZERO = 6  # unsupported unit
+
+# how the raw value is converted to the entity value
+SCALE_NUMBER = 0
+SCALE_DICT = 1
+SCALE_FUNCTION = 2
+SCALE_NONE = 3
+
+VECTORIZE_MIN = 64  # numerically scaled entities a block needs before the numpy stage pays off (measured)
+
+_FIELDS = {REGISTER_U16: 'H', REGISTER_S16: 'h', REGISTER_U32: 'I', REGISTER_S32: 'i', }
+
+
+def _scale_kind(descr, kind):
+    if type(descr.scale) is dict: return SCALE_DICT
+    if callable(descr.scale): return SCALE_FUNCTION
+    if kind in (WORDS, STRING,): return SCALE_NONE  # numeric scaling does not apply to lists and strings
+    return SCALE_NUMBER
+
+
+class DecodePlan:
+    """Decoder for one block, compiled once from the block layout and the plugin endianness.
+
+    The registers are packed once and unpacked with a single struct covering the whole block: packing each
+    register in the 16 bit byte order and unpacking in the 32 bit word order gives the same values as
+    BinaryPayloadDecoder(byteorder=order16, wordorder=order32).
+    actions is a flat list of (kind, index, descr, key, scalekind, scale, rounding, lastawake, vpos) tuples.
+    When vectorized, the numerically scaled entities are scaled and rounded with numpy in one pass;
+    vpos is then the position of the entity in the vector result, -1 for entities handled in python."""
+
+    def __init__(self, block, order16, order32, vectorize=None):
+        self.start = block.start
+        self.count = block.end - block.start
+        unpack_order = '<' if order32 == Endian.Little else '>'
+        pack_order = '>' if order16 == order32 else '<'
+        self._pack = struct.Struct(f"{pack_order}{self.count}H").pack
+        self._pack_raw = struct.Struct(f">{self.count}H").pack  # payload as sent by the device, for strings
+        fmt = []
+        self.actions = []
+        nvalues = 0
+        pos = block.start
+        for reg in block.regs:
+            if reg > pos: fmt.append(f"{(reg - pos) * 2}x")
+            descr = block.descriptions[reg]
+            if type(descr) is dict:  # set of byte values
+                fmt.append('H')
+                for k in descr:
+                    self._add_action(BYTE_H if descr[k].unit == REGISTER_U8H else BYTE_L, nvalues, descr[k])
+                nvalues += 1
+            elif descr.unit in _FIELDS:
+                fmt.append(_FIELDS[descr.unit])
+                self._add_action(VALUE, nvalues, descr)
+                nvalues += 1
+            elif descr.unit == REGISTER_ULSB16MSB16:
+                fmt.append('HH')
+                self._add_action(LSB16MSB16, nvalues, descr)
+                nvalues += 2
+            elif descr.unit == REGISTER_WORDS:
+                fmt.append(f"{descr.wordcount}H")
+                self._add_action(WORDS, nvalues, descr)
+                nvalues += descr.wordcount
+            elif descr.unit == REGISTER_STR:
+                fmt.append(f"{descr.wordcount * 2}x")
+                self._add_action(STRING, (reg - block.start) * 2, descr)
+            else:
+                _LOGGER.warning(f"undefinded unit for entity {descr.key} - setting value to zero")
+                fmt.append('2x')
+                self._add_action(ZERO, 0, descr)
+            pos = reg + register_width(descr)
+        self._unpack_from = struct.Struct(unpack_order + ''.join(fmt)).unpack_from
+        self.nvalues = nvalues
+        self.keys = tuple(action[3] for action in self.actions)
+        self.lastawake = any(action[7] for action in self.actions)
+        # blocks with the same layout (same entity descriptions at the same registers) can share a plan
+        self.layout = (block.start, self.count, order16, order32, tuple(block.regs),
+                       tuple(id(action[2]) for action in self.actions),)
+        if vectorize is None:
+            vectorize = (np is not None) and (len(self._vector_actions()) >= VECTORIZE_MIN)
+        self.vectorized = bool(vectorize) and (np is not None)
+        if self.vectorized: self._compile_vector()
+
+    def _add_action(self, kind, index, descr):
+        scalekind = _scale_kind(descr, kind)
+        self.actions.append((kind, index, descr, descr.key, scalekind, descr.scale, descr.rounding,
+                             descr.sleepmode == SLEEPMODE_LASTAWAKE, -1,))
+
+    def _vector_actions(self):
+        return [i for (i, a,) in enumerate(self.actions)
+                if (a[4] == SCALE_NUMBER) and (a[0] in (VALUE, BYTE_L, BYTE_H, LSB16MSB16,))]
+
+    def _compile_vector(self):
+        """Index and scale arrays of the numpy stage. Entities with an integer scale stay integers,
+        like round(int, rounding) does, the others are scaled and rounded as float64 per rounding group."""
+        selected = self._vector_actions()
+        ints = [i for i in selected if type(self.actions[i][5]) is int]
+        floats = [i for i in selected if type(self.actions[i][5]) is not int]
+        order = ints + floats
+        for (vpos, i,) in enumerate(order):
+            self.actions[i] = self.actions[i][:8] + (vpos,)
+        kinds = [self.actions[i][0] for i in order]
+        self._vindex = np.array([self.actions[i][1] for i in order], dtype=np.intp)
+        self._vbyte_l = np.array([p for (p, k,) in enumerate(kinds) if k == BYTE_L], dtype=np.intp)
+        self._vbyte_h = np.array([p for (p, k,) in enumerate(kinds) if k == BYTE_H], dtype=np.intp)
+        self._vlsb = np.array([p for (p, k,) in enumerate(kinds) if k == LSB16MSB16], dtype=np.intp)
+        self._vmsb = self._vindex[self._vlsb] + 1
+        self._nints = len(ints)
+        self._vint_scale = np.array([self.actions[i][5] for i in ints], dtype=np.int64)
+        self._vfloat_scale = np.array([self.actions[i][5] for i in floats], dtype=np.float64)
+        groups = {}
+        for (p, i,) in enumerate(floats): groups.setdefault(self.actions[i][6], []).append(p)
+        self._vrounding = [(rounding, np.array(pos, dtype=np.intp),) for (rounding, pos,) in groups.items()]
+
+    def vector(self, values):
+        """Numpy stage: values is an int64 array of raw fields, one row per read of the block.
+        Returns the integer and the float results, the vpos of an entity indexes their concatenation."""
+        raw = values[..., self._vindex]
+        if len(self._vbyte_l): raw[..., self._vbyte_l] %= 256
+        if len(self._vbyte_h): raw[..., self._vbyte_h] >>= 8
+        if len(self._vlsb): raw[..., self._vlsb] += values[..., self._vmsb] * 65536
+        ints = raw[..., :self._nints] * self._vint_scale
+        floats = raw[..., self._nints:] * self._vfloat_scale
+        for (rounding, pos,) in self._vrounding:
+            part = floats[..., pos]
+            rounded = np.round(part, rounding)
+            # numpy rounds x * 10**n half to even, python rounds the exact binary value: redo near halves in python
+            shifted = part * 10.0 ** rounding
+            for idx in zip(*np.nonzero(np.abs(shifted - np.floor(shifted) - 0.5) < 1e-6)):
+                rounded[idx] = round(float(part[idx]), rounding)
+            floats[..., pos] = rounded
+        return (ints, floats,)
+
+    def unpack(self, registers):
+        """Raw values of all fields of the block."""
+        return self._unpack_from(self._pack(*registers[:self.count]))
+
+    def decode(self, registers, data, isAwake, changed=None):
+        """Decode the registers of a block and store the entity values in data.
+        Registers with SLEEPMODE_LASTAWAKE are only stored while isAwake(data) is true.
+        The keys whose value changed are added to the changed set, if given."""
+        values = self.unpack(registers)
+        vec = None
+        if self.vectorized:
+            (ints, floats,) = self.vector(np.array(values, dtype=np.int64))
+            vec = ints.tolist() + floats.tolist()
+        self.store(values, vec, registers, data, isAwake, changed)
+
+    def store(self, values, vec, registers, data, isAwake, changed=None):
+        """Convert the unpacked values and store them in data, vec holds the results of the numpy stage."""
+        raw = None
+        assign = getattr(data, 'assign', None)  # ValueStore: store and compare in one call
+        for (kind, index, descr, key, scalekind, scale, rounding, lastawake, vpos,) in self.actions:
+            if vpos >= 0:
+                val = vec[vpos]
+            else:
+                if kind == VALUE:
+                    val = values[index]
+                elif kind == BYTE_L:
+                    val = values[index] % 256
+                elif kind == BYTE_H:
+                    val = values[index] >> 8
+                elif kind == LSB16MSB16:
+                    val = values[index] + values[index + 1] * 256 * 256
+                elif kind == WORDS:
+                    val = list(values[index:index + descr.wordcount])
+                elif kind == STRING:
+                    if raw is None: raw = self._pack_raw(*registers[:self.count])
+                    try:
+                        val = raw[index:index + descr.wordcount * 2].decode("ascii")
+                    except UnicodeDecodeError:
+                        _LOGGER.warning(f"read failed at 0x{descr.register:02x}: {key} ")
+                        val = 0
+                else:
+                    val = 0
+                if scalekind == SCALE_NUMBER:
+                    val = round(val * scale, rounding)
+                elif scalekind == SCALE_DICT:  # translate int to string
+                    val = scale.get(val, "Unknown")
+                elif scalekind == SCALE_FUNCTION:
+                    val = scale(val, descr, data)
+            if lastawake and not isAwake(data): continue
+            if assign is not None:
+                if assign(key, val) and (changed is not None): changed.add(key)
+            else:
+                if (changed is not None) and ((key not in data) or (data[key] != val)): changed.add(key)
+                data[key] = val
+
+
+class DecodedResponse:
+    """A read response whose registers were already decoded into the hub data, see fleet.FleetDecoder."""
+    __slots__ = ('response',)
+
+    def __init__(self, response):
+        self.response = response
+
+    @property
+    def registers(self):
+        return self.response.registers
+
+    def isError(self):
+        return False
@@ -0,0 +1,123 @@
+"""Delivery of cycle events to consumers on worker threads, so slow consumers do not delay polling."""
+import asyncio
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, replace
+
+_LOGGER = logging.getLogger(__name__)
+
+COALESCE = "coalesce"  # a late consumer gets one event with the merged delta of the cycles it missed
+DROP = "drop"  # a late consumer only gets the latest cycle, the cycles in between are counted as dropped
+
+EVENT_CYCLE = "cycle"  # a full poll cycle
+EVENT_LANE = "lane"  # a fast lane cycle, in between the full cycles
+EVENT_WRITE = "write"  # acknowledged writes applied to the data
+
+
+@dataclass(frozen=True)
+class CycleEvent:
+    """A completed poll cycle of a hub, or a fast lane cycle or applied writes in between two poll cycles.
+    Lane and write events carry the cycle of the last full cycle, seq tells all events of a hub apart."""
+    cycle: int
+    timestamp: float
+    delta: frozenset  # keys that changed
+    snapshot: object = None  # DataSnapshot with the data at the end of the cycle
+    hub: str = None  # name of the hub that ran the cycle
+    cycles: int = 1  # number of cycles merged into this event
+    dropped: int = 0  # number of cycles dropped before this event
+    kind: str = EVENT_CYCLE  # EVENT_CYCLE, EVENT_LANE or EVENT_WRITE
+    seq: int = 0  # number of the event among all events of its hub, the latest one for merged events
+
+
+class Subscription:
+    """A consumer of cycle events, events are delivered to it one at a time and in order.
+    Events of different hubs or kinds are never merged."""
+
+    def __init__(self, callback, keys=None, policy=COALESCE, hub=None, kinds=None):
+        self.callback = callback
+        self.keys = None if keys is None else frozenset(keys)
+        self.policy = policy
+        self.hub = hub  # only events of this hub, None for all hubs
+        self.kinds = None if kinds is None else frozenset(kinds)  # only events of these kinds, None for all
+        self.pending = {}  # (hub, kind) -> event waiting for the running delivery to finish
+        self.running = False
+        self.delivered = 0
+        self.coalesced = 0
+        self.dropped = 0
+
+    def _queue(self, event):
+        """Merge an event into the pending one of its hub and kind according to the policy,
+        call with the dispatcher lock held."""
+        key = (event.hub, event.kind,)
+        last = self.pending.get(key)
+        if last is None:
+            self.pending[key] = event
+        elif self.policy == DROP:
+            self.dropped += last.cycles
+            self.pending[key] = replace(event, dropped=last.dropped + last.cycles + event.dropped)
+        else:
+            self.coalesced += 1
+            self.pending[key] = replace(event, delta=last.delta | event.delta, cycles=last.cycles + event.cycles,
+                                        dropped=last.dropped + event.dropped)
+
+    def wants(self, event):
+        if (self.hub is not None) and (event.hub != self.hub): return False
+        if (self.kinds is not None) and (event.kind not in self.kinds): return False
+        return (self.keys is None) or not self.keys.isdisjoint(event.delta)
+
+
+class CallbackDispatcher:
+    """Runs consumer callbacks on a bounded pool of worker threads.
+
+    dispatch() never blocks the poller: each subscription has at most one delivery running; events that
+    arrive meanwhile are coalesced or dropped per the subscription policy, so the work queued per consumer
+    stays bounded whatever its speed. Callbacks get a CycleEvent; coroutine callbacks run on loop."""
+
+    def __init__(self, max_workers=2, loop=None):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="sii-dispatch")
+        self._lock = threading.Lock()
+        self._subscriptions = []
+        self.loop = loop
+
+    def subscribe(self, callback, keys=None, policy=COALESCE, hub=None, kinds=None):
+        """Register callback(event); with keys it only gets the cycles in which one of these keys changed,
+        with hub only the cycles of the hub with that name, with kinds only events of these kinds,
+        e.g. kinds=[EVENT_CYCLE] for the full poll cycles."""
+        subscription = Subscription(callback, keys, policy, hub, kinds)
+        with self._lock:
+            self._subscriptions.append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            if subscription in self._subscriptions: self._subscriptions.remove(subscription)
+
+    def dispatch(self, event):
+        """Hand a cycle event to all interested subscriptions, returns immediately."""
+        with self._lock:
+            for subscription in self._subscriptions:
+                if not subscription.wants(event): continue
+                if subscription.running:
+                    subscription._queue(event)
+                else:
+                    subscription.running = True
+                    self._executor.submit(self._deliver, subscription, event)
+
+    def _deliver(self, subscription, event):
+        while True:
+            try:
+                result = subscription.callback(event)
+                if asyncio.iscoroutine(result):
+                    asyncio.run_coroutine_threadsafe(result, self.loop).result()
+            except Exception:
+                _LOGGER.exception(f"cycle event callback {subscription.callback} failed")
+            with self._lock:
+                subscription.delivered += 1
+                if not subscription.pending:
+                    subscription.running = False
+                    return
+                event = subscription.pending.pop(next(iter(subscription.pending)))
+
+    def close(self, wait=True):
+        self._executor.shutdown(wait=wait)
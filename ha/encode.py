@@ -0,0 +1,77 @@
+"""Precompiled register encoders for the write paths, the inverse of the decode plans."""
+import struct
+
+from pymodbus.payload import Endian
+
+from .const import REGISTER_U16, REGISTER_S16, REGISTER_U32, REGISTER_S32, REGISTER_STR, REGISTER_WORDS
+
+_FIELDS = {REGISTER_U16: 'H', REGISTER_S16: 'h', REGISTER_U32: 'I', REGISTER_S32: 'i', }
+
+
+class RegisterEncoder:
+    """Encodes values of one unit type into a list of registers, with one struct pack and one unpack.
+
+    Packing the value in the 32 bit word order and unpacking registers in the 16 bit byte order gives the
+    same registers as BinaryPayloadBuilder(byteorder=order16, wordorder=order32). Strings are sent as raw
+    ascii, padded with zero bytes to wordcount registers, like DecodePlan reads them."""
+
+    def __init__(self, unit, order16, order32, wordcount=None):
+        self.unit = unit
+        field_order = '<' if order32 == Endian.Little else '>'
+        register_order = '>' if order16 == order32 else '<'
+        if unit in _FIELDS:
+            fmt = field_order + _FIELDS[unit]
+        elif unit == REGISTER_STR:
+            (fmt, register_order,) = (f"{wordcount * 2}s", '>',)
+        elif unit == REGISTER_WORDS:
+            fmt = f"{field_order}{wordcount}H"
+        else:
+            raise ValueError(f"no register encoder for unit {unit}")
+        value_struct = struct.Struct(fmt)
+        self.width = value_struct.size // 2  # number of registers
+        register_struct = struct.Struct(f"{register_order}{self.width}H")
+        (self._pack, self._unpack_value,) = (value_struct.pack, value_struct.unpack,)
+        (self._unpack, self._pack_registers,) = (register_struct.unpack, register_struct.pack,)
+
+    def __call__(self, value):
+        if self.unit == REGISTER_STR:
+            return list(self._unpack(self._pack(value.encode("ascii"))))
+        if self.unit == REGISTER_WORDS:
+            return list(self._unpack(self._pack(*value)))
+        return list(self._unpack(self._pack(value)))
+
+    def decode(self, registers):
+        """Value of the first width registers, the inverse of encoding."""
+        values = self._unpack_value(self._pack_registers(*registers[:self.width]))
+        if self.unit == REGISTER_STR: return values[0].decode("ascii")
+        if self.unit == REGISTER_WORDS: return list(values)
+        return values[0]
+
+
+class EncoderRegistry:
+    """Register encoders of a plugin by unit type, compiled on first use."""
+
+    def __init__(self, order16, order32):
+        self.order16 = order16
+        self.order32 = order32
+        self._encoders = {}  # (unit, wordcount) -> RegisterEncoder
+
+    def get(self, unit, wordcount=None):
+        encoder = self._encoders.get((unit, wordcount,))
+        if encoder is None:
+            encoder = self._encoders[(unit, wordcount,)] = RegisterEncoder(unit, self.order16, self.order32, wordcount)
+        return encoder
+
+    def encode(self, unit, value, wordcount=None):
+        """Registers of a value of the given unit type, wordcount is needed for strings and word lists."""
+        return self.get(unit, wordcount)(value)
+
+    def encode16(self, value):
+        """Register of a 16 bit value, signed when it is negative."""
+        return self.get(REGISTER_S16 if value < 0 else REGISTER_U16)(value)
+
+    def encode_all(self, payload):
+        """Registers of a list of (unit, value) or (unit, value, wordcount) tuples, one after the other."""
+        registers = []
+        for item in payload: registers += self.encode(*item)
+        return registers
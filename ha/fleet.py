@@ -0,0 +1,128 @@
+"""Fleet decoding: the same block of many hubs of one inverter type is decoded in a single vectorised pass."""
+import asyncio
+import logging
+
+from pymodbus.exceptions import ConnectionException
+
+from .decode import DecodePlan, DecodedResponse, np
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class FleetDecoder:
+    """Polls a group of hubs and decodes their first round of block reads together.
+
+    Blocks of hubs with the same inverter type have identical layouts. The raw registers of such a block
+    are stacked into one 2-D array (one row per hub), scaled and rounded in one numpy pass, and the results
+    are scattered back into the data of each hub. Hubs with a different layout simply form their own groups.
+    Bisection reads after rejected blocks are decoded by the hubs themselves.
+    The hubs must all be sync (use refresh) or all async (use async_refresh)."""
+
+    def __init__(self, hubs=()):
+        self.hubs = list(hubs)
+        self._plans = {}  # layout -> vectorised DecodePlan shared by all hubs with that layout
+
+    def add(self, hub):
+        if hub not in self.hubs: self.hubs.append(hub)
+
+    def remove(self, hub):
+        if hub in self.hubs: self.hubs.remove(hub)
+
+    def _plan(self, hub, block):
+        layout = hub.decode_plan(block).layout
+        plan = self._plans.get(layout)
+        if plan is None:
+            plan = self._plans[layout] = DecodePlan(block, hub.plugin.order16, hub.plugin.order32,
+                                                    vectorize=np is not None)
+        return plan
+
+    def decode(self, reads):
+        """reads maps a hub to its (requests, responses) of the first round of a cycle.
+        Decodes all good responses in batches per block layout and replaces them by DecodedResponse,
+        blocks whose registers did not change since their last decode are skipped.
+        Groups are handled in request order, so entities still see the values of earlier blocks."""
+        groups = {}
+        for (hub, (requests, responses,)) in reads.items():
+            if hub.probing: continue  # the probe read of a sleeping hub, not decoded
+            for (i, ((typ, block,), realtime_data)) in enumerate(zip(requests, responses)):
+                if (realtime_data is None) or realtime_data.isError(): continue
+                if hub._raw_unchanged(typ, block, realtime_data.registers):
+                    responses[i] = DecodedResponse(realtime_data)
+                    continue
+                plan = self._plan(hub, block)
+                groups.setdefault(plan.layout, (plan, [],))[1].append((hub, typ, block, responses, i,))
+        for (plan, members,) in groups.values():
+            try:
+                rows = [plan.unpack(responses[i].registers) for (hub, typ, block, responses, i,) in members]
+            except Exception:  # short response somewhere in the group, leave the group to the hubs
+                _LOGGER.debug(f"cannot batch decode block 0x{plan.start:x}", exc_info=True)
+                continue
+            vecs = [None] * len(rows)
+            if plan.vectorized:
+                (ints, floats,) = plan.vector(np.array(rows, dtype=np.int64))
+                vecs = [a + b for (a, b,) in zip(ints.tolist(), floats.tolist())]
+            for ((hub, typ, block, responses, i,), values, vec) in zip(members, rows, vecs):
+                with hub._data_lock:  # fast lanes of the hub may run on other threads
+                    plan.store(values, vec, responses[i].registers, hub.data, hub.plugin.isAwake, hub.delta)
+                hub._remember_raw(typ, block, responses[i].registers)
+                responses[i] = DecodedResponse(responses[i])
+
+    @staticmethod
+    def _failed(hub, ex):
+        if isinstance(ex, ConnectionException):
+            _LOGGER.error(f"{hub.name}: Reading data failed! Inverter is offline.")
+        else:
+            _LOGGER.exception(f"{hub.name}: Something went wrong reading from modbus", exc_info=ex)
+
+    def refresh(self):
+        """One poll cycle of all (sync) hubs that are due."""
+        cycles = {}
+        reads = {}
+        for hub in self.hubs:
+            if not hub._begin_refresh(): continue
+            try:
+                cycle = hub._modbus_cycle()
+                requests = next(cycle)
+                reads[hub] = (requests, hub._read_requests(requests),)
+                cycles[hub] = cycle
+            except Exception as ex:
+                self._failed(hub, ex)
+                hub._end_refresh(False)
+        self.decode(reads)
+        for (hub, cycle,) in cycles.items():
+            try:
+                res = hub._finish_cycle(cycle, *reads[hub])
+            except Exception as ex:
+                self._failed(hub, ex)
+                res = False
+            hub._end_refresh(res)
+
+    async def async_refresh(self):
+        """One poll cycle of all (async) hubs that are due, the hubs are read concurrently."""
+        cycles = {}
+        for hub in self.hubs:
+            if not hub._begin_refresh(): continue
+            cycle = hub._modbus_cycle()
+            cycles[hub] = (cycle, next(cycle),)
+        hubs = list(cycles)
+        results = await asyncio.gather(*[hub._read_requests(cycles[hub][1]) for hub in hubs],
+                                       return_exceptions=True)
+        reads = {}
+        for (hub, responses,) in zip(hubs, results):
+            if isinstance(responses, BaseException):
+                self._failed(hub, responses)
+                hub._end_refresh(False)
+                cycles.pop(hub)
+            else:
+                reads[hub] = (cycles[hub][1], responses,)
+        self.decode(reads)
+
+        async def finish(hub, cycle):
+            try:
+                res = await hub._finish_cycle(cycle, *reads[hub])
+            except Exception as ex:
+                self._failed(hub, ex)
+                res = False
+            hub._end_refresh(res)
+
+        await asyncio.gather(*[finish(hub, cycle) for (hub, (cycle, requests,)) in cycles.items()])
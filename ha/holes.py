@@ -0,0 +1,77 @@
+"""Persistent registry of register ranges that an inverter model rejects (modbus illegal address exceptions)."""
+import json
+import logging
+import os
+import threading
+
+from .const import HOLES_FILE, HOLES_PREFIX_LEN
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def hole_prefix(seriesnumber):
+    """Holes are shared by all inverters with the same serial number prefix (same model and firmware family).
+    None while the serial number is unknown, unidentified inverters do not share holes."""
+    if (not seriesnumber) or (seriesnumber in ("unknown", "still unknown",)): return None
+    return seriesnumber[:HOLES_PREFIX_LEN]
+
+
+class HoleRegistry:
+    """Unreadable [start, end) register ranges per serial number prefix and register type, stored as json."""
+
+    def __init__(self, path=HOLES_FILE):
+        self.path = path
+        self._lock = threading.Lock()
+        self._holes = {}
+        if path and os.path.exists(path):
+            try:
+                with open(path) as f:
+                    self._holes = json.load(f)
+            except (OSError, ValueError):
+                _LOGGER.warning(f"cannot load learned register holes from {path}", exc_info=True)
+
+    def get(self, prefix, typ):
+        with self._lock:
+            return [tuple(hole) for hole in self._holes.get(prefix, {}).get(typ, [])]
+
+    def add(self, prefix, typ, start, end):
+        """Record a hole, returns False if it was already known or the prefix is None."""
+        if prefix is None: return False
+        with self._lock:
+            holes = self._holes.setdefault(prefix, {}).setdefault(typ, [])
+            if any((s <= start) and (end <= e) for (s, e,) in holes): return False
+            holes.append([start, end])
+            holes.sort()
+            self._save()
+        _LOGGER.warning(f"learned unreadable {typ} registers 0x{start:x}-0x{end - 1:x} for serial prefix {prefix}")
+        return True
+
+    def clear(self, prefix=None):
+        with self._lock:
+            if prefix is None: self._holes = {}
+            else: self._holes.pop(prefix, None)
+            self._save()
+
+    def _save(self):
+        if not self.path: return
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            tmp = f"{self.path}.tmp"
+            with open(tmp, "w") as f:
+                json.dump(self._holes, f, indent=1, sort_keys=True)
+            os.replace(tmp, self.path)
+        except OSError:
+            _LOGGER.warning(f"cannot store learned register holes in {self.path}", exc_info=True)
+
+
+_registries = {}
+_registries_lock = threading.Lock()
+
+
+def getHoleRegistry(path=HOLES_FILE):
+    """Hubs using the same file share one registry."""
+    with _registries_lock:
+        registry = _registries.get(path)
+        if registry is None:
+            registry = _registries[path] = HoleRegistry(path)
+        return registry
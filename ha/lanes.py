@@ -0,0 +1,78 @@
+"""Fast lanes: small sets of keys that are polled at their own, higher rate in between the full poll cycles."""
+from .const import POLL_TIER_FAST
+from .planner import plan_blocks
+
+
+def _keys(descr):
+    """Keys of a register description, a register with byte values has several."""
+    if type(descr) is dict: return {d.key for d in descr.values()}
+    return {descr.key}
+
+
+def _inputs(graph, key):
+    """All keys a computed key depends on, directly or through other computed keys."""
+    found = set()
+    todo = [key]
+    while todo:
+        for dep in graph.inputs.get(todo.pop(), ()):
+            if dep in found: continue
+            found.add(dep)
+            todo.append(dep)
+    return found
+
+
+class FastLane:
+    """A named set of keys with its own minimal block plan, see SolaXModbusHub.add_fast_lane."""
+
+    def __init__(self, name, keys, interval):
+        self.name = name
+        self.keys = frozenset(keys)
+        self.interval = float(interval)  # seconds between two lane cycles
+        self.requests = []  # (typ, block) read in each lane cycle
+        self.registers = frozenset()  # keys delivered by the blocks of the lane
+        self.unresolved = frozenset()  # computed keys none of whose known inputs has a register
+        self.traced = None  # (graph, graph.version) the lane was planned with
+        self.captured = None  # (time.monotonic(), time.time()) of the last successful lane cycle
+        self.scheduler = None  # PollScheduler or AsyncPollScheduler while the hub is polling
+        self.task = None  # asyncio task running the AsyncPollScheduler
+        self.cycles = 0
+        self.failures = 0
+        self._raw = {}  # (typ, block start) -> registers of the last decode
+
+    def plan(self, regs_by_type, graph, block_size, cost_model, holes):
+        """Build the blocks for the keys of the lane. regs_by_type maps 'holding' and 'input' to the sorted
+        register descriptions of the hub. Computed keys pull in their inputs as far as graph knows them,
+        the hub plans the lane again when the graph traces new inputs."""
+        computed = {key: _inputs(graph, key) for key in self.keys if key in graph.inputs}
+        wanted = set(self.keys).union(*computed.values())
+        self.traced = (graph, graph.version,)
+        self.requests = []
+        found = set()
+        for (typ, regs,) in regs_by_type.items():
+            selected = {reg: descr for (reg, descr,) in regs.items() if not _keys(descr).isdisjoint(wanted)}
+            for descr in selected.values(): found |= _keys(descr)
+            blocks = plan_blocks(selected, block_size, cost_model, holes.get(typ, ()), POLL_TIER_FAST).blocks
+            self.requests += [(typ, block,) for block in blocks]
+        self.registers = frozenset(found)
+        self.unresolved = frozenset(key for (key, inputs,) in computed.items() if inputs.isdisjoint(found))
+        self.reset()
+        return self.requests
+
+    def reset(self):
+        """Decode all blocks again in the next lane cycle."""
+        self._raw.clear()
+
+    def forget(self, typ, start, end):
+        """Decode the blocks overlapping registers [start, end) again in the next lane cycle,
+        their values in data were replaced from elsewhere."""
+        for (ltyp, block,) in self.requests:
+            if (ltyp == typ) and (block.start < end) and (start < block.end): self._raw.pop((typ, block.start,), None)
+
+    def raw_unchanged(self, typ, block, registers):
+        return self._raw.get((typ, block.start,)) == registers
+
+    def remember_raw(self, typ, block, registers):
+        self._raw[(typ, block.start,)] = registers
+
+    def capture_time(self, key):
+        return self.captured if key in self.registers else None
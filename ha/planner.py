@@ -0,0 +1,169 @@
+"""Block planner: groups the registers of an inverter into modbus read blocks with minimal expected cycle time."""
+import logging
+from dataclasses import dataclass, field
+
+from .const import REGISTER_S32, REGISTER_U32, REGISTER_ULSB16MSB16, REGISTER_STR, REGISTER_WORDS, POLL_TIER_FAST, \
+    POLL_TIER_NORMAL, DEFAULT_POLL_TIER_INTERVALS
+
+_LOGGER = logging.getLogger(__name__)
+
+MAX_READ_REGISTERS = 125  # modbus limit for a single read holding/input registers request
+
+
+@dataclass
+class block():
+    start: int = None  # start address of the block
+    end: int = None  # end address of the block
+    # order16: int = None # byte endian for 16bit registers
+    # order32: int = None # word endian for 32bit registers
+    descriptions: None = None
+    regs: None = None  # sorted list of registers used in this block
+    tier: int = POLL_TIER_NORMAL  # poll tier of the block, see DEFAULT_POLL_TIER_INTERVALS
+    plan: None = None  # compiled decode.DecodePlan, built by the hub on first use
+
+
+def register_width(descr):
+    """Number of modbus registers occupied by a description (or a dict of byte values in one register)."""
+    if type(descr) is dict: return 1  # couple of byte values
+    if descr.unit in (REGISTER_STR, REGISTER_WORDS,):
+        if descr.wordcount: return descr.wordcount
+        _LOGGER.warning(f"invalid or missing missing wordcount for {descr.key}")
+        return 1
+    if descr.unit in (REGISTER_S32, REGISTER_U32, REGISTER_ULSB16MSB16,): return 2
+    return 1
+
+
+def poll_tier(descr):
+    """Poll tier of a description, a register with byte values is read for its fastest entity."""
+    if type(descr) is dict: return min(d.poll_tier for d in descr.values())
+    return descr.poll_tier
+
+
+@dataclass
+class LinkCostModel:
+    """Expected time of a read: a fixed cost per transaction plus a transfer cost per register."""
+    transaction_time: float  # seconds per request/response, independent of the number of registers
+    register_time: float  # seconds per register in the response
+
+    @classmethod
+    def for_serial(cls, baudrate, bytesize=8, parity='N', stopbits=1, turnaround=0.05):
+        """Modbus RTU: 8 byte request, 5 bytes response overhead, 3.5 characters silence after each frame,
+        plus the time the device needs to answer."""
+        char_time = (1 + bytesize + (0 if parity == 'N' else 1) + stopbits) / int(baudrate)
+        return cls(transaction_time=(8 + 5 + 7) * char_time + turnaround, register_time=2 * char_time)
+
+    @classmethod
+    def for_tcp(cls, rtt=0.02, bandwidth=1e6):
+        """Modbus TCP: one round trip per transaction, transfer time is mostly negligible."""
+        return cls(transaction_time=rtt, register_time=16 / bandwidth)
+
+    def block_time(self, count):
+        return self.transaction_time + count * self.register_time
+
+
+DEFAULT_COST_MODEL = LinkCostModel.for_serial(9600)
+
+
+@dataclass
+class BlockPlan:
+    blocks: list = field(default_factory=list)
+    estimated_time: float = 0.0  # expected seconds to read all blocks
+    wasted_fraction: float = 0.0  # fraction of the registers read that are not used by any entity
+    cycle_time: float = 0.0  # expected seconds per cycle on average, taking poll tiers into account
+
+
+def _make_plan(blocks, descriptions, cost_model, tier_intervals=None):
+    tier_intervals = tier_intervals or DEFAULT_POLL_TIER_INTERVALS
+    read = sum(b.end - b.start for b in blocks)
+    used = sum(register_width(descriptions[reg]) for b in blocks for reg in b.regs)
+    return BlockPlan(blocks=blocks,
+                     estimated_time=sum(cost_model.block_time(b.end - b.start) for b in blocks),
+                     wasted_fraction=(1 - used / read) if read else 0.0,
+                     cycle_time=sum(cost_model.block_time(b.end - b.start) / tier_intervals[b.tier]
+                                    for b in blocks if tier_intervals[b.tier]))
+
+
+def _plan_segment(items, limit, cost_model):
+    """Optimal split of a run of (reg, end) items into blocks, items may not be regrouped across segments.
+    best[j] is the cheapest plan for the first j items; the last block of that plan starts at item cut[j]."""
+    n = len(items)
+    best = [0.0] + [None] * n
+    cut = [0] * (n + 1)
+    for j in range(1, n + 1):
+        end = items[j - 1][1]
+        for i in range(j, 0, -1):
+            start = items[i - 1][0]
+            end = max(end, items[i - 1][1])
+            if (end - start > limit) and (i < j): break  # a single oversized item still gets its own block
+            cost = best[i - 1] + cost_model.block_time(end - start)
+            if best[j] is None or cost < best[j]:
+                best[j] = cost
+                cut[j] = i - 1
+    groups = []
+    j = n
+    while j > 0:
+        groups.append(items[cut[j]:j])
+        j = cut[j]
+    return list(reversed(groups))
+
+
+def plan_blocks(descriptions, block_size, cost_model=None, holes=(), tier=POLL_TIER_NORMAL):
+    """Split the sorted register descriptions in read blocks.
+    Blocks are merged across gaps as long as reading the unused registers is cheaper than an extra transaction,
+    and never exceed block_size or the modbus limit. A description with newblock set always starts a new block.
+    holes are [start, end) ranges the device refuses to read: no block covers them, entities inside are skipped."""
+    cost_model = cost_model or DEFAULT_COST_MODEL
+    limit = min(block_size, MAX_READ_REGISTERS)
+    segments = []
+    prevend = None
+    for reg in descriptions:
+        descr = descriptions[reg]
+        end = reg + register_width(descr)
+        if any((start < end) and (reg < stop) for (start, stop,) in holes):
+            _LOGGER.info(f"skipping unreadable register 0x{reg:x}")
+            continue
+        if (not segments) or ((not type(descr) is dict) and descr.newblock) \
+                or any((start < reg) and (prevend < stop) for (start, stop,) in holes):  # hole in the gap
+            segments.append([])
+        segments[-1].append((reg, end,))
+        prevend = end
+    blocks = []
+    for segment in segments:
+        for group in _plan_segment(segment, limit, cost_model):
+            newblock = block(start=group[0][0], end=max(end for (reg, end,) in group), descriptions=descriptions,
+                             regs=[reg for (reg, end,) in group], tier=tier)
+            _LOGGER.debug(f"planned block 0x{newblock.start:x} 0x{newblock.end:x} {newblock.regs}")
+            blocks.append(newblock)
+    return _make_plan(blocks, descriptions, cost_model)
+
+
+def plan_tiers(descriptions, block_size, cost_model=None, holes=(), tier_intervals=None):
+    """Plan separate blocks for each poll tier, so slow registers are not read together with the fast ones.
+    Tiers other than FAST that are read at the same interval share their blocks. FAST blocks are always planned
+    on their own: they are read with bus priority, which must not extend to the other registers.
+    Blocks are returned in register order."""
+    cost_model = cost_model or DEFAULT_COST_MODEL
+    tier_intervals = tier_intervals or DEFAULT_POLL_TIER_INTERVALS
+    groups = {}  # (fast, interval) -> (fastest tier, descriptions)
+    for reg in descriptions:
+        tier = poll_tier(descriptions[reg])
+        group = (tier == POLL_TIER_FAST, tier_intervals[tier],)
+        (grouptier, regs,) = groups.setdefault(group, (tier, {},))
+        regs[reg] = descriptions[reg]
+        if tier < grouptier: groups[group] = (tier, regs,)
+    blocks = []
+    for (tier, regs,) in groups.values():
+        blocks += plan_blocks(regs, block_size, cost_model, holes, tier).blocks
+    blocks.sort(key=lambda b: b.start)
+    return _make_plan(blocks, descriptions, cost_model, tier_intervals)
+
+
+def sub_block(parent, regs):
+    """A block reading only the given registers of a parent block."""
+    return block(start=regs[0], end=max(reg + register_width(parent.descriptions[reg]) for reg in regs),
+                 descriptions=parent.descriptions, regs=list(regs), tier=parent.tier)
+
+
+def gap_block(parent, start, end):
+    """A block reading the registers [start, end) of a parent block that no entity uses, nothing is decoded."""
+    return block(start=start, end=end, descriptions=parent.descriptions, regs=[], tier=parent.tier)
@@ -1033,6 +1033,7 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
         allowedtypes=GEN2 | GEN3 | GEN4,
         entity_category=EntityCategory.DIAGNOSTIC,
         icon="mdi:information",
+        poll_tier=POLL_TIER_ONCE,
     ),
     SolaXModbusSensorEntityDescription(
         name="Firmware Version Inverter Master",
@@ -1042,6 +1043,7 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
         allowedtypes=GEN2 | GEN3 | GEN4,
         entity_category=EntityCategory.DIAGNOSTIC,
         icon="mdi:information",
+        poll_tier=POLL_TIER_ONCE,
     ),
     SolaXModbusSensorEntityDescription(
         name="Firmware Version Modbus TCP Major",
@@ -1051,6 +1053,7 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
         allowedtypes=GEN2 | GEN3 | GEN4,
         entity_category=EntityCategory.DIAGNOSTIC,
         icon="mdi:information",
+        poll_tier=POLL_TIER_ONCE,
     ),
     SolaXModbusSensorEntityDescription(
         name="Firmware Version Modbus TCP Minor",
@@ -1060,6 +1063,7 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
         register=0x82,
         entity_category=EntityCategory.DIAGNOSTIC,
         icon="mdi:information",
+        poll_tier=POLL_TIER_ONCE,
     ),
     SolaXModbusSensorEntityDescription(
         name="Firmware Version Manager",
@@ -1069,6 +1073,7 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
         register=0x83,
         entity_category=EntityCategory.DIAGNOSTIC,
         icon="mdi:information",
+        poll_tier=POLL_TIER_ONCE,
     ),
     SolaXModbusSensorEntityDescription(
         name="Bootloader Version",
@@ -1078,6 +1083,7 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
         register=0x84,
         entity_category=EntityCategory.DIAGNOSTIC,
         icon="mdi:information",
+        poll_tier=POLL_TIER_ONCE,
     ),
     SolaXModbusSensorEntityDescription(
         name="Battery Minimum Capacity",
@@ -1087,6 +1093,7 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
         entity_registry_enabled_default=False,
         allowedtypes=GEN2 | GEN3,
         icon="mdi:battery-sync",
+        poll_tier=POLL_TIER_SLOW,
     ),
     SolaXModbusSensorEntityDescription(
         name="Battery Type",
@@ -1098,6 +1105,7 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
         allowedtypes=GEN2 | GEN3 | GEN4,
         entity_category=EntityCategory.DIAGNOSTIC,
         icon="mdi:battery-unknown",
+        poll_tier=POLL_TIER_SLOW,
     ),
     SolaXModbusSensorEntityDescription(
         name="Battery Charge Float Voltage",
@@ -1108,6 +1116,7 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
         scale=0.01,
         entity_registry_enabled_default=False,
         allowedtypes=GEN2,
+        poll_tier=POLL_TIER_SLOW,
     ),
     SolaXModbusSensorEntityDescription(
         name="Battery Charge Float Voltage",
@@ -1118,6 +1127,7 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
         scale=0.1,
         entity_registry_enabled_default=False,
         allowedtypes=GEN3 | GEN4,
+        poll_tier=POLL_TIER_SLOW,
     ),
     SolaXModbusSensorEntityDescription(
         name="Battery Discharge Cut Off Voltage",
@@ -1128,6 +1138,7 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
         scale=0.01,
         entity_registry_enabled_default=False,
         allowedtypes=GEN2,
+        poll_tier=POLL_TIER_SLOW,
     ),
     SolaXModbusSensorEntityDescription(
         name="Battery Discharge Cut Off Voltage",
@@ -1138,6 +1149,7 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
         scale=0.1,
         entity_registry_enabled_default=False,
         allowedtypes=GEN3 | GEN4,
+        poll_tier=POLL_TIER_SLOW,
     ),
     SolaXModbusSensorEntityDescription(
         name="Battery Charge Max Current",
@@ -1147,6 +1159,7 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
         scale=0.01,
         allowedtypes=GEN2,
         icon="mdi:current-dc",
+        poll_tier=POLL_TIER_SLOW,
     ),
     SolaXModbusSensorEntityDescription(
         name="Battery Charge Max Current",
@@ -1156,6 +1169,7 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
         scale=0.1,
         allowedtypes=GEN3 | GEN4,
         icon="mdi:current-dc",
+        poll_tier=POLL_TIER_SLOW,
     ),
     SolaXModbusSensorEntityDescription(
         name="Battery Discharge Max Current",
@@ -1166,6 +1180,7 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
         scale=0.01,
         allowedtypes=GEN2,
         icon="mdi:current-dc",
+        poll_tier=POLL_TIER_SLOW,
     ),
     SolaXModbusSensorEntityDescription(
         name="Battery Discharge Max Current",
@@ -1176,6 +1191,7 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
         scale=0.1,
         allowedtypes=GEN3 | GEN4,
         icon="mdi:current-dc",
+        poll_tier=POLL_TIER_SLOW,
     ),
     SolaXModbusSensorEntityDescription(
         name="Charger Start Time 1",
@@ -1187,6 +1203,7 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
         entity_registry_enabled_default=False,
         allowedtypes=GEN2 | GEN3,
         icon="mdi:battery-clock",
+        poll_tier=POLL_TIER_SLOW,
     ),
     SolaXModbusSensorEntityDescription(
         name="Selfuse Discharge Min SOC",
@@ -1194,6 +1211,7 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
         register=0x93,
         unit=REGISTER_U8H,
         allowedtypes=GEN4,
+        poll_tier=POLL_TIER_SLOW,
     ),
     SolaXModbusSensorEntityDescription(
         name="Selfuse Night Charge Enable",
@@ -1202,6 +1220,7 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
         unit=REGISTER_U8L,
         scale={0: "Disabled", 1: "Enabled", },
         allowedtypes=GEN4,
+        poll_tier=POLL_TIER_SLOW,
     ),
     SolaXModbusSensorEntityDescription(
         name="Charger End Time 1",
@@ -1213,6 +1232,7 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
         entity_registry_enabled_default=False,
         allowedtypes=GEN2 | GEN3,
         icon="mdi:battery-clock",
+        poll_tier=POLL_TIER_SLOW,
     ),
     SolaXModbusSensorEntityDescription(
         name="Selfuse Night Charge Upper SOC",
@@ -1220,6 +1240,7 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
         register=0x94,
         native_unit_of_measurement=PERCENTAGE,
         allowedtypes=GEN4,
+        poll_tier=POLL_TIER_SLOW,
     ),
     SolaXModbusSensorEntityDescription(
         name="Feedin Night Charge Upper SOC",
@@ -1228,6 +1249,7 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
         unit=REGISTER_U8H,
         native_unit_of_measurement=PERCENTAGE,
         allowedtypes=GEN4,
+        poll_tier=POLL_TIER_SLOW,
     ),
     SolaXModbusSensorEntityDescription(
         name="Feedin Discharge Min SOC",
@@ -1236,6 +1258,7 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
         unit=REGISTER_U8L,
         native_unit_of_measurement=PERCENTAGE,
         allowedtypes=GEN4,
+        poll_tier=POLL_TIER_SLOW,
     ),
     SolaXModbusSensorEntityDescription(
         name="Discharger Start Time 1",
@@ -1247,6 +1270,7 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
         entity_registry_enabled_default=False,
         allowedtypes=GEN2,
         icon="mdi:battery-clock",
+        poll_tier=POLL_TIER_SLOW,
     ),
     SolaXModbusSensorEntityDescription(
         name="Backup Night Charge Upper SOC",
@@ -1256,6 +1280,7 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
         native_unit_of_measurement=PERCENTAGE,
         allowedtypes=GEN4,
         icon="mdi:battery-sync",
+        poll_tier=POLL_TIER_SLOW,
     ),
     SolaXModbusSensorEntityDescription(
         name="Backup Discharge Min SOC",
@@ -1265,6 +1290,7 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
         native_unit_of_measurement=PERCENTAGE,
         allowedtypes=GEN4,
         icon="mdi:battery-sync",
+        poll_tier=POLL_TIER_SLOW,
     ),
     SolaXModbusSensorEntityDescription(
         name="Charger Start Time 1",
@@ -1274,6 +1300,7 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
         entity_registry_enabled_default=False,
         allowedtypes=GEN4,
         icon="mdi:battery-clock",
+        poll_tier=POLL_TIER_SLOW,
     ),
     SolaXModbusSensorEntityDescription(
         name="Discharger End Time 1",
@@ -1285,6 +1312,7 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
         entity_registry_enabled_default=False,
         allowedtypes=GEN2,
         icon="mdi:battery-clock",
+        poll_tier=POLL_TIER_SLOW,
     ),
     SolaXModbusSensorEntityDescription(
         name="Charger End Time 1",
@@ -1294,6 +1322,7 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
         entity_registry_enabled_default=False,
         allowedtypes=GEN4,
         icon="mdi:battery-clock",
+        poll_tier=POLL_TIER_SLOW,
     ),
     SolaXModbusSensorEntityDescription(
         name="Discharger Start Time 1",
@@ -1303,6 +1332,7 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
         entity_registry_enabled_default=False,
         allowedtypes=GEN4,
         icon="mdi:battery-clock",
+        poll_tier=POLL_TIER_SLOW,
     ),
     SolaXModbusSensorEntityDescription(
         name="Charger Start Time 2",
@@ -1314,6 +1344,7 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
         entity_registry_enabled_default=False,
         allowedtypes=GEN2 | GEN3,
         icon="mdi:battery-clock",
+        poll_tier=POLL_TIER_SLOW,
     ),
     SolaXModbusSensorEntityDescription(
         name="Discharger End Time 1",
@@ -1323,6 +1354,7 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
         entity_registry_enabled_default=False,
         allowedtypes=GEN4,
         icon="mdi:battery-clock",
+        poll_tier=POLL_TIER_SLOW,
     ),
     SolaXModbusSensorEntityDescription(
         name="Charge Period2 Enable",
@@ -1331,6 +1363,7 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
         scale={0: "Disabled", 1: "Enabled", },
         entity_registry_enabled_default=False,
         allowedtypes=GEN4,
+        poll_tier=POLL_TIER_SLOW,
     ),
     SolaXModbusSensorEntityDescription(
         name="Charger End Time 2",
@@ -1342,6 +1375,7 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
         entity_registry_enabled_default=False,
         allowedtypes=GEN2 | GEN3,
         icon="mdi:battery-clock",
+        poll_tier=POLL_TIER_SLOW,
     ),
     SolaXModbusSensorEntityDescription(
         name="Charger Start Time 2",
@@ -1351,6 +1385,7 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
         entity_registry_enabled_default=False,
         allowedtypes=GEN4,
         icon="mdi:battery-clock",
+        poll_tier=POLL_TIER_SLOW,
     ),
     SolaXModbusSensorEntityDescription(
         name="Charger End Time 2",
@@ -1360,6 +1395,7 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
         entity_registry_enabled_default=False,
         allowedtypes=GEN4,
         icon="mdi:battery-clock",
+        poll_tier=POLL_TIER_SLOW,
     ),
     SolaXModbusSensorEntityDescription(
         name="Discharger Start Time 2",
@@ -1371,6 +1407,7 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
         entity_registry_enabled_default=False,
         allowedtypes=GEN2,
         icon="mdi:battery-clock",
+        poll_tier=POLL_TIER_SLOW,
     ),
     SolaXModbusSensorEntityDescription(
         name="Discharger Start Time 2",
@@ -1380,6 +1417,7 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
         entity_registry_enabled_default=False,
         allowedtypes=GEN4,
         icon="mdi:battery-clock",
+        poll_tier=POLL_TIER_SLOW,
     ),
     SolaXModbusSensorEntityDescription(
         name="Discharger End Time 2",
@@ -1389,6 +1427,7 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
         entity_registry_enabled_default=False,
         allowedtypes=GEN4,
         icon="mdi:battery-clock",
+        poll_tier=POLL_TIER_SLOW,
     ),
     SolaXModbusSensorEntityDescription(
         name="Pgrid Bias",
@@ -1399,6 +1438,7 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
                2: "Inverter", },
         entity_registry_enabled_default=False,
         allowedtypes=GEN4,
+        poll_tier=POLL_TIER_SLOW,
     ),
     SolaXModbusSensorEntityDescription(
         name="Allow Grid Charge",
@@ -1411,6 +1451,7 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
         entity_registry_enabled_default=False,
         allowedtypes=GEN2 | GEN3,
         icon="mdi:transmission-tower",
+        poll_tier=POLL_TIER_SLOW,
     ),
     SolaXModbusSensorEntityDescription(
         name="Battery Install Capacity",
@@ -1423,7 +1464,8 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
         allowedtypes=GEN3,
         entity_category=EntityCategory.DIAGNOSTIC,
         icon="mdi:battery-sync",
-        blacklist=('XRE',)
+        blacklist=('XRE',),
+        poll_tier=POLL_TIER_SLOW,
     ),
     SolaXModbusSensorEntityDescription(
         name="Backup Charge End",
@@ -1435,6 +1477,7 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
         entity_registry_enabled_default=False,
         allowedtypes=GEN3,
         icon="mdi:battery-clock",
+        poll_tier=POLL_TIER_SLOW,
     ),
     SolaXModbusSensorEntityDescription(
         name="Battery Minimum Capacity - Grid-tied",
@@ -1444,6 +1487,7 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
         entity_registry_enabled_default=False,
         allowedtypes=HYBRID | GEN3,
         icon="mdi:battery-sync",
+        poll_tier=POLL_TIER_SLOW,
     ),
     SolaXModbusSensorEntityDescription(
         name="FVRT Function",
@@ -1453,6 +1497,7 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
                1: "Enabled", },
         entity_registry_enabled_default=False,
         allowedtypes=GEN4,
+        poll_tier=POLL_TIER_SLOW,
     ),
     SolaXModbusSensorEntityDescription(
         name="FVRT Vac Upper",
@@ -1464,6 +1509,7 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
         rounding=1,
         entity_registry_enabled_default=False,
         allowedtypes=GEN4,
+        poll_tier=POLL_TIER_SLOW,
     ),
     SolaXModbusSensorEntityDescription(
         name="FVRT Vac Lower",
@@ -1475,6 +1521,7 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
         rounding=1,
         entity_registry_enabled_default=False,
         allowedtypes=GEN4,
+        poll_tier=POLL_TIER_SLOW,
     ),
     SolaXModbusSensorEntityDescription(
         name="PV Connection Mode",
@@ -1482,6 +1529,7 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
         register=0x11B,
         entity_registry_enabled_default=False,
         allowedtypes=GEN4,
+        poll_tier=POLL_TIER_SLOW,
     ),
     SolaXModbusSensorEntityDescription(
         name="Micro Grid",
@@ -1491,6 +1539,7 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
                1: "Enabled", },
         entity_registry_enabled_default=False,
         allowedtypes=GEN4,
+        poll_tier=POLL_TIER_SLOW,
     ),
     SolaXModbusSensorEntityDescription(
         name="Manual Mode Control",
@@ -1500,6 +1549,7 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
                1: "On", },
         entity_registry_enabled_default=False,
         allowedtypes=GEN4,
+        poll_tier=POLL_TIER_SLOW,
     ),
     SolaXModbusSensorEntityDescription(
         name="Minimum Per On Signal",
@@ -1508,6 +1558,7 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
         register=0x127,
         entity_registry_enabled_default=False,
         allowedtypes=GEN4,
+        poll_tier=POLL_TIER_SLOW,
     ),
     SolaXModbusSensorEntityDescription(
         name="Maximum Per Day On",
@@ -1515,6 +1566,7 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
         register=0x128,
         entity_registry_enabled_default=False,
         allowedtypes=GEN4,
+        poll_tier=POLL_TIER_SLOW,
     ),
     SolaXModbusSensorEntityDescription(
         name="Work Start Time 1",
@@ -1524,6 +1576,7 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
         entity_registry_enabled_default=False,
         allowedtypes=GEN4 | DCB,
         icon="mdi:home-clock",
+        poll_tier=POLL_TIER_SLOW,
     ),
     SolaXModbusSensorEntityDescription(
         name="Work Stop Time 1",
@@ -1533,6 +1586,7 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
         entity_registry_enabled_default=False,
         allowedtypes=GEN4 | DCB,
         icon="mdi:home-clock",
+        poll_tier=POLL_TIER_SLOW,
     ),
     SolaXModbusSensorEntityDescription(
         name="Work Start Time 2",
@@ -1542,6 +1596,7 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
         entity_registry_enabled_default=False,
         allowedtypes=GEN4 | DCB,
         icon="mdi:home-clock",
+        poll_tier=POLL_TIER_SLOW,
     ),
     SolaXModbusSensorEntityDescription(
         name="Work Stop Time 2",
@@ -1551,6 +1606,7 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
         entity_registry_enabled_default=False,
         allowedtypes=GEN4 | DCB,
         icon="mdi:home-clock",
+        poll_tier=POLL_TIER_SLOW,
     ),
     SolaXModbusSensorEntityDescription(
         name="Parallel Setting",
@@ -1561,6 +1617,7 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
                2: "Slave"},
         entity_registry_enabled_default=False,
         allowedtypes=GEN4,
+        poll_tier=POLL_TIER_SLOW,
     ),
 
     # Gen3 BMS
@@ -1574,6 +1631,7 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
         allowedtypes=HYBRID | AC | GEN3,
         entity_category=EntityCategory.DIAGNOSTIC,
         icon="mdi:information",
+        poll_tier=POLL_TIER_SLOW,
     ),
     SolaXModbusSensorEntityDescription(
         name="BMS Master Version",
@@ -1584,6 +1642,7 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
         allowedtypes=HYBRID | AC | GEN3,
         entity_category=EntityCategory.DIAGNOSTIC,
         icon="mdi:information",
+        poll_tier=POLL_TIER_ONCE,
     ),
     SolaXModbusSensorEntityDescription(
         name="BMS Battery 1 Version",
@@ -1594,6 +1653,7 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
         allowedtypes=HYBRID | AC | GEN3,
         entity_category=EntityCategory.DIAGNOSTIC,
         icon="mdi:information",
+        poll_tier=POLL_TIER_ONCE,
     ),
     SolaXModbusSensorEntityDescription(
         name="BMS Battery 2 Version",
@@ -1604,6 +1664,7 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
         allowedtypes=HYBRID | AC | GEN3,
         entity_category=EntityCategory.DIAGNOSTIC,
         icon="mdi:information",
+        poll_tier=POLL_TIER_ONCE,
     ),
     SolaXModbusSensorEntityDescription(
         name="BMS Battery 3 Version",
@@ -1614,6 +1675,7 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
         allowedtypes=HYBRID | AC | GEN3,
         entity_category=EntityCategory.DIAGNOSTIC,
         icon="mdi:information",
+        poll_tier=POLL_TIER_ONCE,
     ),
     SolaXModbusSensorEntityDescription(
         name="BMS Battery 4 Version",
@@ -1624,6 +1686,7 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
         allowedtypes=HYBRID | AC | GEN3 | X3,
         entity_category=EntityCategory.DIAGNOSTIC,
         icon="mdi:information",
+        poll_tier=POLL_TIER_ONCE,
     ),
     SolaXModbusSensorEntityDescription(
         name="BMS Master Serial Number",
@@ -1635,6 +1698,7 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
         allowedtypes=HYBRID | AC | GEN3,
         entity_category=EntityCategory.DIAGNOSTIC,
         icon="mdi:information",
+        poll_tier=POLL_TIER_ONCE,
     ),
     SolaXModbusSensorEntityDescription(
         name="BMS Battery 1 Serial Number",
@@ -1646,6 +1710,7 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
         allowedtypes=HYBRID | AC | GEN3,
         entity_category=EntityCategory.DIAGNOSTIC,
         icon="mdi:information",
+        poll_tier=POLL_TIER_ONCE,
     ),
     SolaXModbusSensorEntityDescription(
         name="BMS Battery 2 Serial Number",
@@ -1657,6 +1722,7 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
         allowedtypes=HYBRID | AC | GEN3,
         entity_category=EntityCategory.DIAGNOSTIC,
         icon="mdi:information",
+        poll_tier=POLL_TIER_ONCE,
     ),
     SolaXModbusSensorEntityDescription(
         name="BMS Battery 3 Serial Number",
@@ -1668,6 +1734,7 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
         allowedtypes=HYBRID | AC | GEN3,
         entity_category=EntityCategory.DIAGNOSTIC,
         icon="mdi:information",
+        poll_tier=POLL_TIER_ONCE,
     ),
     SolaXModbusSensorEntityDescription(
         name="BMS Battery 4 Serial Number",
@@ -1679,6 +1746,7 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
         allowedtypes=HYBRID | AC | GEN3 | X3,
         entity_category=EntityCategory.DIAGNOSTIC,
         icon="mdi:information",
+        poll_tier=POLL_TIER_ONCE,
     ),
     # Gen4 BMS
     SolaXModbusSensorEntityDescription(
@@ -1691,6 +1759,7 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
         allowedtypes=HYBRID | AC | GEN4,
         entity_category=EntityCategory.DIAGNOSTIC,
         icon="mdi:information",
+        poll_tier=POLL_TIER_SLOW,
     ),
     SolaXModbusSensorEntityDescription(
         name="BMS Master Version",
@@ -1701,6 +1770,7 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
         allowedtypes=HYBRID | AC | GEN4,
         entity_category=EntityCategory.DIAGNOSTIC,
         icon="mdi:information",
+        poll_tier=POLL_TIER_ONCE,
     ),
     SolaXModbusSensorEntityDescription(
         name="BMS Battery 1 Version",
@@ -1711,6 +1781,7 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
         allowedtypes=HYBRID | AC | GEN4,
         entity_category=EntityCategory.DIAGNOSTIC,
         icon="mdi:information",
+        poll_tier=POLL_TIER_ONCE,
     ),
     SolaXModbusSensorEntityDescription(
         name="BMS Battery 2 Version",
@@ -1721,6 +1792,7 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
         allowedtypes=HYBRID | AC | GEN4,
         entity_category=EntityCategory.DIAGNOSTIC,
         icon="mdi:information",
+        poll_tier=POLL_TIER_ONCE,
     ),
     SolaXModbusSensorEntityDescription(
         name="BMS Battery 3 Version",
@@ -1731,6 +1803,7 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
         allowedtypes=HYBRID | AC | GEN4,
         entity_category=EntityCategory.DIAGNOSTIC,
         icon="mdi:information",
+        poll_tier=POLL_TIER_ONCE,
     ),
     SolaXModbusSensorEntityDescription(
         name="BMS Battery 4 Version",
@@ -1741,6 +1814,7 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
         allowedtypes=HYBRID | AC | GEN4 | X3,
         entity_category=EntityCategory.DIAGNOSTIC,
         icon="mdi:information",
+        poll_tier=POLL_TIER_ONCE,
     ),
     SolaXModbusSensorEntityDescription(
         name="BMS Master Serial Number",
@@ -1752,6 +1826,7 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
         allowedtypes=HYBRID | AC | GEN4,
         entity_category=EntityCategory.DIAGNOSTIC,
         icon="mdi:information",
+        poll_tier=POLL_TIER_ONCE,
     ),
     SolaXModbusSensorEntityDescription(
         name="BMS Battery 1 Serial Number",
@@ -1763,6 +1838,7 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
         allowedtypes=HYBRID | AC | GEN4,
         entity_category=EntityCategory.DIAGNOSTIC,
         icon="mdi:information",
+        poll_tier=POLL_TIER_ONCE,
     ),
     SolaXModbusSensorEntityDescription(
         name="BMS Battery 2 Serial Number",
@@ -1774,6 +1850,7 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
         allowedtypes=HYBRID | AC | GEN4,
         entity_category=EntityCategory.DIAGNOSTIC,
         icon="mdi:information",
+        poll_tier=POLL_TIER_ONCE,
     ),
     SolaXModbusSensorEntityDescription(
         name="BMS Battery 3 Serial Number",
@@ -1785,6 +1862,7 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
         allowedtypes=HYBRID | AC | GEN4,
         entity_category=EntityCategory.DIAGNOSTIC,
         icon="mdi:information",
+        poll_tier=POLL_TIER_ONCE,
     ),
     SolaXModbusSensorEntityDescription(
         name="BMS Battery 4 Serial Number",
@@ -1796,6 +1874,7 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
         allowedtypes=HYBRID | AC | GEN4 | X3,
         entity_category=EntityCategory.DIAGNOSTIC,
         icon="mdi:information",
+        poll_tier=POLL_TIER_ONCE,
     ),
 
     ###
@@ -1873,6 +1952,7 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
         register_type=REG_INPUT,
         unit=REGISTER_S16,
         allowedtypes=GEN2 | GEN3 | GEN4,
+        poll_tier=POLL_TIER_FAST,
     ),
     SolaXModbusSensorEntityDescription(
         name="Battery State of Health",
@@ -2046,6 +2126,7 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
         entity_registry_enabled_default=False,
         allowedtypes=GEN4,
         icon="mdi:dip-switch",
+        poll_tier=POLL_TIER_SLOW,
     ),
     SolaXModbusSensorEntityDescription(
         name="Charger Use Mode",
@@ -2058,6 +2139,7 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
         entity_registry_enabled_default=False,
         allowedtypes=GEN2 | GEN3,
         icon="mdi:dip-switch",
+        poll_tier=POLL_TIER_SLOW,
     ),
     SolaXModbusSensorEntityDescription(
         name="Consume Off Power",
@@ -2068,6 +2150,7 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
         register=0x125,
         entity_registry_enabled_default=False,
         allowedtypes=GEN4,
+        poll_tier=POLL_TIER_SLOW,
     ),
     SolaXModbusSensorEntityDescription(
         name="Grid Import Total",
@@ -2104,6 +2187,7 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
                1: "Lock", },
         entity_registry_enabled_default=False,
         allowedtypes=GEN4,
+        poll_tier=POLL_TIER_SLOW,
     ),
 
     SolaXModbusSensorEntityDescription(
@@ -2116,6 +2200,7 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
         entity_registry_enabled_default=False,
         allowedtypes=GEN2,
         icon="mdi:battery-clock",
+        poll_tier=POLL_TIER_SLOW,
     ),
 
     SolaXModbusSensorEntityDescription(
@@ -2126,6 +2211,7 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
                1: "Generator Control", },
         entity_registry_enabled_default=False,
         allowedtypes=GEN4,
+        poll_tier=POLL_TIER_SLOW,
     ),
     SolaXModbusSensorEntityDescription(
         name="Today's Yield",
@@ -2147,6 +2233,7 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
         entity_registry_enabled_default=False,
         allowedtypes=GEN2 | GEN3 | GEN4,
         icon="mdi:home-export-outline",
+        poll_tier=POLL_TIER_SLOW,
     ),
     SolaXModbusSensorEntityDescription(
         name="Export Control User Limit",
@@ -2157,6 +2244,7 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
         allowedtypes=GEN2 | GEN3 | GEN4,
         read_scale_exceptions=EXPORT_LIMIT_SCALE_EXCEPTIONS,
         icon="mdi:home-export-outline",
+        poll_tier=POLL_TIER_SLOW,
     ),
     SolaXModbusSensorEntityDescription(
         name="External Generation",
@@ -2166,6 +2254,7 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
                1: "Enabled", },
         entity_registry_enabled_default=False,
         allowedtypes=GEN4,
+        poll_tier=POLL_TIER_SLOW,
     ),
     SolaXModbusSensorEntityDescription(
         name="External Generation Max Charge",
@@ -2174,6 +2263,7 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
         register=0x132,
         entity_registry_enabled_default=False,
         allowedtypes=GEN4,
+        poll_tier=POLL_TIER_SLOW,
     ),
     SolaXModbusSensorEntityDescription(
         name="Grid Export Limit",
@@ -2210,6 +2300,7 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
         register_type=REG_INPUT,
         unit=REGISTER_S32,
         allowedtypes=GEN2 | GEN3 | GEN4 | GEN | HYBRID | AC,
+        poll_tier=POLL_TIER_FAST,
     ),
     SolaXModbusSensorEntityDescription(
         name="Feedin On Power",
@@ -2220,6 +2311,7 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
         register=0x123,
         entity_registry_enabled_default=False,
         allowedtypes=GEN4,
+        poll_tier=POLL_TIER_SLOW,
     ),
 
     SolaXModbusSensorEntityDescription(
@@ -2273,6 +2365,7 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
         device_class=DEVICE_CLASS_POWER,
         state_class=None, #STATE_CLASS_MEASUREMENT,
         value_function=value_function_grid_import,
+        depends_on=['measured_power'],
         allowedtypes=GEN2 | GEN3 | GEN4,
         icon="mdi:home-import-outline",
     ),
@@ -2283,6 +2376,7 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
         device_class=DEVICE_CLASS_POWER,
         state_class=None, #STATE_CLASS_MEASUREMENT,
         value_function=value_function_grid_export,
+        depends_on=['measured_power'],
         allowedtypes=GEN2 | GEN3 | GEN4,
         icon="mdi:home-export-outline",
     ),
@@ -2290,6 +2384,7 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
         name="House Load",
         key="house_load",
         value_function=value_function_house_load,
+        depends_on=['pv_power_1', 'pv_power_2', 'pv_power_3', 'battery_power_charge', 'measured_power'],
         native_unit_of_measurement=POWER_WATT,
         device_class=DEVICE_CLASS_POWER,
         state_class=None, #STATE_CLASS_MEASUREMENT,
@@ -2329,7 +2424,8 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
         entity_registry_enabled_default=False,
         entity_category=EntityCategory.DIAGNOSTIC,
         icon="mdi:information",
-        blacklist=('XRE',)
+        blacklist=('XRE',),
+        poll_tier=POLL_TIER_ONCE,
     ),
     SolaXModbusSensorEntityDescription(
         name="Inverter Power",
@@ -2365,6 +2461,7 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
         entity_registry_enabled_default=False,
         allowedtypes=GEN2 | GEN3 | GEN4,
         icon="mdi:translate-variant",
+        poll_tier=POLL_TIER_SLOW,
     ),
     SolaXModbusSensorEntityDescription(
         name="Lease Mode",
@@ -2374,6 +2471,7 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
                1: "Enabled", },
         entity_registry_enabled_default=False,
         allowedtypes=GEN4,
+        poll_tier=POLL_TIER_SLOW,
     ),
     SolaXModbusSensorEntityDescription(
         name="Lock State",
@@ -2398,6 +2496,7 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
         allowedtypes=GEN3,
         entity_category=EntityCategory.DIAGNOSTIC,
         icon="mdi:dip-switch",
+        poll_tier=POLL_TIER_SLOW,
     ),
     SolaXModbusSensorEntityDescription(
         name="Normal Runtime",
@@ -2449,6 +2548,7 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
         allowedtypes=HYBRID | PV,
         icon="mdi:solar-power-variant",
         sleepmode=SLEEPMODE_ZERO,
+        poll_tier=POLL_TIER_FAST,
     ),
     SolaXModbusSensorEntityDescription(
         name="PV Power 2",
@@ -2461,6 +2561,7 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
         allowedtypes=HYBRID | PV,
         icon="mdi:solar-power-variant",
         sleepmode=SLEEPMODE_ZERO,
+        poll_tier=POLL_TIER_FAST,
     ),
     SolaXModbusSensorEntityDescription(
         name="PV Voltage 1",
@@ -2490,6 +2591,7 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
         name="PV Power Total",
         key="pv_power_total",
         value_function=value_function_pv_power_total,
+        depends_on=['pv_power_1', 'pv_power_2', 'pv_power_3'],
         native_unit_of_measurement=POWER_WATT,
         device_class=DEVICE_CLASS_POWER,
         state_class=None, #STATE_CLASS_MEASUREMENT,
@@ -2501,6 +2603,7 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
         name="PV Total Power",
         key="pv_total_power",
         value_function=value_function_pv_power_total,
+        depends_on=['pv_power_1', 'pv_power_2', 'pv_power_3'],
         native_unit_of_measurement=POWER_WATT,
         device_class=DEVICE_CLASS_POWER,
         state_class=None, #STATE_CLASS_MEASUREMENT,
@@ -2519,6 +2622,7 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
         allowedtypes=GEN3,
         entity_category=EntityCategory.DIAGNOSTIC,
         icon="mdi:information",
+        poll_tier=POLL_TIER_ONCE,
     ),
     SolaXModbusSensorEntityDescription(
         name="Registration Code Pocket",
@@ -2530,6 +2634,7 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
         allowedtypes=GEN3 | GEN4,
         entity_category=EntityCategory.DIAGNOSTIC,
         icon="mdi:information",
+        poll_tier=POLL_TIER_ONCE,
     ),
     SolaXModbusSensorEntityDescription(
         name="RTC",
@@ -2589,6 +2694,7 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
                1: "Enabled", },
         entity_registry_enabled_default=False,
         allowedtypes=GEN4,
+        poll_tier=POLL_TIER_SLOW,
     ),
     SolaXModbusSensorEntityDescription(
         name="Selfuse Backup SOC",
@@ -2598,6 +2704,7 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
         entity_registry_enabled_default=False,
         allowedtypes=GEN4,
         icon="mdi:battery-sync",
+        poll_tier=POLL_TIER_SLOW,
     ),
     SolaXModbusSensorEntityDescription(
         name="Selfuse Mode Backup",
@@ -2608,6 +2715,7 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
         entity_registry_enabled_default=False,
         allowedtypes=GEN4,
         icon="mdi:dip-switch",
+        poll_tier=POLL_TIER_SLOW,
     ),
 
     SolaXModbusSensorEntityDescription(
@@ -2618,6 +2726,7 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
                1: "Enabled", },
         entity_registry_enabled_default=False,
         allowedtypes=GEN4,
+        poll_tier=POLL_TIER_SLOW,
     ),
     SolaXModbusSensorEntityDescription(
         name="Switch Off SOC",
@@ -2626,6 +2735,7 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
         register=0x126,
         entity_registry_enabled_default=False,
         allowedtypes=GEN4,
+        poll_tier=POLL_TIER_SLOW,
     ),
     SolaXModbusSensorEntityDescription(
         name="Switch On SOC",
@@ -2634,6 +2744,7 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
         register=0x124,
         entity_registry_enabled_default=False,
         allowedtypes=GEN4,
+        poll_tier=POLL_TIER_SLOW,
     ),
     SolaXModbusSensorEntityDescription(
         name="Temperature Board Charge",
@@ -2763,6 +2874,7 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
         register=0xBA,
         entity_registry_enabled_default=False,
         allowedtypes=GEN2 | GEN3 | GEN4,
+        poll_tier=POLL_TIER_SLOW,
     ),
     SolaXModbusSensorEntityDescription(
         name="Total Yield",
@@ -2802,6 +2914,7 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
                2: "Smart Save"},
         entity_registry_enabled_default=False,
         allowedtypes=GEN4 | DCB,
+        poll_tier=POLL_TIER_SLOW,
     ),
     SolaXModbusSensorEntityDescription(
         name="CT Type",
@@ -2811,6 +2924,7 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
                1: "200A", },
         entity_registry_enabled_default=False,
         allowedtypes=GEN4,
+        poll_tier=POLL_TIER_SLOW,
     ),
     SolaXModbusSensorEntityDescription(
         name="DRM Function Enable",
@@ -2820,6 +2934,7 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
                1: "Enabled", },
         entity_registry_enabled_default=False,
         allowedtypes=GEN4,
+        poll_tier=POLL_TIER_SLOW,
     ),
 
     SolaXModbusSensorEntityDescription(
@@ -2832,6 +2947,7 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
                2: "High", },
         entity_registry_enabled_default=False,
         allowedtypes=GEN4,
+        poll_tier=POLL_TIER_SLOW,
     ),
     SolaXModbusSensorEntityDescription(
         name="Machine Type X1/X3",
@@ -2842,6 +2958,7 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
         entity_registry_enabled_default=False,
         allowedtypes=GEN4,
         icon="mdi:information",
+        poll_tier=POLL_TIER_ONCE,
     ),
     SolaXModbusSensorEntityDescription(
         name="Manual Mode",
@@ -2851,6 +2968,7 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
                1: "Force Charge",
                2: "Force Discharge", },
         allowedtypes=GEN4,
+        poll_tier=POLL_TIER_SLOW,
     ),
 
     SolaXModbusSensorEntityDescription(
@@ -2863,6 +2981,7 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
         entity_registry_enabled_default=False,
         allowedtypes=GEN3,
         icon="mdi:battery-clock",
+        poll_tier=POLL_TIER_SLOW,
     ),
     SolaXModbusSensorEntityDescription(
         name="Backup Gridcharge",
@@ -2873,6 +2992,7 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
         entity_registry_enabled_default=False,
         allowedtypes=GEN3,
         icon="mdi:transmission-tower",
+        poll_tier=POLL_TIER_SLOW,
     ),
     SolaXModbusSensorEntityDescription(
         name="Backup Gridcharge",
@@ -2916,6 +3036,7 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
         entity_registry_enabled_default=False,
         allowedtypes=GEN3,
         icon="mdi:cloud",
+        poll_tier=POLL_TIER_SLOW,
     ),
     SolaXModbusSensorEntityDescription(
         name="CT Meter Setting",
@@ -2927,6 +3048,7 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
         allowedtypes=GEN3 | AC,
         entity_category=EntityCategory.DIAGNOSTIC,
         icon="mdi:meter-electric",
+        poll_tier=POLL_TIER_SLOW,
     ),
     SolaXModbusSensorEntityDescription(
         name="CT Meter Setting",
@@ -2938,6 +3060,7 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
         allowedtypes=GEN3 | GEN4 | HYBRID,
         entity_category=EntityCategory.DIAGNOSTIC,
         icon="mdi:meter-electric",
+        poll_tier=POLL_TIER_SLOW,
     ),
     SolaXModbusSensorEntityDescription(
         name="Discharge Cut Off Point Different",
@@ -2948,6 +3071,7 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
         entity_registry_enabled_default=False,
         allowedtypes=GEN3 | GEN4,
         icon="mdi:dip-switch",
+        poll_tier=POLL_TIER_SLOW,
     ),
     SolaXModbusSensorEntityDescription(
         name="Discharge Cut Off Voltage Grid Mode",
@@ -2959,6 +3083,7 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
         rounding=1,
         entity_registry_enabled_default=False,
         allowedtypes=GEN3 | GEN4,
+        poll_tier=POLL_TIER_SLOW,
     ),
     SolaXModbusSensorEntityDescription(
         name="Today's Export Energy",
@@ -2982,6 +3107,7 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
         entity_registry_enabled_default=False,
         allowedtypes=GEN3 | AC,
         icon="mdi:battery-sync",
+        poll_tier=POLL_TIER_SLOW,
     ),
     SolaXModbusSensorEntityDescription(
         name="Forcetime Period 2 Maximum Capacity",
@@ -2991,6 +3117,7 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
         entity_registry_enabled_default=False,
         allowedtypes=GEN3 | AC,
         icon="mdi:battery-sync",
+        poll_tier=POLL_TIER_SLOW,
     ),
     SolaXModbusSensorEntityDescription(
         name="Forcetime Period 1 Maximum Capacity",
@@ -3000,6 +3127,7 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
         entity_registry_enabled_default=False,
         allowedtypes=GEN3 | HYBRID,
         icon="mdi:battery-sync",
+        poll_tier=POLL_TIER_SLOW,
     ),
     SolaXModbusSensorEntityDescription(
         name="Forcetime Period 2 Maximum Capacity",
@@ -3009,6 +3137,7 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
         entity_registry_enabled_default=False,
         allowedtypes=GEN3 | HYBRID,
         icon="mdi:battery-sync",
+        poll_tier=POLL_TIER_SLOW,
     ),
     SolaXModbusSensorEntityDescription(
         name="Global MPPT Function",
@@ -3019,6 +3148,7 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
         entity_registry_enabled_default=False,
         allowedtypes=X1 | X3 | GEN3,
         icon="mdi:sun-compass",
+        poll_tier=POLL_TIER_SLOW,
     ),
     SolaXModbusSensorEntityDescription(
         name="Today's Import Energy",
@@ -3044,6 +3174,7 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
         allowedtypes=X1 | X3 | GEN3 | GEN4,
         entity_category=EntityCategory.DIAGNOSTIC,
         icon="mdi:information",
+        poll_tier=POLL_TIER_SLOW,
     ),
     SolaXModbusSensorEntityDescription(
         name="Meter 1 id",
@@ -3053,6 +3184,7 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
         allowedtypes=X1 | X3 | GEN3 | GEN4,
         entity_category=EntityCategory.DIAGNOSTIC,
         icon="mdi:meter-electric",
+        poll_tier=POLL_TIER_SLOW,
     ),
     SolaXModbusSensorEntityDescription(
         name="Meter 2 id",
@@ -3062,6 +3194,7 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
         allowedtypes=X1 | X3 | GEN3 | GEN4,
         entity_category=EntityCategory.DIAGNOSTIC,
         icon="mdi:meter-electric",
+        poll_tier=POLL_TIER_SLOW,
     ),
     SolaXModbusSensorEntityDescription(
         name="Meter Function",
@@ -3073,6 +3206,7 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
         allowedtypes=GEN3 | GEN4,
         entity_category=EntityCategory.DIAGNOSTIC,
         icon="mdi:meter-electric",
+        poll_tier=POLL_TIER_SLOW,
     ),
     SolaXModbusSensorEntityDescription(
         name="Export Duration",
@@ -3085,6 +3219,7 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
         entity_registry_enabled_default=False,
         allowedtypes=GEN3,
         icon="mdi:home-export-outline",
+        poll_tier=POLL_TIER_SLOW,
     ),
     SolaXModbusSensorEntityDescription(
         name="wAS4777 Power Manager",
@@ -3095,6 +3230,7 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
         entity_registry_enabled_default=False,
         allowedtypes=GEN3,
         icon="mdi:information",
+        poll_tier=POLL_TIER_SLOW,
     ),
     SolaXModbusSensorEntityDescription(
         name="Modbus Power Control",
@@ -3213,6 +3349,7 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
         scale={0: "Disabled",
                1: "Enabled", },
         allowedtypes=X3 | GEN3,
+        poll_tier=POLL_TIER_SLOW,
     ),
     SolaXModbusSensorEntityDescription(
         name="Measured Power L1",
@@ -3335,6 +3472,7 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
         scale={0: "Disabled",
                1: "Enabled", },
         allowedtypes=GEN2,
+        poll_tier=POLL_TIER_SLOW,
     ),
     SolaXModbusSensorEntityDescription(
         name="Grid Service X3",
@@ -3343,6 +3481,7 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
         scale={0: "Disabled",
                1: "Enabled", },
         allowedtypes=X3 | GEN3,
+        poll_tier=POLL_TIER_SLOW,
     ),
     SolaXModbusSensorEntityDescription(
         name="Inverter Voltage L1",
@@ -3383,6 +3522,7 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
         register=0x106,
         scale={0: "Disabled", 1: "Enabled"},
         allowedtypes=X3 | GEN3 | GEN4,
+        poll_tier=POLL_TIER_SLOW,
     ),
     SolaXModbusSensorEntityDescription(
         name="EPS Auto Restart",
@@ -3391,6 +3531,7 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
         scale={0: "Disabled",
                1: "Enabled", },
         allowedtypes=GEN3 | HYBRID | EPS,
+        poll_tier=POLL_TIER_SLOW,
     ),
     SolaXModbusSensorEntityDescription(
         name="EPS Current",
@@ -3420,6 +3561,7 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
         register=0x10E,
         native_unit_of_measurement=PERCENTAGE,
         allowedtypes=GEN3 | HYBRID | EPS,
+        poll_tier=POLL_TIER_SLOW,
     ),
     SolaXModbusSensorEntityDescription(
         name="EPS Min Esc Voltage",
@@ -3427,6 +3569,7 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
         register=0x10D,
         native_unit_of_measurement=ELECTRIC_POTENTIAL_VOLT,
         allowedtypes=GEN3 | HYBRID | EPS,
+        poll_tier=POLL_TIER_SLOW,
     ),
     SolaXModbusSensorEntityDescription(
         name="EPS Mute",
@@ -3435,6 +3578,7 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
         scale={0: "Off",
                1: "On", },
         allowedtypes=GEN2 | GEN3 | GEN4 | EPS,
+        poll_tier=POLL_TIER_SLOW,
     ),
     SolaXModbusSensorEntityDescription(
         name="EPS Power",
@@ -3453,6 +3597,7 @@ SENSOR_TYPES_MAIN: list[SolaXModbusSensorEntityDescription] = [
         scale={0: "50Hz",
                1: "60Hz", },
         allowedtypes=GEN2 | GEN3 | EPS,
+        poll_tier=POLL_TIER_SLOW,
     ),
     SolaXModbusSensorEntityDescription(
         name="EPS Voltage",
@@ -3983,6 +4128,7 @@ SENSOR_TYPES_MIC: list[SolaXMicModbusSensorEntityDescription] = [
         newblock=True,
         register_type=REG_INPUT,
         allowedtypes=MIC,
+        poll_tier=POLL_TIER_FAST,
     ),
     SolaXMicModbusSensorEntityDescription(
         name="Run Mode",
@@ -4037,6 +4183,7 @@ SENSOR_TYPES_MIC: list[SolaXMicModbusSensorEntityDescription] = [
         register_type=REG_INPUT,
         allowedtypes=MIC,
         icon="mdi:solar-power-variant",
+        poll_tier=POLL_TIER_FAST,
     ),
     SolaXMicModbusSensorEntityDescription(
         name="PV Power 2",
@@ -4048,11 +4195,13 @@ SENSOR_TYPES_MIC: list[SolaXMicModbusSensorEntityDescription] = [
         register_type=REG_INPUT,
         allowedtypes=MIC,
         icon="mdi:solar-power-variant",
+        poll_tier=POLL_TIER_FAST,
     ),
     SolaXMicModbusSensorEntityDescription(
         name="PV Power Total",
         key="pv_power_total",
         value_function=value_function_pv_power_total,
+        depends_on=['pv_power_1', 'pv_power_2', 'pv_power_3'],
         native_unit_of_measurement=POWER_WATT,
         device_class=DEVICE_CLASS_POWER,
         state_class=None, #STATE_CLASS_MEASUREMENT,
@@ -4063,6 +4212,7 @@ SENSOR_TYPES_MIC: list[SolaXMicModbusSensorEntityDescription] = [
         name="PV Total Power",
         key="pv_total_power",
         value_function=value_function_pv_power_total,
+        depends_on=['pv_power_1', 'pv_power_2', 'pv_power_3'],
         native_unit_of_measurement=POWER_WATT,
         device_class=DEVICE_CLASS_POWER,
         state_class=None, #STATE_CLASS_MEASUREMENT,
@@ -4161,6 +4311,7 @@ SENSOR_TYPES_MIC: list[SolaXMicModbusSensorEntityDescription] = [
         register_type=REG_INPUT,
         allowedtypes=MIC | GEN3,
         icon="mdi:solar-power-variant",
+        poll_tier=POLL_TIER_FAST,
     ),
 ]
 
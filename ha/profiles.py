@@ -0,0 +1,151 @@
+"""Settings profiles: target values of number and select entities, written with as few requests as possible."""
+import asyncio
+import logging
+from dataclasses import dataclass, field
+
+from .const import BaseModbusSelectEntityDescription, REGISTER_U16, REGISTER_S16, WRITE_SINGLE_MODBUS
+from .writes import WriteQueue
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass
+class ProfileResult:
+    """Outcome of applying a profile to one hub."""
+    profile: str
+    written: list = field(default_factory=list)  # keys written and acknowledged
+    unchanged: list = field(default_factory=list)  # keys already at their target value, not written
+    unknown: list = field(default_factory=list)  # keys without a writable register or with an invalid target value
+    queued: list = field(default_factory=list)  # keys queued because the inverter sleeps
+    failed: dict = field(default_factory=dict)  # key -> exception or error response of the write
+    mismatched: dict = field(default_factory=dict)  # key -> value read back, when it differs from the target
+    requests: int = 0  # write requests sent
+
+    @property
+    def ok(self):
+        return not (self.unknown or self.failed or self.mismatched)
+
+
+class SettingsProfile:
+    """A named mapping of number and select entity keys to target values, e.g.
+    SettingsProfile("winter", {"charger_use_mode": "Force Time Use", "battery_charge_max_current": 20}).
+    Select targets are option names (or raw register values), number targets are entity values.
+    Apply it with hub.apply_profile(profile) or, for several hubs, apply_profile_all(hubs, profile)."""
+
+    def __init__(self, name, settings):
+        self.name = name
+        self.settings = dict(settings)
+
+    def plan(self, hub):
+        """The writes needed to bring the hub to this profile, targets that equal the last known state are dropped."""
+        return ProfilePlan(hub, self)
+
+    def __repr__(self):
+        return f"SettingsProfile({self.name!r}, {self.settings})"
+
+
+def _raw_value(descr, value, readscale=1):
+    """Register value written by an entity for value, None if the value cannot be written.
+    Number values are entity values, scaled by the read scale of the entity on the inverter."""
+    if isinstance(descr, BaseModbusSelectEntityDescription):
+        options = descr.option_dict or {}
+        if value in options: return value
+        for (raw, option,) in options.items():
+            if option == value: return raw
+        return None
+    if (type(descr.scale) not in (int, float,)) or (type(value) not in (int, float,)): return None
+    return int(round(value / (descr.scale * readscale)))
+
+
+def _entity_value(hub, descr, registers):
+    """Entity value of the registers of an entity, as the entity shows it after reading them."""
+    value = hub._written_value(descr, registers)
+    if isinstance(descr, BaseModbusSelectEntityDescription) or (type(value) not in (int, float,)): return value
+    return round(value * hub.read_scale(descr), 6)
+
+
+class ProfilePlan:
+    """The writes of a profile for one hub, as WriteGroups of encoded contiguous registers."""
+
+    def __init__(self, hub, profile):
+        self.hub = hub
+        self.result = ProfileResult(profile.name)
+        self.groups = []
+        self._owner = {}  # register -> key of the entity value that occupies it
+        self._descriptions = {}  # key -> description
+        self._widths = {}  # key -> number of registers
+        self._single = set()  # registers that are written with write_register when they are alone in a group
+        descriptions = {}
+        for descrs in hub.writeRegs.values():
+            for descr in descrs: descriptions.setdefault(descr.key, descr)
+        queue = WriteQueue()
+        for (key, value,) in profile.settings.items():
+            descr = descriptions.get(key)
+            raw = None if descr is None else _raw_value(descr, value, hub.read_scale(descr))
+            if raw is None:
+                self.result.unknown.append(key)
+                continue
+            unit = getattr(descr, 'unit', None) or REGISTER_U16
+            if unit in (REGISTER_U16, REGISTER_S16,):
+                registers = hub.encoders.encode16(raw)
+            else:
+                registers = hub.encoders.encode(unit, raw)
+            if hub.data.get(getattr(descr, 'state', None) or key) == hub._written_value(descr, registers):
+                self.result.unchanged.append(key)
+                continue
+            for (i, register,) in enumerate(registers):
+                queue.put(descr.register + i, register)
+                self._owner[descr.register + i] = key
+            if descr.write_method == WRITE_SINGLE_MODBUS: self._single.add(descr.register)
+            self._descriptions[key] = descr
+            self._widths[key] = len(registers)
+        self.groups = queue.take(hub.plugin.write_block_size)
+
+    def keys(self, group):
+        """Keys of the entity values written by a group, in register order."""
+        return list(dict.fromkeys(self._owner[address] for address in range(group.start, group.end)))
+
+    def multiple(self, group):
+        """True to send the group with write_registers (FC16)."""
+        return (len(group.values) > 1) or (group.start not in self._single)
+
+    def queued(self, group):
+        for (i, value,) in enumerate(group.values): self.hub.queue_write(group.start + i, value)
+        self.result.queued += self.keys(group)
+
+    def sent(self, group, response=None, ex=None):
+        self.result.requests += 1
+        if (ex is None) and ((response is None) or response.isError()): ex = response
+        for key in self.keys(group):
+            if ex is None:
+                self.result.written.append(key)
+            else:
+                self.result.failed[key] = ex
+        if ex is not None: _LOGGER.error(f"{self.hub.name}: profile {self.result.profile} write at 0x{group.start:x} failed: {ex}")
+
+    def verified(self, group, registers):
+        """Compare the registers read back after the writes with the written ones."""
+        for key in self.keys(group):
+            if key in self.result.failed: continue
+            descr = self._descriptions[key]
+            (offset, width,) = (descr.register - group.start, self._widths[key],)
+            if offset < 0: continue  # value split over two groups, checked with the first one
+            if list(registers[offset:offset + width]) != group.values[offset:offset + width]:
+                self.result.mismatched[key] = _entity_value(self.hub, descr, registers[offset:])
+                if key in self.result.written: self.result.written.remove(key)
+
+    def verify_failed(self, group, ex):
+        for key in self.keys(group):
+            if key not in self.result.failed: self.result.mismatched[key] = ex
+
+
+def apply_profile_all(hubs, profile, verify=True):
+    """Apply a profile to several hubs, one hub after the other. Returns {hub name: ProfileResult}.
+    Profile requests queue behind the poll requests of a shared bus, see SolaXModbusHub.apply_profile."""
+    return {hub.name: hub.apply_profile(profile, verify) for hub in hubs}
+
+
+async def async_apply_profile_all(hubs, profile, verify=True):
+    """asyncio variant of apply_profile_all, hubs on different buses are written concurrently."""
+    results = await asyncio.gather(*(hub.apply_profile(profile, verify) for hub in hubs))
+    return {hub.name: result for (hub, result,) in zip(hubs, results)}
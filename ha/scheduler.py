@@ -0,0 +1,133 @@
+"""Drift free poll scheduling: cycles start on a fixed grid of time.monotonic() deadlines."""
+import asyncio
+import logging
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+
+_LOGGER = logging.getLogger(__name__)
+
+SKIP = "skip"  # after an overrun, continue at the next slot that is still in the future
+COMPRESS = "compress"  # after an overrun, start the slot in progress immediately, then continue on the grid
+
+
+@dataclass
+class SchedulerStats:
+    cycles: int = 0
+    overruns: int = 0  # cycles that ended after the start of the next slot
+    skipped: int = 0  # slots that were not executed because of overruns
+    compressed: int = 0  # late cycles started immediately after an overrun
+    max_jitter: float = 0.0  # seconds between deadline and actual start, worst case
+    max_duration: float = 0.0
+    jitter: deque = field(default_factory=lambda: deque(maxlen=100))  # recent start jitters
+    durations: deque = field(default_factory=lambda: deque(maxlen=100))  # recent cycle durations
+
+    @property
+    def mean_jitter(self):
+        return sum(self.jitter) / len(self.jitter) if self.jitter else 0.0
+
+    @property
+    def mean_duration(self):
+        return sum(self.durations) / len(self.durations) if self.durations else 0.0
+
+
+class _SchedulerBase:
+    def __init__(self, cycle, interval, policy=SKIP, name="poll"):
+        self.cycle = cycle
+        self.interval = float(interval)
+        self.policy = policy
+        self.name = name
+        self.stats = SchedulerStats()
+        self.slot_time = None  # monotonic deadline of the running or last cycle, the grid time of its samples
+        self._t0 = None
+        self._slot = 0
+
+    def _deadline(self):
+        if self._t0 is None: self._t0 = time.monotonic()
+        return self._t0 + self._slot * self.interval
+
+    def _started(self, deadline, start):
+        self.slot_time = deadline
+        jitter = start - deadline
+        self.stats.jitter.append(jitter)
+        self.stats.max_jitter = max(self.stats.max_jitter, jitter)
+
+    def _finished(self, start, end):
+        """Account for a finished cycle and select the next slot."""
+        stats = self.stats
+        stats.cycles += 1
+        duration = end - start
+        stats.durations.append(duration)
+        stats.max_duration = max(stats.max_duration, duration)
+        nxt = self._slot + 1
+        if end > self._t0 + nxt * self.interval:
+            stats.overruns += 1
+            future = int((end - self._t0) // self.interval) + 1  # first slot that starts after now
+            if self.policy == COMPRESS:
+                stats.compressed += 1
+                stats.skipped += future - 1 - nxt
+                nxt = future - 1  # already due, runs immediately
+            else:
+                stats.skipped += future - nxt
+                nxt = future
+            _LOGGER.debug(f"{self.name}: cycle took {duration:.3f}s, overrun of the {self.interval}s slot")
+        self._slot = nxt
+
+
+class PollScheduler(_SchedulerBase):
+    """Calls cycle() at every interval on a background thread. Deadlines are t0 + n * interval,
+    so a late start or a slow cycle never shifts the grid; overrunning cycles skip or compress slots."""
+
+    def __init__(self, cycle, interval, policy=SKIP, name="poll"):
+        super().__init__(cycle, interval, policy, name)
+        self._stop = threading.Event()
+        self._thread = None
+
+    def run(self):
+        """Run cycles until stop() is called."""
+        while not self._stop.is_set():
+            deadline = self._deadline()
+            delay = deadline - time.monotonic()
+            if (delay > 0) and self._stop.wait(delay): break
+            start = time.monotonic()
+            self._started(deadline, start)
+            try:
+                self.cycle()
+            except Exception:
+                _LOGGER.exception(f"{self.name}: poll cycle failed")
+            self._finished(start, time.monotonic())
+
+    def start(self):
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self.run, name=f"sii-{self.name}", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        if self._thread is not None:
+            if self._thread is not threading.current_thread(): self._thread.join(timeout)
+            self._thread = None
+
+
+class AsyncPollScheduler(_SchedulerBase):
+    """asyncio variant of PollScheduler, cycle may be a coroutine function."""
+
+    async def run(self):
+        """Run cycles until cancelled."""
+        while True:
+            deadline = self._deadline()
+            delay = deadline - time.monotonic()
+            if delay > 0: await asyncio.sleep(delay)
+            start = time.monotonic()
+            self._started(deadline, start)
+            try:
+                result = self.cycle()
+                if asyncio.iscoroutine(result): await result
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                _LOGGER.exception(f"{self.name}: poll cycle failed")
+            self._finished(start, time.monotonic())
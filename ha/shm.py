@@ -0,0 +1,171 @@
+"""Publish the numeric hub values in a shared memory segment, for local consumers in other processes.
+
+Segment layout (native byte order):
+    header   magic b'SIIM', layout version u32, sequence u64, cycle u64, timestamp f64, slot count u32,
+             schema length u32
+    schema   json list of the keys, in slot order
+    values   f64 per slot (8 byte aligned)
+    kinds    u8 per slot, see store.ABSENT/FLOAT/INT/OTHER
+The sequence is a seqlock: it is odd while the publisher writes, readers retry when it was odd or changed
+during their read. Only numbers are published, other values read as None.
+"""
+import json
+import logging
+import struct
+import time
+from multiprocessing import resource_tracker, shared_memory
+
+from .store import ValueStore, FLOAT, INT
+
+_LOGGER = logging.getLogger(__name__)
+
+MAGIC = b'SIIM'
+LAYOUT_VERSION = 1
+_HEADER = struct.Struct("=4sIQQdII")
+_SEQ_OFFSET = 8
+_SEQ = struct.Struct("=Q")
+_CYCLE_TIME = struct.Struct("=Qd")
+_CYCLE_OFFSET = 16
+
+_published = set()  # segments created by publishers in this process
+SPINS = 16  # retries of a reader before it starts sleeping between them
+BACKOFF = 0.0001  # seconds a reader sleeps between later retries, lets a preempted publisher finish
+
+
+def _create(name, size):
+    """Create a segment, a stale one left by a publisher that did not close (e.g. after a crash) is replaced."""
+    try:
+        return shared_memory.SharedMemory(name=name, create=True, size=size)
+    except FileExistsError:
+        _LOGGER.warning(f"replacing stale shared memory segment {name}")
+        stale = shared_memory.SharedMemory(name=name)
+        stale.close()
+        stale.unlink()
+        return shared_memory.SharedMemory(name=name, create=True, size=size)
+
+
+def _layout(nslots, schema_len):
+    values_offset = (_HEADER.size + schema_len + 7) & ~7
+    kinds_offset = values_offset + 8 * nslots
+    return (values_offset, kinds_offset, kinds_offset + nslots,)
+
+
+class SharedMemoryPublisher:
+    """Writes the snapshots of a hub to a shared memory segment, add it to hub.publishers.
+    The schema is fixed when the publisher is created: keys added to the hub later are not published."""
+
+    def __init__(self, hub, name=None):
+        store = hub.data
+        if not isinstance(store, ValueStore): raise TypeError("shared memory publishing needs a hub with a ValueStore")
+        self.keys = store.slot_keys()
+        schema = json.dumps(self.keys).encode()
+        self.nslots = len(self.keys)
+        (self._values_offset, self._kinds_offset, size,) = _layout(self.nslots, len(schema))
+        self.shm = _create(name or f"sii_{hub.name}", size)
+        _published.add(self.shm.name)
+        buf = self.shm.buf
+        _HEADER.pack_into(buf, 0, MAGIC, LAYOUT_VERSION, 0, 0, 0.0, self.nslots, len(schema))
+        buf[_HEADER.size:_HEADER.size + len(schema)] = schema
+        self._values = buf[self._values_offset:self._kinds_offset].cast('d')
+        self._kinds = buf[self._kinds_offset:self._kinds_offset + self.nslots]
+        self._seq = 0
+        self._last = None
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    def publish(self, snapshot):
+        """Copy the values of a snapshot into the segment, called by the hub after every cycle."""
+        store = snapshot.store
+        buf = self.shm.buf
+        self._seq += 1
+        _SEQ.pack_into(buf, _SEQ_OFFSET, self._seq)  # odd: write in progress
+        if store is not self._last:  # unchanged cycles share their data with the previous snapshot
+            n = min(self.nslots, len(store.kinds))
+            self._values[:n] = memoryview(store.values_array)[:n]
+            self._kinds[:n] = store.kinds[:n]
+            self._last = store
+        _CYCLE_TIME.pack_into(buf, _CYCLE_OFFSET, snapshot.cycle, snapshot.timestamp or 0.0)
+        self._seq += 1
+        _SEQ.pack_into(buf, _SEQ_OFFSET, self._seq)
+
+    def close(self, unlink=True):
+        self._values.release()
+        self._kinds.release()
+        self.shm.close()
+        if unlink:
+            self.shm.unlink()
+            _published.discard(self.shm.name)
+
+
+class SharedMemoryReader:
+    """Attaches to a segment of a SharedMemoryPublisher by name, values are read in place without copying.
+    A read that keeps overlapping with a publish (e.g. the publisher was preempted while writing) is retried
+    up to retries times, yielding the cpu, and then returns the last consistent result of the same read."""
+
+    def __init__(self, name, retries=1000):
+        try:
+            self.shm = shared_memory.SharedMemory(name=name, track=False)  # the publisher owns the segment
+        except TypeError:  # python < 3.13 has no track argument
+            self.shm = shared_memory.SharedMemory(name=name)
+            # otherwise the resource tracker of the reader process unlinks the segment when the reader exits
+            if self.shm.name not in _published: resource_tracker.unregister(self.shm._name, "shared_memory")
+        self.retries = retries
+        self._last = {}  # read -> last consistent result
+        buf = self.shm.buf
+        (magic, version, seq, cycle, timestamp, nslots, schema_len,) = _HEADER.unpack_from(buf, 0)
+        if (magic != MAGIC) or (version != LAYOUT_VERSION):
+            self.shm.close()
+            raise ValueError(f"{name} is not a hub values segment")
+        self.keys = json.loads(bytes(buf[_HEADER.size:_HEADER.size + schema_len]))
+        self.slots = {key: slot for (slot, key,) in enumerate(self.keys)}
+        (values_offset, kinds_offset, end,) = _layout(nslots, schema_len)
+        self.values = buf[values_offset:kinds_offset].cast('d')  # zero copy, e.g. numpy.frombuffer(reader.values)
+        self.kinds = buf[kinds_offset:end]
+
+    def _seq(self):
+        return _SEQ.unpack_from(self.shm.buf, _SEQ_OFFSET)[0]
+
+    def _consistent(self, read, which):
+        for attempt in range(self.retries):
+            if attempt: time.sleep(0 if attempt < SPINS else BACKOFF)
+            before = self._seq()
+            if before & 1: continue
+            result = read()
+            if self._seq() == before:
+                self._last[which] = result
+                return result
+        if which not in self._last: raise TimeoutError("shared memory values keep changing")
+        _LOGGER.debug(f"{self.shm.name}: publisher busy, returning the last consistent values")
+        return self._last[which]
+
+    @staticmethod
+    def _value(kind, value):
+        if kind == FLOAT: return value
+        if kind == INT: return int(value)
+        return None
+
+    def read_slot(self, slot):
+        return self._consistent(lambda: self._value(self.kinds[slot], self.values[slot]), slot)
+
+    def read(self, key):
+        """Latest value of a key, None when absent or not numeric."""
+        return self.read_slot(self.slots[key])
+
+    def read_all(self):
+        """Consistent (cycle, timestamp, {key: value}) of all numeric values."""
+
+        def read():
+            (cycle, timestamp,) = _CYCLE_TIME.unpack_from(self.shm.buf, _CYCLE_OFFSET)
+            kinds = bytes(self.kinds)
+            values = self.values.tolist()
+            return (cycle, timestamp, {key: self._value(kinds[slot], values[slot])
+                                       for (slot, key,) in enumerate(self.keys) if kinds[slot] in (FLOAT, INT,)},)
+
+        return self._consistent(read, None)
+
+    def close(self):
+        self.values.release()
+        self.kinds.release()
+        self.shm.close()
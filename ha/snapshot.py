@@ -0,0 +1,34 @@
+"""Immutable snapshots of the hub data, published once per poll cycle."""
+from collections.abc import Mapping
+
+
+class DataSnapshot(Mapping):
+    """Read only view on the hub data as it was at the end of a poll cycle.
+
+    The poll cycle works on hub.data (the back buffer) and replaces hub.snapshot by a new snapshot when the
+    cycle is complete. Replacing an attribute is atomic, so readers on other threads simply take a reference
+    to hub.snapshot and never see a half updated cycle, without any locking."""
+
+    __slots__ = ('cycle', 'timestamp', '_data',)
+
+    def __init__(self, cycle, timestamp, data):
+        self.cycle = cycle  # hub.cyclecount of the cycle that produced the data
+        self.timestamp = timestamp  # time.time() at publication
+        self._data = data  # never modified after publication
+
+    @property
+    def store(self):
+        """The underlying mapping, a FrozenValueStore for hubs using a ValueStore."""
+        return self._data
+
+    def __getitem__(self, key):
+        return self._data[key]
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __len__(self):
+        return len(self._data)
+
+    def __repr__(self):
+        return f"DataSnapshot(cycle={self.cycle}, timestamp={self.timestamp}, {len(self._data)} values)"
@@ -0,0 +1,150 @@
+"""Compact storage of the hub data: numeric values live in a preallocated array of doubles."""
+from array import array
+from collections.abc import Mapping, MutableMapping
+
+ABSENT = 0
+FLOAT = 1
+INT = 2  # stored as a double, exact up to 2**53
+OTHER = 3  # strings, lists, None, ... kept in a side table
+
+_MAX_EXACT_INT = 2 ** 53
+
+
+class _SlotReader:
+    """Read access shared by the store and its frozen copies."""
+
+    def _slot(self, key):
+        slot = self._slots[key]
+        if slot >= len(self._kinds): raise KeyError(key)  # key added after a freeze
+        return slot
+
+    def __getitem__(self, key):
+        slot = self._slot(key)
+        kind = self._kinds[slot]
+        if kind == FLOAT: return self._values[slot]
+        if kind == INT: return int(self._values[slot])
+        if kind == OTHER: return self._other[slot]
+        raise KeyError(key)
+
+    def __contains__(self, key):
+        slot = self._slots.get(key)
+        return (slot is not None) and (slot < len(self._kinds)) and (self._kinds[slot] != ABSENT)
+
+    def __iter__(self):
+        kinds = self._kinds
+        for (key, slot,) in list(self._slots.items()):
+            if (slot < len(kinds)) and kinds[slot]: yield key
+
+    def __len__(self):
+        return self._count
+
+    def slot(self, key):
+        """Slot of a key, the index of its value in values_array."""
+        return self._slots[key]
+
+    @property
+    def values_array(self):
+        return self._values
+
+    @property
+    def kinds(self):
+        return self._kinds
+
+    def slot_keys(self):
+        """All keys with a slot, in slot order."""
+        return sorted(self._slots, key=self._slots.get)
+
+
+class ValueStore(_SlotReader, MutableMapping):
+    """Dict compatible store for the hub data.
+
+    Every key gets an integer slot, preferably reserved at setup in entity order. Floats and ints are kept in
+    values (an array('d'), which numpy can view without copying), the type of each slot is kept in kinds, and
+    all other values go to a small side table. Replacing a number does not keep a python object alive."""
+
+    def __init__(self, keys=()):
+        self._slots = {}
+        self._values = array('d')
+        self._kinds = bytearray()
+        self._other = {}
+        self._count = 0
+        self.reserve(keys)
+
+    def reserve(self, keys):
+        """Assign slots to keys that do not have one yet."""
+        for key in keys:
+            if key not in self._slots: self._add_slot(key)
+
+    def _add_slot(self, key):
+        slot = self._slots[key] = len(self._kinds)
+        self._values.append(0.0)
+        self._kinds.append(ABSENT)
+        return slot
+
+    def assign(self, key, value):
+        """Store a value, returns True when it differs from the stored one (or there was none)."""
+        slot = self._slots.get(key)
+        if slot is None: slot = self._add_slot(key)
+        old = self._kinds[slot]
+        t = type(value)
+        if t is float:
+            kind = FLOAT
+        elif (t is int) and (-_MAX_EXACT_INT <= value <= _MAX_EXACT_INT):
+            kind = INT
+        else:
+            kind = OTHER
+        if kind == OTHER:
+            changed = (old != OTHER) or (self._other[slot] != value)
+            self._other[slot] = value
+        else:
+            changed = (old != kind) or (self._values[slot] != value)
+            self._values[slot] = value
+            if old == OTHER: del self._other[slot]
+        if old == ABSENT: self._count += 1
+        self._kinds[slot] = kind
+        return changed
+
+    def __setitem__(self, key, value):
+        self.assign(key, value)
+
+    def __delitem__(self, key):
+        slot = self._slots[key]
+        kind = self._kinds[slot]
+        if kind == ABSENT: raise KeyError(key)
+        if kind == OTHER: del self._other[slot]
+        self._kinds[slot] = ABSENT
+        self._count -= 1
+
+    def freeze(self, keys=None, base=None):
+        """Immutable copy of the current values, the arrays are copied in one go.
+        With keys, only the values of keys are copied from the store, all others from base, an earlier freeze
+        of this store (or absent without one)."""
+        if keys is None:
+            return FrozenValueStore(self._slots, array('d', self._values), bytes(self._kinds), dict(self._other),
+                                    self._count)
+        if isinstance(base, FrozenValueStore) and (base._slots is self._slots):
+            (values, kinds, other,) = (array('d', base._values), bytearray(base._kinds), dict(base._other),)
+        else:
+            (values, kinds, other,) = (array('d'), bytearray(), {},)
+        missing = len(self._kinds) - len(kinds)  # slots added after base was frozen
+        values.extend([0.0] * missing)
+        kinds.extend(bytes(missing))
+        for key in keys:
+            slot = self._slots.get(key)
+            if slot is None: continue
+            kinds[slot] = self._kinds[slot]
+            values[slot] = self._values[slot]
+            other.pop(slot, None)
+            if kinds[slot] == OTHER: other[slot] = self._other[slot]
+        return FrozenValueStore(self._slots, values, bytes(kinds), other, len(kinds) - kinds.count(ABSENT))
+
+
+class FrozenValueStore(_SlotReader, Mapping):
+    """Read only copy of a ValueStore. The slot map is shared: keys added later are absent here."""
+
+    def __init__(self, slots, values, kinds, other, count):
+        self._slots = slots
+        self._values = values
+        self._kinds = kinds
+        self._other = other
+        self._count = count
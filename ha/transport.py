@@ -0,0 +1,305 @@
+"""Modbus transports (serial, Modbus TCP, RTU over TCP) and a pool sharing connections between hubs."""
+import asyncio
+import heapq
+import itertools
+import logging
+import socket
+import threading
+import time
+from contextlib import contextmanager
+
+from pymodbus.client import ModbusSerialClient, ModbusTcpClient, AsyncModbusSerialClient, AsyncModbusTcpClient
+from pymodbus.exceptions import ConnectionException
+from pymodbus.transaction import ModbusRtuFramer, ModbusSocketFramer
+
+from .const import DEFAULT_PORT, DEFAULT_TCP_TYPE, DEFAULT_KEEPALIVE
+
+_LOGGER = logging.getLogger(__name__)
+
+INTERFACE_SERIAL = "serial"
+INTERFACE_TCP = "tcp"
+TCP_TYPE_TCP = "tcp"  # plain Modbus TCP (MBAP header with transaction id)
+TCP_TYPE_RTU = "rtu"  # RTU frames over a TCP socket (serial to ethernet converters)
+
+PRIORITY_CONTROL = 0  # writes, e.g. export limiting
+PRIORITY_FAST = 1  # reads of POLL_TIER_FAST blocks
+PRIORITY_BACKGROUND = 2  # all other reads
+
+
+def transport_key(interface, host=None, port=DEFAULT_PORT, tcp_type=DEFAULT_TCP_TYPE, serial_port=None):
+    """Hubs with the same key talk over the same physical connection."""
+    if interface == INTERFACE_SERIAL:
+        return (INTERFACE_SERIAL, serial_port,)
+    return (INTERFACE_TCP, host, int(port), tcp_type,)
+
+
+def _set_keepalive(sock, keepalive):
+    """Enable TCP keepalive probes on an open socket, so dead gateway connections are detected."""
+    if sock is None or not keepalive: return
+    try:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+        if hasattr(socket, "TCP_KEEPIDLE"):  # not available on all platforms
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, keepalive)
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, max(1, keepalive // 3))
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPCNT, 3)
+    except OSError:
+        _LOGGER.warning("cannot enable tcp keepalive on modbus connection", exc_info=True)
+
+
+class _Claim:
+    """Context manager of a claim with a given priority, see BusArbiter.claim."""
+
+    def __init__(self, arbiter, priority):
+        self.arbiter = arbiter
+        self.priority = priority
+
+    def __enter__(self):
+        self.arbiter.acquire(self.priority)
+
+    def __exit__(self, *exc):
+        self.arbiter.release()
+
+    async def __aenter__(self):
+        await self.arbiter.acquire(self.priority)
+
+    async def __aexit__(self, *exc):
+        self.arbiter.release()
+
+
+class BusArbiter:
+    """Lock of a bus that is granted by priority instead of arrival.
+
+    When the bus is released, the waiting claim with the lowest priority number gets it, claims of the same
+    priority in arrival order. Hubs claim the bus per request, so a control write waits at most for the block
+    read in progress and goes out before the next block of a running poll cycle.
+    Used like a threading.Lock, `with arbiter:` claims at PRIORITY_BACKGROUND."""
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._waiting = []  # heap of (priority, ticket)
+        self._tickets = itertools.count()
+        self._busy = False
+        self.max_wait = {}  # priority -> longest time a claim waited for the bus, in seconds
+
+    def claim(self, priority):
+        """Context manager holding the bus with the given priority."""
+        return _Claim(self, priority)
+
+    def acquire(self, priority=PRIORITY_BACKGROUND):
+        start = time.monotonic()
+        with self._cond:
+            if self._busy or self._waiting:
+                entry = (priority, next(self._tickets),)
+                heapq.heappush(self._waiting, entry)
+                while self._busy or (self._waiting[0] is not entry):
+                    self._cond.wait()
+                heapq.heappop(self._waiting)
+            self._busy = True
+            self.max_wait[priority] = max(self.max_wait.get(priority, 0.0), time.monotonic() - start)
+        return True
+
+    def release(self):
+        with self._cond:
+            self._busy = False
+            self._cond.notify_all()
+
+    def locked(self):
+        return self._busy
+
+    def __enter__(self):
+        self.acquire()
+
+    def __exit__(self, *exc):
+        self.release()
+
+
+class AsyncBusArbiter:
+    """asyncio variant of BusArbiter, `async with arbiter:` claims at PRIORITY_BACKGROUND."""
+
+    def __init__(self):
+        self._waiting = []  # heap of (priority, ticket, future)
+        self._tickets = itertools.count()
+        self._busy = False
+        self.max_wait = {}  # priority -> longest time a claim waited for the bus, in seconds
+
+    def claim(self, priority):
+        """Async context manager holding the bus with the given priority."""
+        return _Claim(self, priority)
+
+    async def acquire(self, priority=PRIORITY_BACKGROUND):
+        start = time.monotonic()
+        if self._busy or self._waiting:
+            future = asyncio.get_running_loop().create_future()
+            heapq.heappush(self._waiting, (priority, next(self._tickets), future,))
+            try:
+                await future
+            except asyncio.CancelledError:
+                if future.done() and not future.cancelled(): self.release()  # granted while being cancelled
+                raise
+        self._busy = True
+        self.max_wait[priority] = max(self.max_wait.get(priority, 0.0), time.monotonic() - start)
+        return True
+
+    def release(self):
+        """Hand the bus over to the first waiting claim, it stays busy in between."""
+        while self._waiting:
+            future = heapq.heappop(self._waiting)[2]
+            if not future.done():
+                future.set_result(True)
+                return
+        self._busy = False
+
+    def locked(self):
+        return self._busy
+
+    async def __aenter__(self):
+        await self.acquire()
+
+    async def __aexit__(self, *exc):
+        self.release()
+
+
+class ModbusTransport:
+    """A blocking pymodbus client together with the arbiter that serializes access to its bus."""
+
+    def __init__(self, client, key=None, keepalive=DEFAULT_KEEPALIVE):
+        self.client = client
+        self.key = key
+        self.keepalive = keepalive
+        self.lock = BusArbiter()
+        self.refcount = 0
+
+    @classmethod
+    def create(cls, interface, host=None, port=DEFAULT_PORT, tcp_type=DEFAULT_TCP_TYPE, serial_port=None,
+               baudrate=9600, timeout=3, keepalive=DEFAULT_KEEPALIVE):
+        key = transport_key(interface, host, port, tcp_type, serial_port)
+        if interface == INTERFACE_SERIAL:
+            client = ModbusSerialClient(method="rtu", port=serial_port, baudrate=int(baudrate), parity='N',
+                                        stopbits=1, bytesize=8, timeout=timeout)
+        elif not host:
+            raise ValueError(f"modbus interface {interface} needs a host")
+        elif tcp_type == TCP_TYPE_RTU:
+            client = ModbusTcpClient(host=host, port=int(port), framer=ModbusRtuFramer, timeout=timeout)
+        else:
+            client = ModbusTcpClient(host=host, port=int(port), framer=ModbusSocketFramer, timeout=timeout)
+        return cls(client, key, keepalive)
+
+    @property
+    def is_tcp(self):
+        return isinstance(self.client, ModbusTcpClient)
+
+    def ensure_connected(self):
+        """(Re)connect when the connection was closed or lost, call with the lock held."""
+        if self.client.is_socket_open(): return
+        if self.refcount: _LOGGER.info(f"(re)connecting modbus transport {self.key}")
+        if not self.client.connect():
+            raise ConnectionException(f"cannot connect to {self.key}")
+        if self.is_tcp: _set_keepalive(self.client.socket, self.keepalive)
+
+    @contextmanager
+    def timeout(self, seconds):
+        """Use another response timeout for the requests in the with block, call with the lock held."""
+        params = self.client.params
+        port = None if self.is_tcp else self.client.socket  # the serial port has its own read timeout
+        saved = (params.timeout, getattr(port, 'timeout', None),)
+        params.timeout = seconds
+        if port is not None: port.timeout = seconds
+        try:
+            yield
+        finally:
+            params.timeout = saved[0]
+            if port is not None: port.timeout = saved[1]
+
+    def connect(self):
+        with self.lock:
+            self.ensure_connected()
+
+    def close(self):
+        with self.lock:
+            self.client.close()
+
+
+class AsyncModbusTransport:
+    """An asyncio pymodbus client together with the arbiter that serializes access to its bus."""
+
+    def __init__(self, client, key=None, keepalive=DEFAULT_KEEPALIVE):
+        self.client = client
+        self.key = key
+        self.keepalive = keepalive
+        self.lock = AsyncBusArbiter()
+        self.refcount = 0
+        # only Modbus TCP frames carry a transaction id to match pipelined responses
+        self.pipelining = isinstance(client, AsyncModbusTcpClient) and client.framer.__class__ is ModbusSocketFramer
+
+    @classmethod
+    def create(cls, interface, host=None, port=DEFAULT_PORT, tcp_type=DEFAULT_TCP_TYPE, serial_port=None,
+               baudrate=9600, timeout=3, keepalive=DEFAULT_KEEPALIVE):
+        key = transport_key(interface, host, port, tcp_type, serial_port)
+        if interface == INTERFACE_SERIAL:
+            client = AsyncModbusSerialClient(method="rtu", port=serial_port, baudrate=int(baudrate), parity='N',
+                                             stopbits=1, bytesize=8, timeout=timeout)
+        elif not host:
+            raise ValueError(f"modbus interface {interface} needs a host")
+        elif tcp_type == TCP_TYPE_RTU:
+            client = AsyncModbusTcpClient(host=host, port=int(port), framer=ModbusRtuFramer, timeout=timeout)
+        else:
+            client = AsyncModbusTcpClient(host=host, port=int(port), framer=ModbusSocketFramer, timeout=timeout)
+        return cls(client, key, keepalive)
+
+    @property
+    def is_tcp(self):
+        return isinstance(self.client, AsyncModbusTcpClient)
+
+    async def ensure_connected(self):
+        """(Re)connect when the connection was closed or lost, call with the lock held."""
+        if self.client.connected: return
+        if self.refcount: _LOGGER.info(f"(re)connecting modbus transport {self.key}")
+        await self.client.connect()
+        if not self.client.connected:
+            raise ConnectionException(f"cannot connect to {self.key}")
+        if self.is_tcp and self.client.protocol and self.client.protocol.transport:
+            _set_keepalive(self.client.protocol.transport.get_extra_info("socket"), self.keepalive)
+
+    async def connect(self):
+        async with self.lock:
+            await self.ensure_connected()
+
+    async def close(self):
+        async with self.lock:
+            await self.client.close()
+
+
+class ModbusConnectionPool:
+    """Shares one transport between all hubs that address the same gateway host:port or serial port."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._transports = {}
+
+    def acquire(self, interface, host=None, port=DEFAULT_PORT, tcp_type=DEFAULT_TCP_TYPE, serial_port=None,
+                baudrate=9600, timeout=3, keepalive=DEFAULT_KEEPALIVE, asynchronous=False):
+        key = transport_key(interface, host, port, tcp_type, serial_port) + (asynchronous,)
+        with self._lock:
+            transport = self._transports.get(key)
+            if transport is None:
+                factory = AsyncModbusTransport if asynchronous else ModbusTransport
+                transport = factory.create(interface, host, port, tcp_type, serial_port, baudrate, timeout,
+                                           keepalive)
+                transport.key = key
+                self._transports[key] = transport
+            transport.refcount += 1
+            return transport
+
+    def release(self, transport):
+        """Drop a reference, returns True when this was the last user and the transport must be closed."""
+        with self._lock:
+            transport.refcount -= 1
+            if transport.refcount > 0: return False
+            if self._transports.get(transport.key) is transport: self._transports.pop(transport.key)
+            return True
+
+    def __len__(self):
+        return len(self._transports)
+
+
+POOL = ModbusConnectionPool()
@@ -0,0 +1,77 @@
+"""Queue of pending register writes, sent as few write multiple registers (FC16) requests as possible."""
+import threading
+from concurrent.futures import Future
+
+MAX_WRITE_REGISTERS = 123  # modbus limit for a single write multiple registers request
+
+
+class WriteGroup:
+    """Contiguous registers written in one request: values[i] goes to register start + i."""
+
+    def __init__(self, start):
+        self.start = start
+        self.values = []
+        self.futures = []  # per register, the futures of all writes that were merged into it
+
+    @property
+    def end(self):
+        return self.start + len(self.values)
+
+    def resolve(self, response=None, exception=None):
+        """Complete the futures of all writes in the group."""
+        for futures in self.futures:
+            for future in futures:
+                if future.done(): continue
+                if exception is None:
+                    future.set_result(response)
+                else:
+                    future.set_exception(exception)
+
+
+class WriteQueue:
+    """Pending writes by register address, only the latest value of a register is kept.
+
+    put() returns a concurrent.futures.Future per write; it gets the response of the request that wrote the
+    register, also when the value was replaced by a later put() for the same register.
+    take() empties the queue in one go and groups contiguous registers into WriteGroups."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending = {}  # address -> (value, [futures])
+
+    def put(self, address, value):
+        future = Future()
+        with self._lock:
+            (_, futures,) = self._pending.get(address, (None, [],))
+            futures.append(future)
+            self._pending[address] = (value, futures,)
+        return future
+
+    def take(self, limit=MAX_WRITE_REGISTERS):
+        """Remove all pending writes, returns them as WriteGroups of at most limit registers, in address order."""
+        with self._lock:
+            pending = self._pending
+            self._pending = {}
+        limit = max(1, min(limit, MAX_WRITE_REGISTERS))
+        groups = []
+        group = None
+        for address in sorted(pending):
+            (value, futures,) = pending[address]
+            if (group is None) or (address != group.end) or (len(group.values) >= limit):
+                group = WriteGroup(address)
+                groups.append(group)
+            group.values.append(value)
+            group.futures.append(futures)
+        return groups
+
+    def __len__(self):
+        return len(self._pending)
+
+    def __bool__(self):
+        return bool(self._pending)
+
+    def __contains__(self, address):
+        return address in self._pending
+
+    def __repr__(self):
+        return f"WriteQueue({ {address: value for (address, (value, _,)) in self._pending.items()} })"
@@ -1,6 +1,5 @@
 import importlib
 import logging
-from dataclasses import dataclass
 
 from pymodbus import pymodbus_apply_logging_config
 from pymodbus.payload import Endian
@@ -18,7 +17,7 @@ from pymodbus.payload import BinaryPayloadDecoder
 
 from ha import SolaXModbusHub, setPlugin
 from ha.const import BaseModbusSensorEntityDescription, REG_HOLDING, REGISTER_U8H, REGISTER_U8L, SLEEPMODE_NONE, \
-    SLEEPMODE_ZERO, REG_INPUT, REGISTER_STR, REGISTER_WORDS, REGISTER_S32, REGISTER_U32, REGISTER_ULSB16MSB16
+    SLEEPMODE_ZERO, REG_INPUT, WRITE_DATA_LOCAL
 
 # This sets the root logger to write to stdout (your console).
 # Your script/app needs to call this somewhere at least once.
@@ -101,57 +100,6 @@ def run_sync_client(client):
     client.close()
     _logger.info("### End of Program")
 
-INVALID_START = 99999
-
-@dataclass
-class block():
-    start: int = None  # start address of the block
-    end: int = None  # end address of the block
-    # order16: int = None # byte endian for 16bit registers
-    # order32: int = None # word endian for 32bit registers
-    descriptions: None = None
-    regs: None = None  # sorted list of registers used in this block
-
-def splitInBlocks(descriptions, block_size):
-    start = INVALID_START
-    end = 0
-    blocks = []
-    curblockregs = []
-    for reg in descriptions:
-        descr = descriptions[reg]
-        if (not type(descr) is dict) and (descr.newblock or ((reg - start) > block_size)):
-            if ((end - start) > 0):
-                _logger.info(f"Starting new block at 0x{reg:x} ")
-                # newblock = block(start = start, end = end, order16 = descriptions[start].order16, order32 = descriptions[start].order32, descriptions = descriptions, regs = curblockregs)
-                newblock = block(start=start, end=end, descriptions=descriptions, regs=curblockregs)
-                blocks.append(newblock)
-                start = INVALID_START
-                end = 0
-                curblockregs = []
-            else:
-                _logger.info(f"newblock declaration found for empty block")
-
-        if start == INVALID_START: start = reg
-        if type(descr) is dict:
-            end = reg + 1  # couple of byte values
-        else:
-            _logger.info(f"adding register 0x{reg:x} {descr.key} to block with start 0x{start:x}")
-            if descr.unit in (REGISTER_STR, REGISTER_WORDS,):
-                if (descr.wordcount):
-                    end = reg + descr.wordcount
-                else:
-                    _logger.warning(f"invalid or missing missing wordcount for {descr.key}")
-            elif descr.unit in (REGISTER_S32, REGISTER_U32, REGISTER_ULSB16MSB16,):
-                end = reg + 2
-            else:
-                end = reg + 1
-        curblockregs.append(reg)
-    if ((end - start) > 0):  # close last block
-        # newblock = block(start = start, end = end, order16 = descriptions[start].order16, order32 = descriptions[start].order32, descriptions = descriptions, regs = curblockregs)
-        newblock = block(start=start, end=end, descriptions=descriptions, regs=curblockregs)
-        blocks.append(newblock)
-    return blocks
-
 def setup_entry(hub): #, async_add_entities):
     # if entry.data:
     #     hub_name = entry.data[CONF_NAME]  # old style - remove soon
@@ -195,6 +143,7 @@ def setup_entry(hub): #, async_add_entities):
             entities.append(sensor)
             if sensor_description.sleepmode == SLEEPMODE_NONE: hub.sleepnone.append(sensor_description.key)
             if sensor_description.sleepmode == SLEEPMODE_ZERO: hub.sleepzero.append(sensor_description.key)
+            if sensor_description.deadband: hub.deadbands[sensor_description.key] = sensor_description.deadband
             if (sensor_description.register < 0):  # entity without modbus address
                 if sensor_description.value_function:
                     computedRegs[sensor_description.key] = sensor_description
@@ -237,12 +186,22 @@ def setup_entry(hub): #, async_add_entities):
     # if (len(inputOrder32)>1) or (len(holdingOrder32)>1): _logger.warning(f"inconsistent Big or Little Endian declaration for 32bit registers")
     # if (len(inputOrder16)>1) or (len(holdingOrder16)>1): _logger.warning(f"inconsistent Big or Little Endian declaration for 16bit registers")
     # split in blocks and store results
-    hub.holdingBlocks = splitInBlocks(holdingRegs, hub.plugin.block_size)
-    hub.inputBlocks = splitInBlocks(inputRegs, hub.plugin.block_size)
+    for descr in list(plugin.NUMBER_TYPES) + list(plugin.SELECT_TYPES):  # holding registers written by entities
+        if (descr.register is not None) and (descr.write_method != WRITE_DATA_LOCAL) and \
+                plugin.matchInverterWithMask(hub._invertertype, descr.allowedtypes, hub.seriesnumber, descr.blacklist):
+            hub.writeRegs.setdefault(descr.register, []).append(descr)
+    hub.data.reserve(sensor.entity_description.key for sensor in entities)  # value slots in entity order
+    hub.holdingRegs = holdingRegs
+    hub.inputRegs = inputRegs
+    hub.replan()
     hub.computedRegs = computedRegs
 
     for i in hub.holdingBlocks: _logger.info(f"returning holding block: 0x{i.start:x} 0x{i.end:x} {i.regs}")
     for i in hub.inputBlocks: _logger.info(f"returning input block: 0x{i.start:x} 0x{i.end:x} {i.regs}")
+    for (typ, plan,) in (('holding', hub.holdingPlan,), ('input', hub.inputPlan,)):
+        _logger.info(f"{typ} plan: {len(plan.blocks)} blocks, estimated {plan.estimated_time * 1000:.0f} ms for all blocks, "
+                     f"{plan.cycle_time * 1000:.0f} ms per cycle on average, "
+                     f"{plan.wasted_fraction:.0%} of the registers read are unused")
     _logger.debug(f"holdingBlocks: {hub.holdingBlocks}")
     _logger.debug(f"inputBlocks: {hub.inputBlocks}")
     _logger.info(f"computedRegs: {hub.computedRegs}")
@@ -275,7 +234,7 @@ if __name__ == "__main__":
     plugin = importlib.import_module(f".plugin_solax", 'ha')
     if not plugin: _logger.error(f"could not import plugin")
     setPlugin("SolaxMIC", plugin)
-    hub = SolaXModbusHub("SolaxMIC")
+    hub = SolaXModbusHub("SolaxMIC", interface="serial", serial_port="/dev/cu.usbserial-14210", baudrate=9600)
     setup_entry(hub)
     hub.read_modbus_data()
 #   testclient = setup_sync_client()
@@ -0,0 +1,245 @@
+"""Local Modbus TCP test servers: a pymodbus server with an inverter register image, behind a proxy."""
+import asyncio
+import importlib
+import os
+import socket
+import sys
+import threading
+import types
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pymodbus.datastore import ModbusSequentialDataBlock, ModbusServerContext, ModbusSlaveContext  # noqa: E402
+from pymodbus.exceptions import ModbusIOException  # noqa: E402
+from pymodbus.pdu import ExceptionResponse, ModbusExceptions  # noqa: E402
+from pymodbus.register_read_message import ReadHoldingRegistersResponse, ReadInputRegistersResponse  # noqa: E402
+from pymodbus.register_write_message import WriteMultipleRegistersResponse, WriteSingleRegisterResponse  # noqa: E402
+from pymodbus.server import StartAsyncTcpServer  # noqa: E402
+
+import main  # noqa: E402
+from ha import SolaXModbusHub, setPlugin  # noqa: E402
+from ha.transport import ModbusTransport  # noqa: E402
+
+SERIAL = "H34A10I1234567"  # serial number of a X1/X3 hybrid gen4, read by the plugin at holding register 0
+
+
+def register_value(address):
+    """Contents of the register at address in the test image."""
+    if address < len(SERIAL) // 2: return (ord(SERIAL[2 * address]) << 8) | ord(SERIAL[2 * address + 1])
+    return (address * 7) % 65536
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+class _LoopThread:
+    """An asyncio loop on a daemon thread, for servers that run next to the blocking code under test."""
+
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        threading.Thread(target=self.loop.run_forever, daemon=True).start()
+
+    def run(self, coro, timeout=5):
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result(timeout)
+
+    def stop(self):
+        self.loop.call_soon_threadsafe(self.loop.stop)
+
+
+class ModbusServer(_LoopThread):
+    """pymodbus TCP server with the register image of an inverter, zero based addresses."""
+
+    def __init__(self):
+        super().__init__()
+        self.port = _free_port()
+        image = [register_value(address) for address in range(0x1000)]
+        slave = ModbusSlaveContext(hr=ModbusSequentialDataBlock(0, image), ir=ModbusSequentialDataBlock(0, image),
+                                   zero_mode=True)
+        self.context = ModbusServerContext(slaves=slave, single=True)
+
+        async def serve():
+            return asyncio.ensure_future(StartAsyncTcpServer(context=self.context, address=("127.0.0.1", self.port)))
+
+        self.task = self.run(serve())
+        _wait_listening(self.port)
+
+    def stop(self):
+        async def cancel():
+            self.task.cancel()
+            await asyncio.gather(self.task, return_exceptions=True)
+
+        self.run(cancel())
+        super().stop()
+
+
+class TcpProxy(_LoopThread):
+    """Forwards Modbus TCP frames to a server, like a gateway.
+    delay is the round trip time the proxy adds, jitter delays the responses by up to jitter seconds more,
+    so that the responses to pipelined requests come back out of order.
+    single forwards one request at a time and drops the requests that arrive while one is outstanding,
+    like a gateway that serializes requests. drop_connections() closes the connections, like a gateway that restarts."""
+
+    def __init__(self, target, delay=0.0, jitter=0.0, single=False):
+        super().__init__()
+        (self.target, self.delay, self.jitter, self.single,) = (target, delay, jitter, single,)
+        self.port = _free_port()
+        self.connections = 0  # connections accepted so far
+        self.dropped = 0  # requests dropped in single mode
+        self._writers = []
+        self.server = self.run(asyncio.start_server(self._handle, "127.0.0.1", self.port))
+
+    async def _handle(self, reader, writer):
+        self.connections += 1
+        (upstream_reader, upstream_writer,) = await asyncio.open_connection("127.0.0.1", self.target)
+        self._writers += [writer, upstream_writer]
+        idle = asyncio.Event()
+        idle.set()
+
+        def request_delay(frame):
+            if not self.single: return self.delay / 2
+            if not idle.is_set():
+                self.dropped += 1
+                return None
+            idle.clear()
+            return self.delay / 2
+
+        def response_delay(frame):
+            idle.set()
+            transaction = int.from_bytes(frame[0:2], "big")
+            return self.delay / 2 + self.jitter * ((-transaction) % 4) / 3  # reverses groups of 4 transactions
+
+        await asyncio.gather(self._pipe(reader, upstream_writer, request_delay),
+                             self._pipe(upstream_reader, writer, response_delay))
+
+    async def _pipe(self, src, dst, frame_delay):
+        try:
+            while True:
+                header = await src.readexactly(6)  # MBAP header up to the length field
+                frame = header + await src.readexactly(int.from_bytes(header[4:6], "big"))
+                delay = frame_delay(frame)
+                if delay is not None: self.loop.call_later(delay, dst.write, frame)
+        except (asyncio.IncompleteReadError, ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            dst.close()
+
+    def drop_connections(self):
+        """Close all connections that are open through the proxy."""
+
+        async def drop():
+            for writer in self._writers: writer.close()
+            self._writers = []
+
+        self.run(drop())
+
+    def close(self):
+        self.drop_connections()
+        self.server.close()
+        self.stop()
+
+
+def _wait_listening(port, timeout=5):
+    for _ in range(int(timeout / 0.05)):
+        try:
+            socket.create_connection(("127.0.0.1", port), 0.5).close()
+            return
+        except OSError:
+            threading.Event().wait(0.05)
+    raise RuntimeError(f"modbus test server on port {port} does not listen")
+
+
+@pytest.fixture(scope="session")
+def modbus_server():
+    server = ModbusServer()
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def make_proxy(modbus_server):
+    """Factory of proxies to the test server, e.g. make_proxy(delay=0.1), closed after the test."""
+    proxies = []
+
+    def make(**kwargs):
+        proxies.append(TcpProxy(modbus_server.port, **kwargs))
+        return proxies[-1]
+
+    yield make
+    for proxy in proxies: proxy.close()
+
+
+@pytest.fixture
+def proxy(make_proxy):
+    return make_proxy()
+
+
+@pytest.fixture
+def plugin():
+    """The solax plugin, registered for the hub names used by the tests."""
+    plugin = importlib.import_module(".plugin_solax", 'ha')
+    for name in ("hub_a", "hub_b"): setPlugin(name, plugin)
+    return plugin
+
+
+class StubClient:
+    """Blocking pymodbus client stand in, answers from the test register image.
+    refused maps 'holding'/'input' to the addresses the device rejects with an illegal address exception.
+    While offline is set, reads get no answer, like from a sleeping inverter."""
+
+    def __init__(self, refused=None):
+        self.refused = refused or {}
+        self.requests = []  # (function, address, count or values) of each request
+        self.image = {}  # address -> register value written
+        self.offline = False
+        self.params = types.SimpleNamespace(timeout=3)
+        self.socket = None
+
+    def connect(self):
+        return True
+
+    def close(self):
+        pass
+
+    def is_socket_open(self):
+        return True
+
+    def _read(self, typ, response, address, count):
+        self.requests.append((typ, address, count,))
+        if self.offline: return ModbusIOException("no response")
+        if any(address <= refused < address + count for refused in self.refused.get(typ, ())):
+            return ExceptionResponse(4 if typ == 'input' else 3, ModbusExceptions.IllegalAddress)
+        return response([self.image.get(a, register_value(a)) for a in range(address, address + count)])
+
+    def read_holding_registers(self, address, count, slave=1):
+        return self._read('holding', ReadHoldingRegistersResponse, address, count)
+
+    def read_input_registers(self, address, count, slave=1):
+        return self._read('input', ReadInputRegistersResponse, address, count)
+
+    def write_register(self, address, value, slave=1):
+        self.requests.append(('write', address, [value],))
+        self.image[address] = value
+        return WriteSingleRegisterResponse(address, value)
+
+    def write_registers(self, address, values, slave=1):
+        self.requests.append(('write', address, list(values),))
+        for (i, value,) in enumerate(values): self.image[address + i] = value
+        return WriteMultipleRegistersResponse(address, len(values))
+
+
+@pytest.fixture
+def stub_hub(plugin, tmp_path):
+    """Factory of blocking hubs on a StubClient, with their own holes file, e.g. stub_hub(refused={...})."""
+
+    def make(name="hub_a", **kwargs):
+        client = StubClient(**kwargs)
+        hub = SolaXModbusHub(name, transport=ModbusTransport(client), holes_file=str(tmp_path / "holes.json"))
+        main.setup_entry(hub)
+        return hub
+
+    return make
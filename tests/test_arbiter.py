@@ -0,0 +1,88 @@
+"""Bus arbiter: the bus goes to the waiting claim with the highest priority, so writes preempt polling."""
+import asyncio
+import threading
+import time
+
+from ha.transport import AsyncBusArbiter, BusArbiter, PRIORITY_BACKGROUND, PRIORITY_CONTROL, PRIORITY_FAST
+
+CLAIMS = [("background 1", PRIORITY_BACKGROUND,), ("fast", PRIORITY_FAST,), ("background 2", PRIORITY_BACKGROUND,),
+          ("control", PRIORITY_CONTROL,)]
+GRANTED = ["control", "fast", "background 1", "background 2"]
+
+
+def _wait_for(condition, timeout=2):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.001)
+
+
+def test_bus_is_granted_by_priority():
+    arbiter = BusArbiter()
+    granted = []
+
+    def claim(name, priority):
+        with arbiter.claim(priority):
+            granted.append(name)
+
+    arbiter.acquire()
+    threads = []
+    for (i, (name, priority,),) in enumerate(CLAIMS):
+        threads.append(threading.Thread(target=claim, args=(name, priority,)))
+        threads[-1].start()
+        _wait_for(lambda: len(arbiter._waiting) == i + 1)  # queued in this arrival order
+    arbiter.release()
+    for thread in threads: thread.join(2)
+    assert granted == GRANTED
+    assert not arbiter.locked()
+    assert arbiter.max_wait[PRIORITY_BACKGROUND] >= arbiter.max_wait[PRIORITY_CONTROL]
+
+
+def test_async_bus_is_granted_by_priority():
+    async def run():
+        arbiter = AsyncBusArbiter()
+        granted = []
+
+        async def claim(name, priority):
+            async with arbiter.claim(priority):
+                granted.append(name)
+                await asyncio.sleep(0)
+
+        await arbiter.acquire()
+        tasks = []
+        for (name, priority,) in CLAIMS:
+            tasks.append(asyncio.get_running_loop().create_task(claim(name, priority)))
+            await asyncio.sleep(0)
+        cancelled = asyncio.get_running_loop().create_task(claim("cancelled", PRIORITY_CONTROL))
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        arbiter.release()
+        await asyncio.gather(*tasks, cancelled, return_exceptions=True)
+        return (granted, arbiter.locked(),)
+
+    (granted, locked,) = asyncio.run(run())
+    assert granted == GRANTED  # the cancelled claim does not hold up the others
+    assert not locked
+
+
+def test_write_goes_before_the_next_block_of_a_cycle(stub_hub):
+    hub = stub_hub()
+    assert hub.read_modbus_data()
+    client = hub._transport.client
+    read = client.read_input_registers
+    writer = threading.Thread(target=hub._lowlevel_write_register, args=(hub._modbus_addr, 0x24, 200,))
+
+    def read_input_registers(address, count, slave=1):
+        if not writer.ident:  # a write arrives while the first input block is read
+            writer.start()
+            _wait_for(lambda: hub._lock._waiting)
+        return read(address, count, slave)
+
+    client.read_input_registers = read_input_registers
+    client.requests.clear()
+    assert hub.read_modbus_data()
+    writer.join(2)
+    reads = [request for request in client.requests if request[0] == 'input']
+    assert len(reads) > 2
+    first = client.requests.index(reads[0])
+    assert client.requests[first + 1] == ('write', 0x24, [200],)  # right after the block read in progress
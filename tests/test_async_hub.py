@@ -0,0 +1,61 @@
+"""asyncio hub: same register image and values as the blocking hub, polled by a task on the running loop."""
+import asyncio
+from datetime import timedelta
+
+import main
+from ha import AsyncSolaXModbusHub, SolaXModbusHub
+
+from conftest import SERIAL
+
+
+async def _hub(name, port):
+    hub = AsyncSolaXModbusHub(name, interface="tcp", host="127.0.0.1", port=port, holes_file=None)
+    await hub.async_setup()
+    main.setup_entry(hub)
+    return hub
+
+
+def _layout(hub):
+    return [(b.start, b.end, b.regs,) for b in hub.holdingBlocks + hub.inputBlocks]
+
+
+def test_async_hub_decodes_like_the_blocking_hub(proxy, plugin):
+    blocking = SolaXModbusHub("hub_a", interface="tcp", host="127.0.0.1", port=proxy.port, holes_file=None)
+    main.setup_entry(blocking)
+    try:
+        assert blocking.read_modbus_data()
+    finally:
+        blocking.close()
+
+    async def run():
+        hub = await _hub("hub_b", proxy.port)
+        try:
+            assert hub.seriesnumber == SERIAL
+            assert await hub.read_modbus_data()
+            return hub
+        finally:
+            await hub.close()
+
+    hub = asyncio.run(run())
+    assert hub._invertertype == blocking._invertertype
+    assert _layout(hub) == _layout(blocking)
+    assert hub.data and (hub.data == blocking.data)
+
+
+def test_polling_task_refreshes_until_closed(proxy, plugin):
+    async def run():
+        hub = await _hub("hub_a", proxy.port)
+        hub._scan_interval = timedelta(seconds=0.05)
+        task = hub.start_polling()
+        try:
+            for _ in range(100):
+                if hub.cyclecount >= 3: break
+                await asyncio.sleep(0.02)
+        finally:
+            await hub.close()
+        await asyncio.gather(task, return_exceptions=True)
+        return (hub, task,)
+
+    (hub, task,) = asyncio.run(run())
+    assert hub.cyclecount >= 3 and task.cancelled()
+    assert hub._poll_task is None
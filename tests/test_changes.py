@@ -0,0 +1,54 @@
+"""Change detection: update callbacks run only for keys that changed, or moved by more than their deadband."""
+import pytest
+
+from conftest import register_value
+
+
+@pytest.fixture
+def calls():
+    return []
+
+
+@pytest.fixture
+def hub(stub_hub, calls):
+    """A hub after its first cycle, with a callback for all keys, one for measured_power and one for seriesnumber."""
+    hub = stub_hub()
+    hub.async_add_solax_modbus_sensor(lambda: calls.append("all"))
+    hub.async_add_solax_modbus_sensor(lambda: calls.append("power"), keys=["measured_power"])
+    hub.async_add_solax_modbus_sensor(lambda: calls.append("serial"), keys=["seriesnumber"])
+    hub.async_refresh_modbus_data()
+    calls.clear()
+    return hub
+
+
+def _power(hub, delta):
+    """Set measured_power (S32 at input 0x46, low word first) to its value in the test image plus delta."""
+    hub._transport.client.image[0x46] = register_value(0x46) + delta
+
+
+def test_no_callbacks_without_changes(hub, calls):
+    hub.async_refresh_modbus_data()
+    assert not hub.delta and not calls
+
+
+def test_callbacks_for_their_keys_only(hub, calls):
+    before = hub.data["measured_power"]
+    _power(hub, 5)
+    hub.async_refresh_modbus_data()
+    assert hub.data["measured_power"] == before + 5
+    assert "measured_power" in hub.delta
+    assert calls == ["all", "power"]
+
+
+def test_deadband_holds_back_small_moves(hub, calls):
+    before = hub.data["measured_power"]
+    hub.deadbands["measured_power"] = 10
+    hub._published["measured_power"] = before
+    for (delta, notified,) in [(4, False,), (8, False,), (12, True,), (18, False,), (23, True,)]:
+        _power(hub, delta)
+        hub.async_refresh_modbus_data()
+        assert hub.data["measured_power"] == before + delta  # data always has the value read
+        assert "measured_power" in hub.changed
+        assert ("measured_power" in hub.delta) == notified, f"moved by {delta}"
+        assert ("power" in calls) == notified
+        calls.clear()
@@ -0,0 +1,107 @@
+"""Computed sensors: evaluated in dependency order, and only when one of their inputs changed."""
+from ha.computed import ComputedGraph
+from ha.const import BaseModbusSensorEntityDescription
+
+
+def _computed(functions, depends_on=None):
+    """computedRegs for {key: function(datadict)}, keyed like setup_entry keys them."""
+    depends_on = depends_on or {}
+    return {key: BaseModbusSensorEntityDescription(key=key, value_function=lambda initval, descr, data, f=f: f(data),
+                                                   depends_on=depends_on.get(key))
+            for (key, f,) in functions.items()}
+
+
+class Counter:
+    """Wraps value functions and counts their calls per key."""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, key, f):
+        def counted(data):
+            self.calls.append(key)
+            return f(data)
+
+        return counted
+
+
+def test_dependencies_are_evaluated_first():
+    # declared in reverse order: total reads sum, which reads the registers a and b
+    graph = ComputedGraph(_computed({"total": lambda d: d["sum"] * 2, "sum": lambda d: d["a"] + d["b"]}))
+    data = {"a": 1, "b": 2}
+    delta = set()
+    graph.evaluate(data, delta)
+    assert (data["sum"], data["total"],) == (3, 6,)
+    assert delta == {"sum", "total"}
+    assert graph.order == ["sum", "total"]
+    assert graph.inputs == {"sum": {"a", "b"}, "total": {"sum"}}
+
+
+def test_only_sensors_with_changed_inputs_are_evaluated():
+    count = Counter()
+    graph = ComputedGraph(_computed({"sum": count("sum", lambda d: d["a"] + d["b"]),
+                                     "double_c": count("double_c", lambda d: d["c"] * 2),
+                                     "total": count("total", lambda d: d["sum"] + 1)}))
+    data = {"a": 1, "b": 2, "c": 3}
+    graph.evaluate(data, set())
+    count.calls.clear()
+    data["a"] = 5
+    delta = {"a"}
+    graph.evaluate(data, delta)
+    assert count.calls == ["sum", "total"]
+    assert delta == {"a", "sum", "total"} and (data["total"] == 8)
+    count.calls.clear()
+    graph.evaluate(data, set())
+    assert not count.calls
+    graph.reset()
+    graph.evaluate(data, set())
+    assert sorted(count.calls) == ["double_c", "sum", "total"]
+
+
+def test_unchanged_results_are_not_in_the_delta():
+    graph = ComputedGraph(_computed({"sign": lambda d: d["a"] > 0}))
+    data = {"a": 1}
+    graph.evaluate(data, set())
+    data["a"] = 2
+    delta = {"a"}
+    graph.evaluate(data, delta)
+    assert delta == {"a"}
+
+
+def test_inputs_of_branches_are_traced_when_taken():
+    graph = ComputedGraph(_computed({"out": lambda d: d["x"] if d["on"] else 0}))
+    data = {"on": False, "x": 1}
+    graph.evaluate(data, set())
+    assert graph.inputs["out"] == {"on"}
+    version = graph.version
+    data["on"] = True
+    graph.evaluate(data, {"on"})
+    assert graph.inputs["out"] == {"on", "x"} and (graph.version > version)
+    data["x"] = 7
+    graph.evaluate(data, {"x"})
+    assert data["out"] == 7
+
+
+def test_declared_dependencies_order_the_first_evaluation():
+    graph = ComputedGraph(_computed({"b": lambda d: d.get("a", 0) + 1, "a": lambda d: 10}, depends_on={"b": ["a"]}))
+    assert graph.order == ["a", "b"]
+    data = {}
+    graph.evaluate(data, set())
+    assert data == {"a": 10, "b": 11}
+
+
+def test_dependency_cycles_do_not_hang():
+    graph = ComputedGraph(_computed({"p": lambda d: d.get("q", 0) + 1, "q": lambda d: d.get("p", 0) + 1},
+                                    depends_on={"p": ["q"], "q": ["p"]}))
+    assert sorted(graph.order) == ["p", "q"]
+    data = {}
+    graph.evaluate(data, set())
+    assert set(data) == {"p", "q"}
+
+
+def test_hub_computed_values_match_their_functions(stub_hub):
+    hub = stub_hub()
+    assert hub.read_modbus_data()
+    assert hub.computedRegs
+    for descr in hub.computedRegs.values():
+        assert hub.data[descr.key] == descr.value_function(0, descr, hub.data), descr.key
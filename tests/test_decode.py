@@ -0,0 +1,141 @@
+"""Compiled decode plans: every unit decodes like pymodbus' BinaryPayloadDecoder, in every byte and word order."""
+import random
+
+import pytest
+from pymodbus.payload import BinaryPayloadDecoder, Endian
+
+from ha.const import BaseModbusSensorEntityDescription, REGISTER_U16, REGISTER_S16, REGISTER_U32, REGISTER_S32, \
+    REGISTER_ULSB16MSB16, REGISTER_STR, REGISTER_WORDS, REGISTER_U8L, REGISTER_U8H, SLEEPMODE_LASTAWAKE
+from ha import decode
+from ha.decode import DecodePlan, np
+from ha.planner import block, register_width
+
+ORDERS = [(Endian.Big, Endian.Little,), (Endian.Big, Endian.Big,), (Endian.Little, Endian.Little,),
+          (Endian.Little, Endian.Big,)]
+
+
+def _descr(key, reg, unit, **kwargs):
+    return BaseModbusSensorEntityDescription(key=key, register=reg, unit=unit, **kwargs)
+
+
+def _block(descriptions, start=0):
+    regs = sorted(descriptions)
+    return block(start=start, end=regs[-1] + register_width(descriptions[regs[-1]]), descriptions=descriptions,
+                 regs=regs)
+
+
+def _decode(descriptions, registers, order16=Endian.Big, order32=Endian.Little, awake=True, start=0):
+    data = {}
+    DecodePlan(_block(descriptions, start), order16, order32, False).decode(registers, data, lambda d: awake)
+    return data
+
+
+@pytest.mark.parametrize("order16,order32", ORDERS)
+def test_numbers_decode_like_binary_payload_decoder(order16, order32):
+    descriptions = {0: _descr("u16", 0, REGISTER_U16), 1: _descr("s16", 1, REGISTER_S16),
+                    3: _descr("u32", 3, REGISTER_U32), 5: _descr("s32", 5, REGISTER_S32)}
+    rng = random.Random(7)
+    for _ in range(50):
+        registers = [rng.randrange(65536) for _ in range(7)]
+        data = _decode(descriptions, registers, order16, order32)
+
+        def reference(reg):
+            return BinaryPayloadDecoder.fromRegisters(registers[reg:], byteorder=order16, wordorder=order32)
+
+        assert data == {"u16": reference(0).decode_16bit_uint(), "s16": reference(1).decode_16bit_int(),
+                        "u32": reference(3).decode_32bit_uint(), "s32": reference(5).decode_32bit_int()}
+
+
+def test_bytes_words_and_strings():
+    descriptions = {0: {"low": _descr("low", 0, REGISTER_U8L), "high": _descr("high", 0, REGISTER_U8H)},
+                    1: _descr("lsb_msb", 1, REGISTER_ULSB16MSB16),
+                    3: _descr("words", 3, REGISTER_WORDS, wordcount=2),
+                    5: _descr("text", 5, REGISTER_STR, wordcount=2)}
+    registers = [0x1234, 0x0002, 0x0001, 7, 8, 0x4142, 0x4344]
+    assert _decode(descriptions, registers) == {"low": 0x34, "high": 0x12, "lsb_msb": 0x10002, "words": [7, 8],
+                                                "text": "ABCD"}
+    # strings are the raw bytes as sent by the device, whatever the 16 bit byte order of the plugin
+    assert _decode(descriptions, registers, order16=Endian.Little)["text"] == "ABCD"
+
+
+def test_gaps_and_block_offset():
+    descriptions = {0x102: _descr("a", 0x102, REGISTER_U16), 0x105: _descr("b", 0x105, REGISTER_S16)}
+    assert _decode(descriptions, [9, 9, 3, 9, 9, 65535], start=0x100) == {"a": 3, "b": -1}
+
+
+def test_scaling():
+    descriptions = {0: _descr("scaled", 0, REGISTER_U16, scale=0.1),
+                    1: _descr("rounded", 1, REGISTER_U16, scale=0.001, rounding=2),
+                    2: _descr("mode", 2, REGISTER_U16, scale={0: "Off", 1: "On"}),
+                    3: _descr("unknown", 3, REGISTER_U16, scale={0: "Off", 1: "On"}),
+                    4: _descr("function", 4, REGISTER_U16, scale=lambda v, descr, data: f"{descr.key}={v}"),
+                    5: _descr("integer", 5, REGISTER_S16, scale=10)}
+    assert _decode(descriptions, [1234, 1235, 1, 7, 42, 65534]) == \
+           {"scaled": 123.4, "rounded": 1.24, "mode": "On", "unknown": "Unknown", "function": "function=42",
+            "integer": -20}
+
+
+def test_lastawake_values_are_kept_while_asleep():
+    descriptions = {0: _descr("always", 0, REGISTER_U16), 1: _descr("awake", 1, REGISTER_U16,
+                                                                     sleepmode=SLEEPMODE_LASTAWAKE)}
+    assert _decode(descriptions, [1, 2], awake=False) == {"always": 1}
+    assert _decode(descriptions, [1, 2], awake=True) == {"always": 1, "awake": 2}
+
+
+def test_changed_keys():
+    descriptions = {0: _descr("a", 0, REGISTER_U16), 1: _descr("b", 1, REGISTER_U16)}
+    plan = DecodePlan(_block(descriptions), Endian.Big, Endian.Little, False)
+    (data, changed,) = ({"a": 1, "b": 5}, set(),)
+    plan.decode([1, 2], data, lambda d: True, changed)
+    assert changed == {"b"} and (data == {"a": 1, "b": 2})
+
+
+def _plugin_blocks(stub_hub):
+    hub = stub_hub()
+    return [b for b in hub.holdingBlocks + hub.inputBlocks if b.regs]
+
+
+@pytest.mark.skipif(np is None, reason="numpy is not installed")
+def test_vectorized_plans_decode_like_python(stub_hub):
+    rng = random.Random(8)
+    for b in _plugin_blocks(stub_hub):
+        python = DecodePlan(b, Endian.Big, Endian.Little, False)
+        vector = DecodePlan(b, Endian.Big, Endian.Little, True)
+        assert vector.vectorized
+        for _ in range(20):
+            registers = [rng.randrange(65536) for _ in range(b.end - b.start)]
+            (expected, data,) = ({}, {},)
+            python.decode(registers, expected, lambda d: True)
+            vector.decode(registers, data, lambda d: True)
+            assert data == expected, f"block 0x{b.start:x}"
+            assert [type(data[key]) for key in data] == [type(expected[key]) for key in data]
+
+
+@pytest.mark.skipif(np is None, reason="numpy is not installed")
+def test_vectorized_rounding_of_halves():
+    # 0.1 * 5 and 0.01 * 125 lie next to a rounding boundary, numpy alone rounds them half to even
+    descriptions = {reg: _descr(f"r{reg}", reg, REGISTER_U16, scale=scale, rounding=rounding)
+                    for (reg, (scale, rounding,),) in enumerate([(0.1, 0), (0.01, 1), (0.05, 1), (0.001, 2), (0.1, 1)])}
+    registers = [5, 125, 5, 125, 25]
+    python = _decode(descriptions, registers)
+    vector = {}
+    DecodePlan(_block(descriptions), Endian.Big, Endian.Little, True).decode(registers, vector, lambda d: True)
+    assert vector == python
+
+
+def test_plans_without_numpy(monkeypatch):
+    monkeypatch.setattr(decode, "np", None)
+    descriptions = {reg: _descr(f"r{reg}", reg, REGISTER_U16, scale=0.1) for reg in range(decode.VECTORIZE_MIN)}
+    plan = DecodePlan(_block(descriptions), Endian.Big, Endian.Little, True)
+    assert not plan.vectorized
+    data = {}
+    plan.decode(list(range(decode.VECTORIZE_MIN)), data, lambda d: True)
+    assert data["r3"] == 0.3
+
+
+@pytest.mark.skipif(np is None, reason="numpy is not installed")
+def test_vectorize_only_large_blocks():
+    small = {reg: _descr(f"r{reg}", reg, REGISTER_U16, scale=0.1) for reg in range(decode.VECTORIZE_MIN - 1)}
+    large = {reg: _descr(f"r{reg}", reg, REGISTER_U16, scale=0.1) for reg in range(decode.VECTORIZE_MIN)}
+    assert not DecodePlan(_block(small), Endian.Big, Endian.Little).vectorized
+    assert DecodePlan(_block(large), Endian.Big, Endian.Little).vectorized
@@ -0,0 +1,82 @@
+"""Cycle events: delivery on worker threads, merging per policy, hub and kind."""
+import threading
+
+from ha.dispatch import CallbackDispatcher, CycleEvent, COALESCE, DROP, EVENT_CYCLE, EVENT_LANE, EVENT_WRITE
+
+
+def _event(cycle, delta, hub="hub_a", kind=EVENT_CYCLE):
+    return CycleEvent(cycle, float(cycle), frozenset(delta), hub=hub, kind=kind, seq=cycle)
+
+
+def _blocked(dispatcher, policy=COALESCE, **kwargs):
+    """Subscribe a consumer that blocks in its first event until released."""
+    (events, release,) = ([], threading.Event(),)
+
+    def consume(event):
+        events.append(event)
+        release.wait(5)
+
+    dispatcher.subscribe(consume, policy=policy, **kwargs)
+    return (events, release,)
+
+
+def test_late_consumer_gets_the_merged_delta():
+    dispatcher = CallbackDispatcher()
+    (events, release,) = _blocked(dispatcher)
+    for (cycle, delta,) in enumerate(({'a'}, {'b'}, {'c'},), 1): dispatcher.dispatch(_event(cycle, delta))
+    release.set()
+    dispatcher.close()
+    assert [(event.cycle, event.delta, event.cycles,) for event in events] == [(1, {'a'}, 1,), (3, {'b', 'c'}, 2,)]
+
+
+def test_drop_policy_delivers_the_latest_event():
+    dispatcher = CallbackDispatcher()
+    (events, release,) = _blocked(dispatcher, policy=DROP)
+    for cycle in (1, 2, 3, 4,): dispatcher.dispatch(_event(cycle, {'a'}))
+    release.set()
+    dispatcher.close()
+    assert [(event.cycle, event.dropped,) for event in events] == [(1, 0,), (4, 2,)]
+
+
+def test_events_of_other_hubs_and_kinds_are_not_merged():
+    dispatcher = CallbackDispatcher()
+    (events, release,) = _blocked(dispatcher)
+    dispatcher.dispatch(_event(1, {'a'}))
+    dispatcher.dispatch(_event(2, {'b'}, kind=EVENT_LANE))
+    dispatcher.dispatch(_event(3, {'c'}, hub="hub_b"))
+    dispatcher.dispatch(_event(4, {'d'}, kind=EVENT_LANE))
+    release.set()
+    dispatcher.close()
+    assert [(event.hub, event.kind, event.delta,) for event in events] == \
+        [("hub_a", EVENT_CYCLE, {'a'},), ("hub_a", EVENT_LANE, {'b', 'd'},), ("hub_b", EVENT_CYCLE, {'c'},)]
+
+
+def test_subscription_filters():
+    dispatcher = CallbackDispatcher()
+    (cycles, keyed,) = ([], [],)
+    dispatcher.subscribe(cycles.append, hub="hub_a", kinds=[EVENT_CYCLE])
+    dispatcher.subscribe(keyed.append, keys=['b'])
+    for event in (_event(1, {'a'}), _event(2, {'b'}, kind=EVENT_WRITE), _event(3, {'b'}, hub="hub_b"),):
+        dispatcher.dispatch(event)
+    dispatcher.close()
+    assert [event.seq for event in cycles] == [1]
+    assert sorted(event.seq for event in keyed) == [2, 3]
+
+
+def test_lane_and_write_events_have_their_own_seq(stub_hub):
+    hub = stub_hub()
+    dispatcher = CallbackDispatcher(max_workers=1)
+    events = []
+    dispatcher.subscribe(events.append, policy=DROP, hub=hub.name)
+    hub.use_dispatcher(dispatcher)
+    hub._sensors.append(lambda: None)
+    hub.add_fast_lane("control", ["measured_power"])
+    hub.async_refresh_modbus_data()
+    hub._client.image.update({0x46: 5, 0x47: 0})
+    hub.refresh_fast_lane("control")
+    hub.write_register(hub._modbus_addr, 0x24, 20)  # battery_charge_max_current
+    dispatcher.close()
+    assert [event.kind for event in events] == [EVENT_CYCLE, EVENT_LANE, EVENT_WRITE]
+    assert [event.seq for event in events] == [1, 2, 3]
+    assert len({event.cycle for event in events}) == 1  # lane and write events carry the last full cycle
+    assert events[1].delta >= {'measured_power'} and events[2].delta >= {'battery_charge_max_current'}
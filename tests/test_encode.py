@@ -0,0 +1,72 @@
+"""Register encoders: the same registers as BinaryPayloadBuilder, in every byte and word order."""
+import itertools
+
+import pytest
+from pymodbus.payload import BinaryPayloadBuilder, Endian
+
+from ha.const import REGISTER_U16, REGISTER_S16, REGISTER_U32, REGISTER_S32, REGISTER_STR, REGISTER_WORDS
+from ha.encode import EncoderRegistry
+
+ORDERS = list(itertools.product([Endian.Big, Endian.Little], repeat=2))
+VALUES = [(REGISTER_U16, [0, 1, 0x1234, 0xffff], 'add_16bit_uint',),
+          (REGISTER_S16, [-32768, -2, 0, 0x1234], 'add_16bit_int',),
+          (REGISTER_U32, [0, 0x12345678, 0xffffffff], 'add_32bit_uint',),
+          (REGISTER_S32, [-2 ** 31, -2500, 0x12345678], 'add_32bit_int',)]
+
+
+def _built(order16, order32, method, value):
+    builder = BinaryPayloadBuilder(byteorder=order16, wordorder=order32)
+    getattr(builder, method)(value)
+    return builder.to_registers()
+
+
+@pytest.mark.parametrize("order16, order32", ORDERS)
+def test_numbers_match_the_payload_builder(order16, order32):
+    encoders = EncoderRegistry(order16, order32)
+    for (unit, values, method,) in VALUES:
+        encoder = encoders.get(unit)
+        for value in values:
+            registers = encoder(value)
+            assert registers == _built(order16, order32, method, value), (unit, value,)
+            assert encoder.decode(registers) == value
+
+
+@pytest.mark.parametrize("order16, order32", ORDERS)
+def test_strings_and_words_round_trip(order16, order32):
+    encoders = EncoderRegistry(order16, order32)
+    registers = encoders.encode(REGISTER_STR, "H34", 3)
+    assert registers == [0x4833, 0x3400, 0]  # raw ascii padded with zero bytes, whatever the order
+    assert encoders.get(REGISTER_STR, 3).decode(registers) == "H34\0\0\0"
+    words = encoders.encode(REGISTER_WORDS, [1, 0x1234], 2)
+    assert len(words) == 2 and (encoders.get(REGISTER_WORDS, 2).decode(words) == [1, 0x1234])
+
+
+def test_encode16_picks_the_sign():
+    encoders = EncoderRegistry(Endian.Big, Endian.Little)
+    assert encoders.encode16(-1) == [0xffff]
+    assert encoders.encode16(0xffff) == [0xffff]
+    assert encoders.encode16(300) == [300]
+
+
+def test_encoders_are_compiled_once():
+    encoders = EncoderRegistry(Endian.Big, Endian.Little)
+    assert encoders.get(REGISTER_U32) is encoders.get(REGISTER_U32)
+    assert encoders.get(REGISTER_STR, 2) is not encoders.get(REGISTER_STR, 3)
+    with pytest.raises(ValueError):
+        encoders.get("float")
+
+
+def test_encode_all_concatenates():
+    encoders = EncoderRegistry(Endian.Big, Endian.Little)
+    payload = [(REGISTER_S32, -2500,), (REGISTER_U16, 1,), (REGISTER_STR, "ab", 2,)]
+    assert encoders.encode_all(payload) == (encoders.encode(REGISTER_S32, -2500) + [1] + [0x6162, 0])
+    assert encoders.encode_all([]) == []
+
+
+def test_hub_sends_the_encoded_registers(stub_hub):
+    hub = stub_hub()
+    client = hub._transport.client
+    hub.write_registers_multi(hub._modbus_addr, 0x40, [(REGISTER_S32, -2500,), (REGISTER_U16, 7,)])
+    hub.write_registers_single(hub._modbus_addr, 0x42, -3)
+    assert client.requests[-2:] == [('write', 0x40, hub.encoders.encode(REGISTER_S32, -2500) + [7],),
+                                    ('write', 0x42, [0xfffd],)]
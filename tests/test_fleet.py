@@ -0,0 +1,53 @@
+"""Fleet decoding: hubs of one inverter type polled together decode to the same data as hubs polled alone."""
+import random
+
+from ha.decode import DecodePlan
+from ha.fleet import FleetDecoder
+
+
+def _hubs(stub_hub, seed, **kwargs):
+    """hub_a and hub_b with register images that differ from each other, and a listener so that they are polled."""
+    rng = random.Random(seed)
+    hubs = [stub_hub(name, **kwargs) for name in ("hub_a", "hub_b",)]
+    for hub in hubs:
+        hub._transport.client.image.update({address: rng.randrange(65536) for address in range(0x10, 0x9c)})
+        hub.async_add_solax_modbus_sensor(lambda: None)
+    return hubs
+
+
+def test_fleet_decodes_like_hubs_alone(stub_hub):
+    fleet_hubs = _hubs(stub_hub, 1)
+    alone = _hubs(stub_hub, 1)
+    fleet = FleetDecoder(fleet_hubs)
+    fleet.refresh()
+    for hub in alone: assert hub.read_modbus_data()
+    for (hub, reference,) in zip(fleet_hubs, alone):
+        assert hub.data and (hub.data == reference.data)
+    assert fleet_hubs[0].data != fleet_hubs[1].data
+    # one plan per block layout, shared by both hubs
+    assert len(fleet._plans) == len([b for b in fleet_hubs[0].holdingBlocks + fleet_hubs[0].inputBlocks if b.regs])
+
+
+def test_fleet_leaves_bisection_to_the_hubs(stub_hub):
+    refused = {'input': [0x103]}
+    fleet_hubs = _hubs(stub_hub, 2, refused=refused)
+    alone = _hubs(stub_hub, 2, refused=refused)
+    FleetDecoder(fleet_hubs).refresh()
+    for hub in alone: assert hub.read_modbus_data()
+    for (hub, reference,) in zip(fleet_hubs, alone):
+        assert hub._transport.client.requests == reference._transport.client.requests  # the same bisection reads
+        assert hub.data and (hub.data == reference.data)
+
+
+def test_fleet_skips_unchanged_blocks(stub_hub, monkeypatch):
+    hubs = _hubs(stub_hub, 3)
+    fleet = FleetDecoder(hubs)
+    fleet.refresh()
+    stored = []
+    store = DecodePlan.store
+    monkeypatch.setattr(DecodePlan, "store", lambda plan, *args: stored.append(plan.start) or store(plan, *args))
+    before = hubs[0].data["measured_power"]
+    hubs[0]._transport.client.image[0x46] ^= 0xff  # measured_power, read in the fast input block only
+    fleet.refresh()
+    assert hubs[0].data["measured_power"] != before
+    assert stored == [0xa]  # the one block that changed, of one hub
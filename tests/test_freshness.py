@@ -0,0 +1,41 @@
+"""Freshness: every key knows when its value was read, also when decoding was skipped because nothing changed."""
+import time
+
+import pytest
+
+
+def test_capture_times_follow_the_poll_tiers(stub_hub):
+    hub = stub_hub()
+    before = time.monotonic()
+    assert hub.read_modbus_data()
+    first = {key: hub.capture_time(key) for key in ("measured_power", "battery_charge_max_current", "seriesnumber",)}
+    assert all(before <= t[0] <= time.monotonic() for t in first.values())
+    assert hub.read_modbus_data()  # unchanged registers, nothing is decoded
+    assert hub.capture_time("measured_power")[0] > first["measured_power"][0]  # fast tier, read again
+    assert hub.capture_time("battery_charge_max_current") == first["battery_charge_max_current"]  # slow tier
+    assert hub.capture_time("seriesnumber") == first["seriesnumber"]  # read once
+
+
+def test_value_age(stub_hub):
+    hub = stub_hub()
+    assert hub.value_age("measured_power") is None
+    assert hub.read_modbus_data()
+    captured = hub.capture_time("measured_power")[0]
+    assert hub.value_age("measured_power", now=captured + 2.5) == pytest.approx(2.5)
+    assert hub.value_age("no_such_key") is None
+
+
+def test_computed_values_are_as_old_as_their_oldest_input(stub_hub):
+    hub = stub_hub()
+    assert hub.read_modbus_data()
+    assert hub.capture_time("grid_export") == hub.capture_time("measured_power")
+    times = [hub.capture_time(key) for key in hub.computed_graph().inputs["house_load"]]
+    assert hub.capture_time("house_load") == min(t for t in times if t is not None)  # inputs that were read
+
+
+def test_written_values_are_fresh(stub_hub):
+    hub = stub_hub()
+    assert hub.read_modbus_data()
+    read = hub.capture_time("battery_charge_max_current")
+    hub.write_register(hub._modbus_addr, 0x24, 203)
+    assert hub.capture_time("battery_charge_max_current")[0] > read[0]
@@ -0,0 +1,86 @@
+"""Self healing block plans: registers the device rejects are located by bisection and routed around."""
+from ha.holes import HoleRegistry, hole_prefix
+from ha.planner import register_width
+
+from conftest import SERIAL
+
+
+def _planned(hub, typ):
+    blocks = hub.holdingBlocks if typ == 'holding' else hub.inputBlocks
+    return {reg for block in blocks for reg in block.regs}
+
+
+def _covering(regs, start, end):
+    return {reg for (reg, descr,) in regs.items() if (reg < end) and (start < reg + register_width(descr))}
+
+
+def test_refused_register_in_an_unused_gap(stub_hub):
+    hub = stub_hub(refused={'holding': {0x92}})
+    before = _planned(hub, 'holding')
+    assert not _covering(hub.holdingRegs, 0x92, 0x93)  # no entity uses 0x92, the refusal hides in a gap
+    assert hub.read_modbus_data()
+    assert hub.holes.get(hole_prefix(SERIAL), 'holding') == [(0x92, 0x93,)]
+    assert _planned(hub, 'holding') == before
+    requests = len(hub._client.requests)
+    assert hub.read_modbus_data()
+    assert not any(address <= 0x92 < address + count for (typ, address, count,) in hub._client.requests[requests:]
+                   if typ == 'holding')
+
+
+def test_refused_register_of_an_entity(stub_hub):
+    hub = stub_hub(refused={'holding': {0x90}})  # in the slow tier block, and in a gap of the once block
+    before = _planned(hub, 'holding')
+    assert _covering(hub.holdingRegs, 0x90, 0x91) == {0x90}
+    hub.read_modbus_data()
+    assert hub.holes.get(hole_prefix(SERIAL), 'holding') == [(0x90, 0x91,)]
+    assert _planned(hub, 'holding') == before - {0x90}
+    assert hub.read_modbus_data()
+
+
+def test_adjacent_refused_registers_are_merged(stub_hub):
+    hub = stub_hub(refused={'holding': {0xa2, 0xa3, 0xa4}})
+    assert not _covering(hub.holdingRegs, 0xa2, 0xa5)
+    hub.read_modbus_data()
+    assert hub.holes.get(hole_prefix(SERIAL), 'holding') == [(0xa2, 0xa5,)]
+
+
+def test_nothing_learned_when_all_parts_are_readable(stub_hub):
+    hub = stub_hub()
+    block = next(b for b in hub.holdingBlocks if len(b.regs) > 4)
+    (read, rejects,) = (hub._client._read, [block.start],)
+
+    def reject_whole_block(typ, response, address, count):  # e.g. a device that limits the request length
+        if (typ == 'holding') and (address, address + count,) == (block.start, block.end,) and rejects:
+            hub._client.refused = {'holding': {rejects.pop()}}
+        result = read(typ, response, address, count)
+        hub._client.refused = {}
+        return result
+
+    hub._client._read = reject_whole_block
+    hub.read_modbus_data()
+    assert hub.holes.get(hole_prefix(SERIAL), 'holding') == []
+
+
+def test_holes_of_an_unknown_serial_are_not_recorded(stub_hub):
+    hub = stub_hub(refused={'holding': {0x90}})
+    hub.seriesnumber = "unknown"
+    hub.read_modbus_data()
+    assert hub.holes._holes == {}
+
+
+def test_holes_are_stored_per_serial_prefix(tmp_path):
+    path = str(tmp_path / "config" / "holes.json")  # the config dir is created with the first hole
+    HoleRegistry(path).add(hole_prefix(SERIAL), 'input', 0x10, 0x12)
+    registry = HoleRegistry(path)
+    assert registry.get(hole_prefix(SERIAL), 'input') == [(0x10, 0x12,)]
+    assert registry.get(hole_prefix("H34B10I7654321"), 'input') == []
+
+
+def test_learned_holes_are_planned_around_after_a_restart(stub_hub):
+    hub = stub_hub(refused={'holding': {0x92}})
+    hub.read_modbus_data()
+    assert HoleRegistry(hub.holes.path).get(hole_prefix(SERIAL), 'holding') == [(0x92, 0x93,)]
+    restarted = stub_hub(refused={'holding': {0x92}})
+    assert restarted.read_modbus_data()
+    assert not any(address <= 0x92 < address + count for (typ, address, count,) in restarted._client.requests
+                   if typ == 'holding')
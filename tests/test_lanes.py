@@ -0,0 +1,50 @@
+"""Fast lanes: a small block plan for a few keys, read in between the full cycles."""
+from conftest import register_value
+
+LANE_REGISTERS = range(0x46, 0x48)  # input registers of measured_power
+REFUSED = 0x103  # unused input register in the last input block, the full cycle bisects that block
+
+
+def _hub(stub_hub):
+    hub = stub_hub(refused={'input': {REFUSED}})
+    hub.seriesnumber = "unknown"  # holes are not recorded, every full cycle bisects the last block
+    hub._sensors.append(lambda: None)
+    return hub
+
+
+def test_lane_reads_only_its_blocks(stub_hub):
+    hub = _hub(stub_hub)
+    lane = hub.add_fast_lane("control", ["measured_power"])
+    assert [(typ, block.start, block.end,) for (typ, block,) in lane.requests] == [('input', 0x46, 0x48,)]
+    hub.async_refresh_modbus_data()
+    hub._client.image.update({address: 5 for address in LANE_REGISTERS})
+    assert hub.refresh_fast_lane("control")
+    assert hub.snapshot['measured_power'] == hub.data['measured_power'] != 0
+    assert hub._client.requests[-1] == ('input', 0x46, 2,)
+
+
+def test_lane_does_not_publish_a_half_decoded_full_cycle(stub_hub):
+    hub = _hub(stub_hub)
+    hub.add_fast_lane("control", ["measured_power"])
+    hub.async_refresh_modbus_data()
+    before = dict(hub.snapshot)
+    hub._client.image.update({address: (register_value(address) + 1) % 65536 for address in range(7, 0x300)})
+    cycle = hub._modbus_cycle()
+    requests = next(cycle)
+    bisect = cycle.send(hub._read_requests(requests))  # the other blocks are decoded, the last one is bisected
+    assert bisect and hub.cycle_running
+    hub._client.image.update({address: 5 for address in LANE_REGISTERS})
+    assert hub.refresh_fast_lane("control")
+    assert hub.snapshot['measured_power'] == hub.data['measured_power'] != before['measured_power']
+    decoded = [key for key in before if (key != 'measured_power') and (hub.data.get(key) != before[key])]
+    assert {'grid_export', 'house_load', 'battery_power_charge'} <= set(decoded)
+    # new values of the running full cycle, and computed values that mix them with the lane values,
+    # are not published by the lane
+    assert all(hub.snapshot[key] == before[key] for key in decoded)
+    try:
+        while True: bisect = cycle.send(hub._read_requests(bisect))
+    except StopIteration:
+        pass
+    assert not hub.cycle_running
+    hub._end_refresh(True)
+    assert all(hub.snapshot[key] == hub.data[key] for key in decoded)
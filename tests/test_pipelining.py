@@ -0,0 +1,90 @@
+"""Pipelined block reads on Modbus TCP, against a local server behind a proxy that adds latency."""
+import asyncio
+import time
+
+import main
+from ha import AsyncSolaXModbusHub
+
+from conftest import SERIAL, register_value
+
+RTT = 0.1  # round trip time added by the proxy, large against the local server's response time
+
+
+async def _hub(name, port, pipeline_window):
+    hub = AsyncSolaXModbusHub(name, interface="tcp", host="127.0.0.1", port=port, holes_file=None,
+                              pipeline_window=pipeline_window)
+    await hub.async_setup()
+    main.setup_entry(hub)
+    return hub
+
+
+async def _read_cycle(hub):
+    """Requests and responses of the block reads of one poll cycle, the cycle is not decoded."""
+    cycle = hub._modbus_cycle()
+    requests = next(cycle)
+    try:
+        return (requests, await hub._read_requests(requests),)
+    finally:
+        cycle.close()
+
+
+async def _timed_cycle(hub):
+    start = time.perf_counter()
+    assert await hub.read_modbus_data()
+    return time.perf_counter() - start
+
+
+def test_pipelined_cycle_takes_one_round_trip(make_proxy, plugin):
+    proxy = make_proxy(delay=RTT)
+
+    async def run():
+        (pipelined, sequential,) = (await _hub("hub_a", proxy.port, 16), await _hub("hub_b", proxy.port, 1),)
+        try:
+            blocks = len(pipelined.holdingBlocks) + len(pipelined.inputBlocks)
+            assert 2 < blocks <= pipelined.pipeline_window
+            return (blocks, await _timed_cycle(pipelined), await _timed_cycle(sequential),)
+        finally:
+            await pipelined.close()
+            await sequential.close()
+
+    (blocks, pipelined, sequential,) = asyncio.run(run())
+    assert RTT <= pipelined < 2 * RTT
+    assert sequential >= blocks * RTT
+
+
+def test_responses_match_their_blocks(make_proxy, plugin):
+    proxy = make_proxy(delay=RTT, jitter=RTT)  # responses come back out of order
+
+    async def run():
+        hub = await _hub("hub_a", proxy.port, 8)
+        try:
+            assert hub.seriesnumber == SERIAL
+            return await _read_cycle(hub)
+        finally:
+            await hub.close()
+
+    (requests, responses,) = asyncio.run(run())
+    assert len(requests) > 2
+    for ((typ, block,), response,) in zip(requests, responses):
+        assert response.registers == [register_value(address) for address in range(block.start, block.end)], \
+            f"{typ} block 0x{block.start:x}"
+
+
+def test_fallback_when_the_gateway_drops_pipelined_requests(make_proxy, plugin):
+    proxy = make_proxy(delay=RTT, single=True)  # requests sent during a round trip are dropped
+
+    async def run():
+        hub = await _hub("hub_a", proxy.port, 8)
+        try:
+            assert hub._transport.pipelining
+            (requests, responses,) = await _read_cycle(hub)
+            assert proxy.dropped and not hub._transport.pipelining
+            for ((typ, block,), response,) in zip(requests, responses):
+                assert response.registers == [register_value(address) for address in range(block.start, block.end)]
+            dropped = proxy.dropped
+            assert await hub.read_modbus_data()
+            assert proxy.dropped == dropped  # one request at a time from now on
+        finally:
+            await hub.close()
+
+    asyncio.run(run())
@@ -0,0 +1,70 @@
+"""Cost model block planner: gaps are read when that is cheaper than a transaction, limits and holes are kept."""
+from ha.const import BaseModbusSensorEntityDescription, REGISTER_U16, REGISTER_U32
+from ha.planner import LinkCostModel, MAX_READ_REGISTERS, plan_blocks
+
+SERIAL_9600 = LinkCostModel.for_serial(9600)
+TCP = LinkCostModel.for_tcp()
+
+
+def _descriptions(regs, unit=REGISTER_U16, **kwargs):
+    return {reg: BaseModbusSensorEntityDescription(key=f"reg_{reg}", register=reg, unit=unit, **kwargs)
+            for reg in regs}
+
+
+def _layout(plan):
+    return [(block.start, block.end,) for block in plan.blocks]
+
+
+def test_serial_cost_model():
+    char_time = 10 / 9600
+    assert SERIAL_9600.register_time == 2 * char_time
+    assert SERIAL_9600.transaction_time == 20 * char_time + 0.05
+    # a gap is worth reading as long as it is shorter than one transaction worth of registers
+    assert 30 < SERIAL_9600.transaction_time / SERIAL_9600.register_time < 40
+
+
+def test_gaps_are_read_when_cheaper_than_a_transaction():
+    assert _layout(plan_blocks(_descriptions([0, 20]), 100, SERIAL_9600)) == [(0, 21,)]
+    assert _layout(plan_blocks(_descriptions([0, 60]), 100, SERIAL_9600)) == [(0, 1,), (60, 61,)]
+    assert _layout(plan_blocks(_descriptions([0, 60]), 100, TCP)) == [(0, 61,)]
+
+
+def test_blocks_keep_the_size_limits():
+    plan = plan_blocks(_descriptions(range(0, 300, 2)), 1000, TCP)
+    assert all(block.end - block.start <= MAX_READ_REGISTERS for block in plan.blocks)
+    assert [reg for block in plan.blocks for reg in block.regs] == list(range(0, 300, 2))
+    plan = plan_blocks(_descriptions(range(0, 40, 2)), 16, TCP)
+    assert all(block.end - block.start <= 16 for block in plan.blocks) and (len(plan.blocks) == 3)
+
+
+def test_wide_registers_are_not_split():
+    plan = plan_blocks(_descriptions([0, 2, 4, 6], unit=REGISTER_U32), 5, TCP)
+    assert _layout(plan) == [(0, 4,), (4, 8,)]
+
+
+def test_newblock_starts_a_block():
+    descriptions = _descriptions([0, 1, 2, 3])
+    descriptions[2].newblock = True
+    assert _layout(plan_blocks(descriptions, 100, TCP)) == [(0, 2,), (2, 4,)]
+
+
+def test_holes_are_neither_read_nor_bridged():
+    plan = plan_blocks(_descriptions([0, 1, 5, 9, 10]), 100, TCP, holes=[(5, 6,), (7, 8,)])
+    assert _layout(plan) == [(0, 2,), (9, 11,)]
+    assert [block.regs for block in plan.blocks] == [[0, 1], [9, 10]]
+
+
+def test_plan_is_cheapest_not_greedy():
+    # filling blocks greedily reads [0, 16) and [16, 21), splitting at the gap reads 3 registers less
+    regs = list(range(0, 9)) + list(range(12, 21))
+    model = LinkCostModel(transaction_time=1.0, register_time=0.1)
+    plan = plan_blocks(_descriptions(regs), 16, model)
+    assert _layout(plan) == [(0, 9,), (12, 21,)]
+    assert plan.estimated_time == 2 * model.block_time(9)
+
+
+def test_plan_statistics():
+    plan = plan_blocks(_descriptions([0, 3]), 100, TCP)
+    assert _layout(plan) == [(0, 4,)]
+    assert plan.wasted_fraction == 0.5
+    assert plan.estimated_time == TCP.block_time(4)
@@ -0,0 +1,67 @@
+"""Connection pool: hubs on the same gateway share one transport, released by the last hub."""
+import main
+from ha import SolaXModbusHub
+from ha.transport import POOL
+
+from conftest import SERIAL
+
+
+def _hub(name, port):
+    hub = SolaXModbusHub(name, interface="tcp", host="127.0.0.1", port=port, holes_file=None)
+    main.setup_entry(hub)
+    return hub
+
+
+def test_hubs_share_one_transport(proxy, plugin):
+    (hub_a, hub_b,) = (_hub("hub_a", proxy.port), _hub("hub_b", proxy.port),)
+    try:
+        assert hub_a._transport is hub_b._transport
+        assert hub_a._transport.refcount == 2
+        assert hub_a.read_modbus_data() and hub_b.read_modbus_data()
+        assert hub_a.seriesnumber == hub_b.seriesnumber == SERIAL
+        assert hub_a.data and (hub_a.data == hub_b.data)
+        assert proxy.connections == 1
+    finally:
+        hub_a.close()
+        hub_b.close()
+
+
+def test_release_closes_with_the_last_hub(proxy, plugin):
+    (hub_a, hub_b,) = (_hub("hub_a", proxy.port), _hub("hub_b", proxy.port),)
+    transport = hub_a._transport
+    pooled = len(POOL)
+    hub_a.close()
+    assert transport.refcount == 1 and len(POOL) == pooled
+    assert hub_b.read_modbus_data() and hub_b.data
+    hub_b.close()
+    assert transport.refcount == 0 and len(POOL) == pooled - 1
+    assert not transport.client.is_socket_open()
+    hub_c = _hub("hub_a", proxy.port)
+    try:
+        assert hub_c._transport is not transport
+    finally:
+        hub_c.close()
+
+
+def test_reconnect_after_the_server_dropped_the_socket(proxy, plugin):
+    hub = _hub("hub_a", proxy.port)
+    try:
+        assert hub.read_modbus_data()
+        proxy.drop_connections()
+        for _ in range(3):  # the first request may find the dropped socket, the transport reconnects for the next one
+            if hub.read_modbus_data(): break
+        else:
+            raise AssertionError("no reconnect after the connection was dropped")
+        assert proxy.connections == 2
+        assert hub.seriesnumber == SERIAL
+    finally:
+        hub.close()
+
+
+def test_hub_without_host_uses_the_serial_port(plugin):
+    hub = SolaXModbusHub("hub_a")
+    try:
+        assert hub._transport.key[0] == "serial"
+        assert not hub._transport.is_tcp
+    finally:
+        hub.close()
@@ -0,0 +1,54 @@
+"""Settings profiles: unchanged targets are dropped, the rest goes out in few FC16 requests and is read back once."""
+from pymodbus.register_write_message import WriteSingleRegisterResponse
+
+from ha.profiles import SettingsProfile
+
+WINTER = SettingsProfile("winter", {"manual_mode": "Force Charge", "battery_charge_max_current": 20,
+                                    "battery_discharge_max_current": 20.5, "nonexistent": 1})
+
+
+def _client(hub):
+    return hub._transport.client
+
+
+def test_profile_groups_writes_and_reads_back(stub_hub):
+    hub = stub_hub()
+    assert hub.read_modbus_data()
+    _client(hub).requests.clear()
+    result = hub.apply_profile(WINTER)
+    assert result.written == ["manual_mode", "battery_charge_max_current", "battery_discharge_max_current"]
+    assert result.unknown == ["nonexistent"] and (result.requests == 2)
+    assert _client(hub).requests == [('write', 0x20, [1]), ('write', 0x24, [200, 205]),
+                                     ('holding', 0x20, 1), ('holding', 0x24, 2)]
+    assert (hub.data["manual_mode"], hub.data["battery_discharge_max_current"],) == ("Force Charge", 20.5,)
+
+
+def test_profile_drops_unchanged_values(stub_hub):
+    hub = stub_hub()
+    assert hub.read_modbus_data()
+    hub.apply_profile(WINTER)
+    _client(hub).requests.clear()
+    result = hub.apply_profile(WINTER)
+    assert sorted(result.unchanged) == ["battery_charge_max_current", "battery_discharge_max_current", "manual_mode"]
+    assert not result.requests and not _client(hub).requests
+
+
+def test_profile_reports_values_read_back(stub_hub):
+    hub = stub_hub()
+    assert hub.read_modbus_data()
+    _client(hub).write_register = lambda address, value, slave=1: WriteSingleRegisterResponse(address, value)  # ignored
+    result = hub.apply_profile(SettingsProfile("lost", {"battery_charge_max_current": 20}))
+    assert not result.ok and not result.written
+    assert result.mismatched == {"battery_charge_max_current": 25.2}  # 0x24 * 7 in the test image, scale 0.1
+
+
+def test_profile_wakes_a_sleeping_inverter(stub_hub, plugin, monkeypatch):
+    hub = stub_hub()
+    assert hub.read_modbus_data()
+    monkeypatch.setattr(hub.plugin, "isAwake", lambda data: False)
+    hub.awake_button = plugin.BUTTON_TYPES[0]
+    _client(hub).requests.clear()
+    result = hub.apply_profile(SettingsProfile("night", {"battery_charge_max_current": 30}))
+    assert result.queued == ["battery_charge_max_current"] and not result.requests
+    assert _client(hub).requests == [('write', hub.awake_button.register, [hub.awake_button.command])]
+    assert hub.writequeue
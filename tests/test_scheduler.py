@@ -0,0 +1,71 @@
+"""Poll scheduler: cycles start on a fixed grid, overruns skip or compress slots instead of shifting the grid."""
+import asyncio
+import threading
+
+from ha.scheduler import AsyncPollScheduler, PollScheduler, SKIP, COMPRESS
+
+INTERVAL = 0.05
+
+
+def _slots(scheduler, start, end):
+    """Account for a cycle of the current slot that ran from start to end, returns the next slot."""
+    scheduler._t0 = 0.0
+    scheduler._started(scheduler._deadline(), start)
+    scheduler._finished(start, end)
+    return scheduler._slot
+
+
+def test_overrun_skips_to_the_next_future_slot():
+    scheduler = PollScheduler(lambda: None, 1.0, policy=SKIP)
+    assert _slots(scheduler, 0.0, 0.5) == 1
+    assert _slots(scheduler, 1.0, 3.5) == 4  # slots 2 and 3 have passed
+    assert (scheduler.stats.overruns, scheduler.stats.skipped, scheduler.stats.compressed,) == (1, 2, 0,)
+    assert scheduler.stats.max_duration == 2.5
+
+
+def test_overrun_compresses_into_the_running_slot():
+    scheduler = PollScheduler(lambda: None, 1.0, policy=COMPRESS)
+    assert _slots(scheduler, 0.0, 0.5) == 1
+    assert _slots(scheduler, 1.0, 3.5) == 3  # slot 3 started at 3.0 and runs right away, slot 2 is skipped
+    assert (scheduler.stats.overruns, scheduler.stats.skipped, scheduler.stats.compressed,) == (1, 1, 1,)
+
+
+def test_cycles_start_on_the_grid():
+    starts = []
+    done = threading.Event()
+
+    def cycle():
+        starts.append(scheduler.slot_time)
+        if len(starts) == 2: raise RuntimeError("a failing cycle does not stop the scheduler")
+        if len(starts) >= 5: done.set()
+
+    scheduler = PollScheduler(cycle, INTERVAL, name="test").start()
+    try:
+        assert done.wait(2)
+    finally:
+        scheduler.stop(1)
+    deadlines = [t - starts[0] for t in starts[:5]]
+    assert [round(d / INTERVAL, 6) for d in deadlines] == [0, 1, 2, 3, 4]  # no drift from cycle durations
+    assert scheduler.stats.cycles >= 5
+    assert scheduler.stats.max_jitter < INTERVAL
+
+
+def test_async_scheduler_runs_coroutines_on_the_grid():
+    starts = []
+
+    async def cycle():
+        starts.append(scheduler.slot_time)
+        await asyncio.sleep(INTERVAL / 2)
+
+    scheduler = AsyncPollScheduler(cycle, INTERVAL, name="test")
+
+    async def run():
+        task = asyncio.get_running_loop().create_task(scheduler.run())
+        await asyncio.sleep(INTERVAL * 3.5)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+    asyncio.run(run())
+    assert len(starts) >= 3
+    assert [round((t - starts[0]) / INTERVAL, 6) for t in starts[:3]] == [0, 1, 2]
+    assert scheduler.stats.overruns == 0
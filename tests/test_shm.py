@@ -0,0 +1,66 @@
+"""Shared memory publishing: seqlock reads, a publisher preempted while writing, stale segments."""
+import os
+import time
+from multiprocessing import shared_memory
+
+import pytest
+
+from ha.shm import SharedMemoryPublisher, SharedMemoryReader, _SEQ, _SEQ_OFFSET
+
+
+@pytest.fixture
+def published(stub_hub):
+    hub = stub_hub()
+    assert hub.read_modbus_data()
+    publisher = SharedMemoryPublisher(hub, name=f"sii_test_{os.getpid()}")
+    hub.publishers.append(publisher)
+    hub.publish(force=True)
+    reader = SharedMemoryReader(publisher.name, retries=50)
+    yield (hub, publisher, reader,)
+    reader.close()
+    publisher.close()
+
+
+def _numbers(data):
+    return {key: value for (key, value,) in data.items() if type(value) in (int, float,)}
+
+
+def test_reader_sees_the_published_values(published):
+    (hub, publisher, reader,) = published
+    (cycle, timestamp, values,) = reader.read_all()
+    assert (cycle, timestamp,) == (hub.snapshot.cycle, hub.snapshot.timestamp,)
+    assert values == _numbers(hub.snapshot)
+    key = next(iter(values))
+    assert reader.read(key) == hub.snapshot[key]
+
+
+def test_publisher_preempted_while_writing(published):
+    (hub, publisher, reader,) = published
+    last = reader.read_all()
+    _SEQ.pack_into(publisher.shm.buf, _SEQ_OFFSET, publisher._seq + 1)  # odd: a publish that does not finish
+    start = time.perf_counter()
+    assert reader.read_all() == last
+    assert time.perf_counter() - start < 0.5
+    fresh = SharedMemoryReader(publisher.name, retries=5)
+    try:
+        with pytest.raises(TimeoutError):  # nothing consistent was read yet
+            fresh.read_all()
+    finally:
+        fresh.close()
+
+
+def test_stale_segment_is_replaced(stub_hub):
+    name = f"sii_stale_{os.getpid()}"
+    stale = shared_memory.SharedMemory(name=name, create=True, size=16)  # left behind by a crashed publisher
+    stale.close()
+    hub = stub_hub()
+    publisher = SharedMemoryPublisher(hub, name=name)
+    try:
+        hub.publishers.append(publisher)
+        hub.read_modbus_data()
+        hub.publish(force=True)
+        reader = SharedMemoryReader(name)
+        assert reader.keys == publisher.keys
+        reader.close()
+    finally:
+        publisher.close()
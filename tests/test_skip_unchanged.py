@@ -0,0 +1,57 @@
+"""Blocks whose raw registers did not change since their last decode are not decoded again."""
+from ha.const import POLL_TIER_SLOW
+
+from conftest import register_value
+
+
+def _decoded(hub):
+    return [(typ, block.start,) for (typ, block,) in hub.changed_blocks]
+
+
+def _lastawake(hub):
+    """Blocks that are decoded every time they are read, their values depend on the awake state."""
+    return {('holding', b.start,) for b in hub.holdingBlocks if hub.decode_plan(b).lastawake} | \
+           {('input', b.start,) for b in hub.inputBlocks if hub.decode_plan(b).lastawake}
+
+
+def test_unchanged_blocks_are_skipped(stub_hub):
+    hub = stub_hub()
+    assert hub.read_modbus_data()
+    assert hub.read_modbus_data()
+    assert set(_decoded(hub)) <= _lastawake(hub)
+    assert not hub.changed
+
+
+def test_changed_block_is_decoded_again(stub_hub):
+    hub = stub_hub()
+    assert hub.read_modbus_data()
+    before = hub.data["measured_power"]
+    hub._transport.client.image[0x46] = register_value(0x46) ^ 0xff  # measured_power, in the fast input block at 0xa
+    assert hub.read_modbus_data()
+    assert set(_decoded(hub)) - _lastawake(hub) == {('input', 0xa,)}
+    assert hub.data["measured_power"] != before
+    assert "measured_power" in hub.changed
+
+
+def test_every_block_is_decoded_without_skipping(stub_hub):
+    hub = stub_hub()
+    hub.skip_unchanged = False
+    assert hub.read_modbus_data()
+    assert hub.read_modbus_data()
+    every_cycle = {('holding', b.start,) for b in hub.holdingBlocks if hub.tier_intervals[b.tier] == 1} | \
+                  {('input', b.start,) for b in hub.inputBlocks if hub.tier_intervals[b.tier] == 1}
+    assert set(_decoded(hub)) == every_cycle
+
+
+def test_written_registers_keep_the_image_coherent(stub_hub):
+    hub = stub_hub()
+    assert hub.read_modbus_data()
+    key = hub.holdingRegs[0x9e].key  # in the slow holding block at 0x8b, written by phase_power_balance_x3
+    hub.write_register(hub._modbus_addr, 0x9e, 0x0102)
+    written = hub.data[key]
+    # the inverter went back to the value of the last read, which must not be skipped as unchanged
+    hub._transport.client.image[0x9e] = register_value(0x9e)
+    for _ in range(hub.tier_intervals[POLL_TIER_SLOW]): assert hub.read_modbus_data()
+    reference = stub_hub("hub_b")
+    assert reference.read_modbus_data()
+    assert hub.data[key] == reference.data[key] != written
@@ -0,0 +1,53 @@
+"""Sleep mode: a silent inverter is probed with one short read, at exponentially growing intervals."""
+from ha.const import SLEEP_AWAKE, SLEEP_SILENT
+
+
+def _hub(stub_hub):
+    hub = stub_hub()
+    hub.async_add_solax_modbus_sensor(lambda: None)
+    hub.async_refresh_modbus_data()
+    assert hub.sleep_state == SLEEP_AWAKE
+    return hub
+
+
+def _cycle(hub):
+    """Requests of one refresh."""
+    client = hub._transport.client
+    client.requests.clear()
+    hub.async_refresh_modbus_data()
+    return list(client.requests)
+
+
+def test_silent_inverter_is_probed_with_backoff(stub_hub):
+    hub = _hub(stub_hub)
+    hub._transport.client.offline = True
+    assert len(_cycle(hub)) == 1  # the first block gets no answer, the others are not sent
+    assert hub.sleep_state == SLEEP_SILENT
+    probes = [len(_cycle(hub)) for _ in range(2 + 4 + 8 + 16 + 32 + 32)]
+    probed = [i + 1 for (i, n,) in enumerate(probes) if n]
+    assert probed == [2, 6, 14, 30, 62, 94]  # every sleep_backoff cycles, doubling up to sleep_backoff_max
+    assert set(probes) == {0, 1}  # one single register read per probe
+
+
+def test_probe_answer_resumes_polling_in_the_same_cycle(stub_hub):
+    hub = _hub(stub_hub)
+    full = len(_cycle(hub))
+    client = hub._transport.client
+    client.offline = True
+    _cycle(hub)
+    _cycle(hub)
+    client.offline = False
+    requests = _cycle(hub)
+    assert requests[0][2] == 1 and (len(requests) == 1 + full)  # the probe, then all blocks that are due
+    assert hub.sleep_state == SLEEP_AWAKE
+    assert len(_cycle(hub)) == full
+
+
+def test_sleeping_values_are_rewritten(stub_hub):
+    hub = _hub(stub_hub)
+    assert hub.sleepzero and hub.sleepnone
+    hub._transport.client.offline = True
+    _cycle(hub)
+    assert all(hub.data[key] == 0 for key in hub.sleepzero)
+    assert not any(key in hub.data for key in hub.sleepnone)
+    assert all(hub.snapshot[key] == 0 for key in hub.sleepzero)
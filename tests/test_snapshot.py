@@ -0,0 +1,66 @@
+"""Snapshots: readers see the data of the last complete cycle, never a cycle in progress."""
+import threading
+import time
+
+from conftest import register_value
+
+
+def _hub(stub_hub):
+    hub = stub_hub()
+    hub.async_add_solax_modbus_sensor(lambda: None)
+    hub.async_refresh_modbus_data()
+    return hub
+
+
+def test_snapshot_is_published_at_the_end_of_the_cycle(stub_hub):
+    hub = _hub(stub_hub)
+    snapshot = hub.snapshot
+    power = snapshot["measured_power"]
+    assert snapshot.cycle == hub.cyclecount and (dict(snapshot) == dict(hub.data))
+    hub._transport.client.image[0x46] = register_value(0x46) + 5  # measured_power
+    cycle = hub._modbus_cycle()
+    responses = hub._read_requests(next(cycle))
+    try:
+        cycle.send(responses)
+    except StopIteration:
+        pass
+    assert hub.data["measured_power"] == power + 5  # decoded into the back buffer
+    assert hub.snapshot is snapshot  # not published yet
+    hub._end_refresh(True)
+    assert hub.snapshot["measured_power"] == power + 5
+    assert snapshot["measured_power"] == power  # earlier snapshots do not change
+
+
+def test_unchanged_cycles_share_the_data(stub_hub):
+    hub = _hub(stub_hub)
+    first = hub.snapshot
+    hub.async_refresh_modbus_data()
+    assert hub.snapshot is not first and (hub.snapshot.cycle == first.cycle + 1)
+    assert hub.snapshot.store is first.store
+
+
+def test_readers_never_see_a_partial_cycle(stub_hub):
+    """grid_export is computed from measured_power after the blocks are decoded, a reader of hub.data could see
+    a new measured_power next to the grid_export of the cycle before. A snapshot always has both from one cycle."""
+    hub = _hub(stub_hub)
+    low = register_value(0x46)  # measured_power, positive in the test image so grid_export equals it
+    stop = threading.Event()
+    seen = []
+
+    def reader():
+        while not stop.is_set():
+            snapshot = hub.snapshot
+            seen.append((snapshot["measured_power"], snapshot["grid_export"],))
+
+    thread = threading.Thread(target=reader)
+    thread.start()
+    try:
+        for i in range(1, 50):
+            hub._transport.client.image[0x46] = low + i
+            hub.async_refresh_modbus_data()
+            time.sleep(0.001)  # let the reader run between the cycles too
+    finally:
+        stop.set()
+        thread.join()
+    assert len({power for (power, export,) in seen}) > 1
+    assert all(power == export for (power, export,) in seen)
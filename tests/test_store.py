@@ -0,0 +1,66 @@
+"""Array backed value store: behaves like the dict it replaces, numbers live in one array of doubles."""
+import pytest
+
+from ha.store import ValueStore, FrozenValueStore
+
+
+def test_store_behaves_like_a_dict():
+    store = ValueStore(["a", "b"])
+    reference = {}
+    for (key, value,) in [("a", 1), ("b", 2.5), ("c", "text"), ("d", [1, 2]), ("e", None), ("big", 2 ** 60),
+                          ("a", -3), ("c", 4.0)]:
+        store[key] = reference[key] = value
+    del store["b"]
+    del reference["b"]
+    assert dict(store) == reference and (len(store) == len(reference))
+    assert [type(store[key]) for key in reference] == [type(value) for value in reference.values()]
+    assert ("b" not in store) and ("a" in store) and (store.get("b") is None)
+    with pytest.raises(KeyError):
+        store["b"]
+    with pytest.raises(KeyError):
+        del store["b"]
+    assert store.pop("e") is None and ("e" not in store)
+
+
+def test_assign_reports_changes():
+    store = ValueStore()
+    assert store.assign("a", 1)
+    assert not store.assign("a", 1)
+    assert store.assign("a", 1.5)
+    assert store.assign("a", "on") and not store.assign("a", "on")
+    assert store.assign("a", 2)
+
+
+def test_slots_are_reserved_in_order():
+    store = ValueStore(["x", "y"])
+    store["z"] = 1
+    store.reserve(["y", "w"])
+    assert store.slot_keys() == ["x", "y", "z", "w"]
+    assert len(store) == 1 and (list(store) == ["z"])
+    store["y"] = 7.5
+    assert store.values_array[store.slot("y")] == 7.5
+
+
+def test_frozen_copies_do_not_change():
+    store = ValueStore(["a"])
+    store.update({"a": 1, "b": "x"})
+    frozen = store.freeze()
+    assert isinstance(frozen, FrozenValueStore)
+    store.update({"a": 2, "b": "y", "c": 3})
+    del store["a"]
+    assert dict(frozen) == {"a": 1, "b": "x"}
+    assert "c" not in frozen
+    with pytest.raises(TypeError):
+        frozen["a"] = 5
+
+
+def test_freeze_some_keys_onto_an_earlier_copy():
+    store = ValueStore()
+    store.update({"a": 1, "b": 2, "c": "x"})
+    base = store.freeze()
+    store.update({"a": 10, "b": 20, "c": "y", "d": 4})
+    del store["b"]
+    partial = store.freeze(["b", "c", "d"], base)
+    assert dict(partial) == {"a": 1, "c": "y", "d": 4}
+    assert len(partial) == 3
+    assert dict(base) == {"a": 1, "b": 2, "c": "x"}
@@ -0,0 +1,75 @@
+"""Poll tiers: blocks per tier, how often they are read, and how learned holes apply to all tiers."""
+from ha.const import BaseModbusSensorEntityDescription, REGISTER_U16, POLL_TIER_FAST, POLL_TIER_NORMAL, \
+    POLL_TIER_SLOW, POLL_TIER_ONCE, DEFAULT_POLL_TIER_INTERVALS
+from ha.holes import hole_prefix
+from ha.planner import plan_tiers
+from ha.transport import PRIORITY_FAST, PRIORITY_BACKGROUND
+
+from conftest import SERIAL
+
+
+def _descriptions(tiers):
+    """{register: description} for a {register: poll tier} layout of 16 bit registers."""
+    return {reg: BaseModbusSensorEntityDescription(key=f"reg_{reg}", register=reg, unit=REGISTER_U16, poll_tier=tier)
+            for (reg, tier,) in sorted(tiers.items())}
+
+
+def _tiers(plan):
+    return {reg: block.tier for block in plan.blocks for reg in block.regs}
+
+
+def test_fast_registers_get_blocks_of_their_own():
+    tiers = {0: POLL_TIER_NORMAL, 1: POLL_TIER_FAST, 2: POLL_TIER_NORMAL, 3: POLL_TIER_FAST, 4: POLL_TIER_SLOW}
+    plan = plan_tiers(_descriptions(tiers), 100)
+    assert _tiers(plan) == tiers  # FAST and NORMAL share the interval, but not their blocks
+    for block in plan.blocks:
+        assert len({tiers[reg] for reg in block.regs}) == 1
+
+
+def test_tiers_with_the_same_interval_share_their_blocks():
+    tiers = {0: POLL_TIER_NORMAL, 1: POLL_TIER_SLOW, 2: POLL_TIER_NORMAL}
+    plan = plan_tiers(_descriptions(tiers), 100, tier_intervals={**DEFAULT_POLL_TIER_INTERVALS, POLL_TIER_SLOW: 1})
+    assert [(block.start, block.end, block.tier,) for block in plan.blocks] == [(0, 3, POLL_TIER_NORMAL,)]
+
+
+def test_holes_apply_to_every_tier():
+    tiers = {10: POLL_TIER_ONCE, 12: POLL_TIER_NORMAL, 15: POLL_TIER_NORMAL, 16: POLL_TIER_SLOW, 20: POLL_TIER_ONCE}
+    plan = plan_tiers(_descriptions(tiers), 100, holes=[(15, 16,)])
+    assert set(_tiers(plan)) == set(tiers) - {15}
+    assert not any(block.start <= 15 < block.end for block in plan.blocks)
+
+
+def test_hole_learned_in_one_tier_is_skipped_by_the_others(stub_hub):
+    hub = stub_hub(refused={'holding': {0x92}})  # unused, inside a once block and a slow block
+    covering = {block.tier for block in hub.holdingBlocks if block.start <= 0x92 < block.end}
+    assert {POLL_TIER_ONCE, POLL_TIER_SLOW} <= covering
+    hub.read_modbus_data()
+    assert hub.holes.get(hole_prefix(SERIAL), 'holding') == [(0x92, 0x93,)]
+    assert not any(block.start <= 0x92 < block.end for block in hub.holdingBlocks)
+
+
+def test_blocks_are_read_at_their_tier_interval(stub_hub):
+    hub = stub_hub()
+    reads = {}
+    for cycle in range(1, 26):
+        requests = len(hub._client.requests)
+        assert hub.read_modbus_data()
+        for (typ, address, count,) in hub._client.requests[requests:]: reads.setdefault((typ, address,), []).append(cycle)
+    for block in hub.holdingBlocks + hub.inputBlocks:
+        typ = 'holding' if block in hub.holdingBlocks else 'input'
+        expected = {POLL_TIER_FAST: list(range(1, 26)), POLL_TIER_NORMAL: list(range(1, 26)),
+                    POLL_TIER_SLOW: [1, 13, 25], POLL_TIER_ONCE: [1]}[block.tier]
+        assert reads[(typ, block.start,)] == expected, f"{typ} block 0x{block.start:x}"
+
+
+def test_fast_blocks_are_read_with_bus_priority(stub_hub):
+    hub = stub_hub()
+    blocks = hub.holdingBlocks + hub.inputBlocks
+    assert {block.tier for block in blocks} >= {POLL_TIER_FAST, POLL_TIER_NORMAL}
+    for block in blocks:
+        assert hub._priority(block) == (PRIORITY_FAST if block.tier == POLL_TIER_FAST else PRIORITY_BACKGROUND)
+
+
+def test_rtc_is_read_every_cycle(plugin):
+    (rtc,) = [descr for descr in plugin.SENSOR_TYPES_MAIN if descr.key == "rtc"]
+    assert DEFAULT_POLL_TIER_INTERVALS[rtc.poll_tier] == 1
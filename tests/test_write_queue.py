@@ -0,0 +1,69 @@
+"""Write coalescing: writes queued while the inverter sleeps go out in FC16 requests of contiguous registers."""
+import pytest
+
+from ha.writes import WriteQueue, MAX_WRITE_REGISTERS
+
+
+def test_latest_value_wins_and_every_caller_is_answered():
+    queue = WriteQueue()
+    first = queue.put(0x24, 1)
+    second = queue.put(0x24, 2)
+    assert len(queue) == 1 and (0x24 in queue) and queue
+    (group,) = queue.take()
+    assert (group.start, group.values,) == (0x24, [2],)
+    assert group.futures == [[first, second]]
+    assert not queue
+
+
+def test_contiguous_registers_are_grouped_in_order():
+    queue = WriteQueue()
+    for address in (0x63, 0x61, 0x24, 0x62, 0x25, 0x27):
+        queue.put(address, address + 1000)
+    groups = queue.take()
+    assert [(group.start, group.end, group.values,) for group in groups] == [
+        (0x24, 0x26, [0x24 + 1000, 0x25 + 1000],), (0x27, 0x28, [0x27 + 1000],),
+        (0x61, 0x64, [0x61 + 1000, 0x62 + 1000, 0x63 + 1000],)]
+
+
+def test_groups_respect_the_limit():
+    queue = WriteQueue()
+    for address in range(10): queue.put(address, address)
+    assert [len(group.values) for group in queue.take(4)] == [4, 4, 2]
+    for address in range(MAX_WRITE_REGISTERS + 7): queue.put(address, address)
+    assert [len(group.values) for group in queue.take(1000)] == [MAX_WRITE_REGISTERS, 7]  # never above the spec
+
+
+def test_resolve_completes_the_futures():
+    queue = WriteQueue()
+    futures = [queue.put(0x24, 1), queue.put(0x25, 2)]
+    (group,) = queue.take()
+    group.resolve(response="ok")
+    assert [future.result() for future in futures] == ["ok", "ok"]
+    failed = queue.put(0x24, 3)
+    (group,) = queue.take()
+    group.resolve(exception=IOError("no response"))
+    with pytest.raises(IOError):
+        failed.result()
+
+
+def test_queued_writes_are_coalesced_when_the_inverter_wakes(stub_hub, plugin, monkeypatch):
+    hub = stub_hub()
+    hub.async_add_solax_modbus_sensor(lambda: None)
+    hub.async_refresh_modbus_data()
+    client = hub._transport.client
+    hub.awake_button = plugin.BUTTON_TYPES[0]
+    monkeypatch.setattr(hub.plugin, "isAwake", lambda data: False)
+    client.requests.clear()
+    for (address, value,) in [(0x24, 100), (0x61, 7), (0x25, 200), (0x24, 150)]:
+        hub.write_register(hub._modbus_addr, address, value)
+    awake = (hub.awake_button.register, [hub.awake_button.command],)
+    assert [request[1:] for request in client.requests if request[0] == 'write'] == [awake] * 4  # only the button
+    future = hub.queue_write(0x62, 8)
+    assert not future.done() and (len(hub.writequeue) == 4)
+    monkeypatch.setattr(hub.plugin, "isAwake", lambda data: True)  # the button press has worked
+    client.requests.clear()
+    hub.async_refresh_modbus_data()
+    writes = [request for request in client.requests if request[0] == 'write']
+    assert writes == [('write', 0x24, [150, 200],), ('write', 0x61, [7, 8],)]
+    assert future.done() and (future.exception() is None)
+    assert not hub.writequeue
@@ -0,0 +1,42 @@
+"""Read after write: acknowledged writes land in data as the next poll of the registers would decode them."""
+from ha.const import BaseModbusNumberEntityDescription
+from ha.profiles import SettingsProfile
+
+
+def _client(hub):
+    return hub._transport.client
+
+
+def test_written_value_is_scaled_like_the_poll(stub_hub):
+    hub = stub_hub()
+    assert hub.read_modbus_data()
+    # gen4 hybrids keep the export limit in units of 10 W, the number writes 0x42 and the sensor reads 0xb6
+    assert hub.read_scale(hub.writeRegs[0x42][0]) == 10
+    result = hub.apply_profile(SettingsProfile("limit", {"export_control_user_limit": 2500}))
+    assert result.ok and (result.written == ["export_control_user_limit"])
+    assert _client(hub).image[0x42] == 250
+    assert hub.data["export_control_user_limit"] == 250
+    polled = stub_hub("hub_b")
+    _client(polled).image[0xb6] = 250
+    assert polled.read_modbus_data()
+    assert polled.data["export_control_user_limit"] == hub.data["export_control_user_limit"]
+    result = hub.apply_profile(SettingsProfile("limit", {"export_control_user_limit": 2500}))
+    assert result.unchanged == ["export_control_user_limit"] and not result.requests
+
+
+def test_negative_number_without_sensor_is_signed(stub_hub):
+    hub = stub_hub()
+    assert hub.read_modbus_data()
+    bias = BaseModbusNumberEntityDescription(key="grid_bias", register=0x61, native_min_value=-1000, scale=1)
+    hub.writeRegs[0x61] = [bias]
+    hub.write_register(hub._modbus_addr, 0x61, -100)
+    assert _client(hub).image[0x61] == 65436
+    assert hub.data["grid_bias"] == -100
+
+
+def test_scaled_number_keeps_the_sensor_rounding(stub_hub):
+    hub = stub_hub()
+    assert hub.read_modbus_data()
+    hub.write_register(hub._modbus_addr, 0x24, 203)
+    assert hub.data["battery_charge_max_current"] == 20.3
+    assert hub._written_value(hub.writeRegs[0x24][0], [203]) == 20.3